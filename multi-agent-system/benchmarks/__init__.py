@@ -0,0 +1,3 @@
+"""
+Benchmarks du système multi-agents (voir run_benchmarks.py)
+"""
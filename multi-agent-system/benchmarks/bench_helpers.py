@@ -0,0 +1,92 @@
+"""
+Micro-benchmarks des fonctions du chemin chaud sur des artefacts de 1 Mo:
+troncature, compression au budget de tokens et parsing des sorties d'agents, rendu des prompts, exports.
+"""
+
+import logging
+import tempfile
+
+from src.agents import ReviewerAgent, DeveloperAgent
+from src.agents.prompt_budget import compress
+from src.utils.exporters import SolutionExporter, ReportGenerator
+from src.utils.helpers import truncate_middle, extract_bulleted_section
+
+from benchmarks.common import measure
+
+ARTIFACT_BYTES = 1_000_000
+
+
+def make_artifact(kind: str, size: int = ARTIFACT_BYTES) -> str:
+    """Artefact synthétique d'environ size octets"""
+    if kind == "code":
+        block = (
+            "def handler_{i}(request: dict) -> dict:\n"
+            "    \"\"\"Traite la requête {i}\"\"\"\n"
+            "    try:\n"
+            "        return {{'status': 'ok', 'id': {i}}}\n"
+            "    except KeyError as e:\n"
+            "        raise ValueError(str(e))\n\n"
+        )
+    elif kind == "review":
+        block = "- Problème {i}: gestion d'erreurs incomplète dans le module {i}\n"
+    else:
+        block = "## Section {i}\nLe service {i} expose une interface documentée et testée.\n\n"
+    parts, total, i = [], 0, 0
+    while total < size:
+        part = block.format(i=i)
+        parts.append(part)
+        total += len(part)
+        i += 1
+    text = "".join(parts)
+    if kind == "review":
+        # Format de sortie du Reviewer: score en tête, deux sections à puces
+        half = len(text) // 2
+        text = f"SCORE GLOBAL: 72\nPROBLÈMES DÉTECTÉS:\n{text[:half]}\nRECOMMANDATIONS:\n{text[half:]}"
+    return text
+
+
+def run(quick: bool = False) -> dict:
+    """Exécute les micro-benchmarks et retourne {nom: mesures}"""
+    repeat = 3 if quick else 5
+    min_seconds = 0.05 if quick else 0.2
+    code = make_artifact("code")
+    review = make_artifact("review")
+    doc = make_artifact("doc")
+    review_no_score = review.replace("SCORE GLOBAL: 72", "")
+    reviewer = ReviewerAgent(None)
+    developer = DeveloperAgent(None)
+    limit = 12_000  # Ordre de grandeur d'une section de code dans un num_ctx de 8192
+    issues = ["`handler_1200` ne valide pas request", "KeyError masquée dans handler_4000()"]
+    
+    # Les exports journalisent chaque fichier écrit
+    logging.getLogger("src.utils.exporters").setLevel(logging.WARNING)
+    solution = {
+        "status": "success",
+        "iteration": 15,
+        "score": 88.5,
+        "artifacts": {"architecture": doc, "code": code, "tests": code, "documentation": doc},
+        "metrics": [],
+    }
+    artifacts_bytes = sum(len(v.encode()) for v in solution["artifacts"].values())
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        exporter = SolutionExporter(tmp)
+        cases = {
+            "truncate_middle": (lambda: truncate_middle(code, limit), len(code)),
+            "compress_section": (lambda: compress(code, limit, issues, code[: len(code) // 2]), len(code)),
+            "extract_bulleted_section": (lambda: extract_bulleted_section(review, "PROBLÈMES"), len(review)),
+            "extract_score": (lambda: reviewer.extract_score(review), len(review)),
+            "extract_score_missing": (lambda: reviewer.extract_score(review_no_score), len(review_no_score)),
+            "reviewer_parse_output": (lambda: reviewer.parse_output(review), len(review)),
+            "developer_build_prompt": (
+                lambda: developer.build_prompt(architecture=doc, requirements="API REST", iteration=3),
+                len(doc),
+            ),
+            "export_all": (lambda: exporter.export_all(solution, "bench"), artifacts_bytes),
+            "text_report": (lambda: ReportGenerator.generate_text_report(solution), artifacts_bytes),
+            "html_report": (lambda: ReportGenerator.generate_html_report(solution), artifacts_bytes),
+        }
+        for name, (func, size) in cases.items():
+            results[name] = measure(func, repeat=repeat, min_seconds=min_seconds, size_bytes=size)
+    return results
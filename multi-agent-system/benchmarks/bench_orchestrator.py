@@ -0,0 +1,152 @@
+"""
+Benchmarks de bout en bout de MultiAgentOrchestrator contre le serveur
+Ollama simulé (src.testing.mock_ollama):
+- durée d'une itération et d'un run complet
+- surcoût par phase hors temps LLM (prompt, parsing, métriques...)
+- pic mémoire sur un run de 15 itérations
+"""
+
+import logging
+import statistics
+import tempfile
+import time
+import tracemalloc
+from src.core import MultiAgentOrchestrator, OllamaClient, OllamaConfig
+from src.testing import MockOllamaServer
+
+from benchmarks.common import max_rss_mb
+
+
+class TimedOllamaClient(OllamaClient):
+    """OllamaClient qui cumule le temps passé dans les appels LLM (HTTP compris)"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.llm_seconds = 0.0
+    
+    def generate_result(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().generate_result(*args, **kwargs)
+        finally:
+            self.llm_seconds += time.perf_counter() - started
+
+
+class FixedIterationsOrchestrator(MultiAgentOrchestrator):
+    """Orchestrateur qui exécute toujours max_iterations itérations (pas d'arrêt anticipé)"""
+    
+    def _check_stop_criteria(self, metrics):
+        if self.iteration_count >= self.max_iterations:
+            return True, f"✅ Max itérations ({self.max_iterations}) atteint"
+        return False, ""
+
+
+def _instrument_phases(orchestrator: MultiAgentOrchestrator, client: TimedOllamaClient) -> dict:
+    """Enveloppe execute() de chaque agent: {phase: [(durée totale, durée LLM)]}"""
+    samples: dict[str, list] = {phase: [] for phase in orchestrator.agents}
+    
+    for phase, agent in orchestrator.agents.items():
+        def timed_execute(*args, _execute=agent.execute, _phase=phase, **kwargs):
+            llm_before = client.llm_seconds
+            started = time.perf_counter()
+            output = _execute(*args, **kwargs)
+            samples[_phase].append((time.perf_counter() - started, client.llm_seconds - llm_before))
+            return output
+        agent.execute = timed_execute
+    return samples
+
+
+def _run(server: MockOllamaServer, iterations: int, output_dir: str, trace_memory: bool = False) -> dict:
+    client = TimedOllamaClient(OllamaConfig(base_url=server.url))
+    orchestrator = FixedIterationsOrchestrator(
+        client,
+        max_iterations=iterations,
+        quality_threshold=101.0,
+        output_dir=output_dir,
+    )
+    phases = _instrument_phases(orchestrator, client)
+    
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    solution = orchestrator.run("API REST de gestion de tâches avec authentification JWT")
+    wall = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    
+    return {
+        "wall_seconds": wall,
+        "llm_seconds": client.llm_seconds,
+        "iterations": len(orchestrator.metrics_history),
+        "score": solution.get("score"),
+        "phases": phases,
+        "peak_bytes": peak,
+    }
+
+
+def _phase_overhead(phases: dict) -> dict:
+    """Surcoût hors LLM par phase (ms): médiane et maximum"""
+    report = {}
+    for phase, samples in phases.items():
+        overheads = [(total - llm) * 1000 for total, llm in samples]
+        if overheads:
+            report[phase] = {
+                "calls": len(overheads),
+                "median_ms": round(statistics.median(overheads), 3),
+                "max_ms": round(max(overheads), 3),
+            }
+    return report
+
+
+def run(iterations: int = 15, time_scale: float = 0.0, repeat: int = 3, quick: bool = False) -> dict:
+    """
+    Exécute les benchmarks de bout en bout.
+    time_scale: 0 = LLM simulé instantané (mesure du seul surcoût), 1 = débits simulés réels
+    """
+    if quick:
+        iterations, repeat = min(iterations, 3), 1
+    # Les logs INFO de l'orchestrateur fausseraient les mesures
+    logging.getLogger("src").setLevel(logging.WARNING)
+    
+    results: dict = {"time_scale": time_scale, "iterations": iterations}
+    with MockOllamaServer(time_scale=time_scale) as server, tempfile.TemporaryDirectory() as tmp:
+        single = [_run(server, 1, tmp) for _ in range(repeat)]
+        results["single_iteration"] = _summarize(single)
+        
+        full = [_run(server, iterations, tmp) for _ in range(repeat)]
+        results["full_run"] = _summarize(full)
+        results["phase_overhead"] = _phase_overhead(_merge_phases(full))
+        
+        traced = _run(server, iterations, tmp, trace_memory=True)
+        results["memory"] = {
+            "iterations": traced["iterations"],
+            "peak_traced_mb": round(traced["peak_bytes"] / 1e6, 3),
+            "max_rss_mb": max_rss_mb(),
+        }
+        results["mock_server"] = server.stats()
+    return results
+
+
+def _summarize(runs: list) -> dict:
+    walls = [r["wall_seconds"] for r in runs]
+    overheads = [r["wall_seconds"] - r["llm_seconds"] for r in runs]
+    return {
+        "runs": len(runs),
+        "iterations": runs[0]["iterations"],
+        "score": runs[0]["score"],
+        "wall_seconds_median": round(statistics.median(walls), 4),
+        "wall_seconds_min": round(min(walls), 4),
+        "overhead_seconds_median": round(statistics.median(overheads), 4),
+        "scores_reproducible": len({r["score"] for r in runs}) == 1,
+    }
+
+
+def _merge_phases(runs: list) -> dict:
+    merged: dict[str, list] = {}
+    for r in runs:
+        for phase, samples in r["phases"].items():
+            merged.setdefault(phase, []).extend(samples)
+    return merged
+
@@ -0,0 +1,108 @@
+"""
+Outils communs aux benchmarks: chronométrage et écriture des résultats JSON.
+"""
+
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_seconds: float = 0.2, size_bytes: Optional[int] = None) -> dict:
+    """
+    Temps par appel de func: chaque répétition enchaîne assez d'appels pour
+    durer au moins min_seconds, le meilleur et le médian sont retenus.
+    """
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds or number >= 1_000_000:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_seconds / elapsed) + 1)
+    
+    per_call = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - started) / number)
+    
+    best, median = min(per_call), statistics.median(per_call)
+    result = {
+        "calls_per_repeat": number,
+        "repeat": repeat,
+        "best_seconds": best,
+        "median_seconds": median,
+        "ops_per_second": round(1 / median, 2) if median else None,
+    }
+    if size_bytes:
+        result["input_bytes"] = size_bytes
+        result["mb_per_second"] = round(size_bytes / median / 1e6, 2) if median else None
+    return result
+
+
+def percentiles(values: list, points: tuple = (50, 95, 99)) -> dict:
+    """Percentiles par rang le plus proche: {"p50": ..., "p95": ..., "p99": ...}"""
+    if not values:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(values)
+    return {
+        f"p{p}": round(ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))], 4)
+        for p in points
+    }
+
+
+def max_rss_mb() -> Optional[float]:
+    """Pic de mémoire résidente du process (None si indisponible)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilo-octets sous Linux, octets sous macOS
+    return round(rss / (1e6 if sys.platform == "darwin" else 1e3), 1)
+
+
+def environment() -> dict:
+    """Contexte de la mesure (pour comparer des résultats entre machines et commits)"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def write_results(results: dict, output: Optional[str] = None) -> Path:
+    """Écrit les résultats en JSON (benchmarks/results/benchmark_<date>.json par défaut)"""
+    if output:
+        path = Path(output)
+    else:
+        path = RESULTS_DIR / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    return path
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Test de charge: N runs MultiAgentOrchestrator.run simultanés sur un même
+client (un seul pool de nœuds, un seul gouverneur de concurrence).
+
+Mesures: runs/heure, latence par phase (p50/p95/p99), attente dans la file
+du gouverneur, saturation du backend (appels en cours, temps passé avec une
+file non vide) et mémoire par run.
+
+    python benchmarks/load_test.py --concurrency 8 --runs 16
+    python benchmarks/load_test.py --backend ollama --concurrency 4 --corpus specs.txt
+    python benchmarks/load_test.py --concurrency 1 --runs 4 --slots 4 --parallel-phases
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import MultiAgentOrchestrator, OllamaClient, OllamaConfig
+from src.config.settings import OLLAMA_CONFIG
+from src.testing import MockOllamaServer
+
+from benchmarks.common import environment, max_rss_mb, percentiles, write_results
+
+DEFAULT_CORPUS = [
+    "API REST de gestion de tâches avec authentification JWT",
+    "CLI Python de synchronisation de fichiers avec reprise sur erreur",
+    "Microservice de paiement avec file de messages et idempotence",
+    "Scraper asynchrone avec limitation de débit et export CSV",
+    "Application de chat temps réel avec WebSocket et historique",
+]
+
+
+class LoadTestOrchestrator(MultiAgentOrchestrator):
+    """Orchestrateur qui publie la durée de chaque phase (LLM et file d'attente compris)"""
+    
+    def __init__(self, *args, phase_samples: dict, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.phase_samples = phase_samples
+    
+    def _record_phase_time(self, phase: str, seconds: float) -> None:
+        super()._record_phase_time(phase, seconds)
+        self.phase_samples.setdefault(phase, []).append(seconds)
+
+
+class BackendSampler:
+    """Échantillonne appels en cours (pool) et profondeur de file (gouverneur)"""
+    
+    def __init__(self, client: OllamaClient, interval: float = 0.05):
+        self.client = client
+        self.interval = interval
+        self.in_flight: list[int] = []
+        self.queued: list[int] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="load-sampler", daemon=True)
+    
+    def __enter__(self) -> "BackendSampler":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+    
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.in_flight.append(sum(e.in_flight for e in self.client.pool.endpoints))
+            self.queued.append(self.client.governor.queue_depth() if self.client.governor else 0)
+    
+    def summary(self) -> dict:
+        samples = len(self.in_flight) or 1
+        return {
+            "samples": len(self.in_flight),
+            "in_flight_mean": round(sum(self.in_flight) / samples, 2),
+            "in_flight_max": max(self.in_flight, default=0),
+            "queue_depth_mean": round(sum(self.queued) / samples, 2),
+            "queue_depth_max": max(self.queued, default=0),
+            # Part du temps où des appels attendaient un créneau: backend saturé
+            "saturated_fraction": round(sum(1 for q in self.queued if q) / samples, 3),
+        }
+
+
+def load_corpus(path: Optional[str]) -> list[str]:
+    """Un requirement par ligne non vide (lignes # ignorées)"""
+    if not path:
+        return DEFAULT_CORPUS
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    corpus = [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+    if not corpus:
+        raise ValueError(f"Corpus vide: {path}")
+    return corpus
+
+
+def run(
+    concurrency: int = 4,
+    runs: Optional[int] = None,
+    corpus: Optional[list[str]] = None,
+    iterations: int = 3,
+    config: Optional[OllamaConfig] = None,
+    trace_memory: bool = False,
+    parallel_phases: bool = False,
+) -> dict:
+    """
+    Exécute runs orchestrations (défaut: 2 x concurrency), concurrency à la fois,
+    contre config (un seul OllamaClient partagé).
+    """
+    runs = runs or 2 * concurrency
+    corpus = corpus or DEFAULT_CORPUS
+    config = config or OllamaConfig()
+    client = OllamaClient(config)
+    if not client.check_connection():
+        raise ConnectionError(f"Backend Ollama injoignable: {client.base_url}")
+    
+    phase_samples: dict[str, list] = {}
+    durations: list[float] = []
+    statuses: list[str] = []
+    output_dir = tempfile.mkdtemp(prefix="load_test_")
+    
+    def one_run(index: int) -> None:
+        orchestrator = LoadTestOrchestrator(
+            client,
+            max_iterations=iterations,
+            output_dir=output_dir,
+            run_id=f"load-{index:03d}",
+            phase_samples=phase_samples,
+            parallel_phases=parallel_phases,
+        )
+        started = time.perf_counter()
+        solution = orchestrator.run(corpus[index % len(corpus)])
+        durations.append(time.perf_counter() - started)
+        statuses.append(solution.get("status", "failed"))
+    
+    # Les logs INFO des runs simultanés fausseraient les mesures
+    logging.getLogger("src").setLevel(logging.WARNING)
+    rss_before = max_rss_mb()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    with BackendSampler(client) as sampler, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(one_run, i) for i in range(runs)]:
+            future.result()
+    wall = time.perf_counter() - started
+    peak_traced = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+    rss_after = max_rss_mb()
+    
+    governor = client.governor.stats() if client.governor else {}
+    queue_waits = [r["wait_seconds"] / r["calls"] for r in governor.get("runs", {}).values() if r["calls"]]
+    return {
+        "concurrency": concurrency,
+        "runs": runs,
+        "iterations": iterations,
+        "parallel_phases": parallel_phases,
+        "wall_seconds": round(wall, 3),
+        "runs_per_hour": round(runs / wall * 3600, 1),
+        "succeeded": statuses.count("success"),
+        "run_seconds": percentiles(durations),
+        "phase_seconds": {phase: percentiles(samples) for phase, samples in phase_samples.items()},
+        "queue_wait": {
+            "queued_calls": governor.get("queued_calls", 0),
+            "calls": governor.get("calls", 0),
+            "avg_wait_seconds": governor.get("avg_wait_seconds", 0.0),
+            "max_wait_seconds": governor.get("max_wait_seconds", 0.0),
+            "per_call_wait_by_run": percentiles(queue_waits),
+        },
+        "backend": {**sampler.summary(), "pool": client.pool.stats()},
+        "memory": {
+            "max_rss_mb": rss_after,
+            "rss_growth_mb_per_run": round((rss_after - rss_before) / concurrency, 2) if rss_before else None,
+            "peak_traced_mb_per_run": round(peak_traced / 1e6 / concurrency, 3) if peak_traced else None,
+        },
+        "resilience": client.resilience.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge: runs d'orchestrateur simultanés")
+    parser.add_argument("--concurrency", type=int, default=4, help="Runs simultanés")
+    parser.add_argument("--runs", type=int, help="Runs au total (défaut: 2 x concurrency)")
+    parser.add_argument("--iterations", type=int, default=3, help="Itérations max par run")
+    parser.add_argument("--corpus", help="Fichier de requirements (un par ligne)")
+    parser.add_argument("--backend", choices=["mock", "ollama"], default="mock",
+                        help="Serveur simulé (défaut) ou Ollama réel (OLLAMA_CONFIG)")
+    parser.add_argument("--time-scale", type=float, default=0.02,
+                        help="Serveur simulé: échelle des durées (1 = débits réels)")
+    parser.add_argument("--slots", type=int,
+                        help="Créneaux par nœud et modèle (défaut: parallel_slots de OLLAMA_CONFIG, sinon 1)")
+    parser.add_argument("--parallel-phases", action="store_true",
+                        help="Phases indépendantes d'une itération en parallèle (PHASE_PARALLELISM)")
+    parser.add_argument("--trace-memory", action="store_true", help="Pic mémoire Python (tracemalloc, ralentit)")
+    parser.add_argument("--output", help="Fichier JSON (défaut: benchmarks/results/benchmark_<date>.json)")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s | %(levelname)s | %(message)s")
+    config = OllamaConfig(**OLLAMA_CONFIG)
+    config = replace(config, parallel_slots=args.slots or config.parallel_slots or 1)
+    
+    server = None
+    if args.backend == "mock":
+        server = MockOllamaServer(time_scale=args.time_scale).start()
+        config = replace(config, base_url=server.url, endpoints=[])
+    
+    try:
+        print(f"🔥 {args.runs or 2 * args.concurrency} run(s), {args.concurrency} simultané(s), backend {args.backend}...")
+        load = run(
+            concurrency=args.concurrency,
+            runs=args.runs,
+            corpus=load_corpus(args.corpus),
+            iterations=args.iterations,
+            config=config,
+            trace_memory=args.trace_memory,
+            parallel_phases=args.parallel_phases,
+        )
+        if server is not None:
+            load["mock_server"] = server.stats()
+    finally:
+        if server is not None:
+            server.stop()
+    
+    print(f"   runs/heure:     {load['runs_per_hour']} ({load['succeeded']}/{load['runs']} réussis en {load['wall_seconds']}s)")
+    print(f"   durée d'un run: {load['run_seconds']}")
+    for phase, p in load["phase_seconds"].items():
+        print(f"   {phase:14s}  p50 {p['p50']:.3f}s  p95 {p['p95']:.3f}s  p99 {p['p99']:.3f}s")
+    wait = load["queue_wait"]
+    print(f"   file d'attente: {wait['queued_calls']}/{wait['calls']} appel(s) en file, moyenne {wait['avg_wait_seconds']}s, max {wait['max_wait_seconds']}s")
+    print(f"   backend:        {load['backend']['in_flight_mean']} appel(s) en cours en moyenne, saturé {load['backend']['saturated_fraction']:.0%} du temps")
+    
+    path = write_results({"environment": environment(), "parameters": vars(args), "load": load}, args.output)
+    print(f"✅ Résultats: {path}")
+
+
+if __name__ == "__main__":
+    main()
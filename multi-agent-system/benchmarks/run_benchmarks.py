@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Lance la suite de benchmarks et écrit les résultats en JSON.
+
+    python benchmarks/run_benchmarks.py                 # tout
+    python benchmarks/run_benchmarks.py --suite micro --quick
+    python benchmarks/run_benchmarks.py --time-scale 0.05 --output bench.json
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks import bench_helpers, bench_orchestrator
+from benchmarks.common import environment, write_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du système multi-agents")
+    parser.add_argument("--suite", choices=["all", "micro", "e2e"], default="all")
+    parser.add_argument("--iterations", type=int, default=15, help="Itérations du run complet")
+    parser.add_argument("--time-scale", type=float, default=0.0,
+                        help="Durées simulées du LLM (0 = instantané: surcoût seul)")
+    parser.add_argument("--repeat", type=int, default=3, help="Répétitions des runs de bout en bout")
+    parser.add_argument("--quick", action="store_true", help="Mesures courtes (vérification rapide)")
+    parser.add_argument("--output", help="Fichier JSON (défaut: benchmarks/results/benchmark_<date>.json)")
+    args = parser.parse_args()
+    
+    results = {"environment": environment(), "parameters": vars(args)}
+    if args.suite in ("all", "micro"):
+        print("⏱️  Micro-benchmarks (artefacts de 1 Mo)...")
+        results["micro"] = bench_helpers.run(quick=args.quick)
+        for name, r in results["micro"].items():
+            print(f"   {name:28s} {r['median_seconds'] * 1000:10.3f} ms  {r.get('mb_per_second') or 0:8.1f} Mo/s")
+    
+    if args.suite in ("all", "e2e"):
+        print("⏱️  Orchestrateur de bout en bout (Ollama simulé)...")
+        results["e2e"] = bench_orchestrator.run(
+            iterations=args.iterations,
+            time_scale=args.time_scale,
+            repeat=args.repeat,
+            quick=args.quick,
+        )
+        e2e = results["e2e"]
+        print(f"   1 itération:       {e2e['single_iteration']['wall_seconds_median']:.3f}s")
+        print(f"   run complet:       {e2e['full_run']['wall_seconds_median']:.3f}s "
+              f"({e2e['full_run']['iterations']} itérations, surcoût {e2e['full_run']['overhead_seconds_median']:.3f}s)")
+        print(f"   pic mémoire:       {e2e['memory']['peak_traced_mb']} Mo (tracemalloc)")
+        print(f"   surcoût par phase: {json.dumps({p: v['median_ms'] for p, v in e2e['phase_overhead'].items()})} ms")
+    
+    path = write_results(results, args.output)
+    print(f"✅ Résultats: {path}")
+
+
+if __name__ == "__main__":
+    main()
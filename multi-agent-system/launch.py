@@ -15,9 +15,9 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.core import OllamaClient, OllamaConfig, MultiAgentOrchestrator
+from src.core import OllamaClient, OllamaConfig, MultiAgentOrchestrator, ResponseCache, SemanticCache, Cassette
 from src.utils.exporters import SolutionExporter, ReportGenerator
-from src.config.settings import OLLAMA_CONFIG, SYSTEM_CONFIG
+from src.config.settings import OLLAMA_CONFIG, SYSTEM_CONFIG, RESIDENCY_CONFIG, PHASE_PARALLELISM, ARCHITECTURE_REUSE, CODE_REFINEMENT, CANDIDATE_SEARCH, CHECKPOINT, RESPONSE_CACHE, SEMANTIC_CACHE, SESSION_CONFIG
 
 # Configuration logging
 logging.basicConfig(
@@ -34,8 +34,9 @@ logger = logging.getLogger(__name__)
 class ProjectLauncher:
     """Interface de lancement du projet"""
 
-    def __init__(self):
+    def __init__(self, cassette=None):
         self.client = None
+        self.cassette = cassette  # Enregistrement / rejeu du trafic Ollama
         self.project_name = ""
         self.requirements = ""
         self.max_iterations = 15
@@ -58,7 +59,9 @@ class ProjectLauncher:
         logger.info("🔌 Vérification de la connexion à Ollama...")
         try:
             config = OllamaConfig(**OLLAMA_CONFIG)
-            self.client = OllamaClient(config)
+            # Avec une cassette, les caches serviraient des réponses hors cassette
+            cache = None if self.cassette else ResponseCache.from_config(RESPONSE_CACHE)
+            self.client = OllamaClient(config, cache=cache, cassette=self.cassette)
             
             if not self.client.check_connection():
                 logger.error("❌ Impossible de se connecter à Ollama")
@@ -272,12 +275,27 @@ Dossier résultats: {self.output_dir}
         print("="*70 + "\n")
         
         try:
+            try:
+                semantic_cache = None if self.cassette else SemanticCache.from_config(self.client, SEMANTIC_CACHE)
+            except ImportError as e:
+                logger.warning(f"⚠️  Cache sémantique désactivé: {e}")
+                semantic_cache = None
+            
             # Créer l'orchestrateur
             orchestrator = MultiAgentOrchestrator(
                 ollama_client=self.client,
                 max_iterations=self.max_iterations,
                 quality_threshold=self.quality_threshold,
-                output_dir=self.output_dir
+                output_dir=self.output_dir,
+                enable_streaming=SYSTEM_CONFIG.get('enable_streaming', False),
+                manage_residency=RESIDENCY_CONFIG.get('enabled', False),
+                parallel_phases=PHASE_PARALLELISM.get('enabled', False),
+                reuse_architecture=ARCHITECTURE_REUSE.get('enabled', True),
+                refine_code=CODE_REFINEMENT.get('enabled', True),
+                search_candidates=CANDIDATE_SEARCH.get('enabled', False),
+                checkpoint=CHECKPOINT.get('enabled', True),
+                semantic_cache=semantic_cache,
+                use_sessions=SESSION_CONFIG.get('enabled', False)
             )
             
             logger.info(f"🏗️  Orchestrateur initialisé")
@@ -375,10 +393,39 @@ Dossier résultats: {self.output_dir}
             return 1
 
 
+def parse_arguments():
+    """Options de lancement (cassette d'enregistrement ou de rejeu)"""
+    parser = argparse.ArgumentParser(description="Lanceur interactif du système multi-agents")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument('--record', metavar='CASSETTE', help='Enregistre tout le trafic Ollama dans une cassette (.jsonl.gz)')
+    cassette.add_argument('--replay', metavar='CASSETTE', help='Rejoue une cassette enregistrée au lieu d\'appeler Ollama')
+    parser.add_argument(
+        '--replay-timing', type=float, nargs='?', const=1.0, default=0.0, metavar='ECHELLE',
+        help='Rejeu au rythme d\'origine (1 = temps réel; défaut: instantané)'
+    )
+    return parser.parse_args()
+
+
 def main():
     """Point d'entrée du script"""
-    launcher = ProjectLauncher()
-    return launcher.main()
+    args = parse_arguments()
+    try:
+        if args.record:
+            cassette = Cassette(args.record, mode="record")
+        elif args.replay:
+            cassette = Cassette(args.replay, mode="replay", time_scale=args.replay_timing)
+        else:
+            cassette = None
+    except FileNotFoundError as e:
+        logger.error(f"❌ {e}")
+        return 1
+    
+    launcher = ProjectLauncher(cassette)
+    try:
+        return launcher.main()
+    finally:
+        if cassette:
+            cassette.close()
 
 
 if __name__ == "__main__":
@@ -7,7 +7,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 logging.basicConfig(level=logging.INFO, format='%(levelname)s | %(message)s')
 logger = logging.getLogger(__name__)
 
-from src.core import OllamaClient, OllamaConfig, MultiAgentOrchestrator
+from src.core import OllamaClient, OllamaConfig, MultiAgentOrchestrator, ResponseCache
+from src.config.settings import RESPONSE_CACHE
 from src.utils.exporters import SolutionExporter, ReportGenerator
 
 
@@ -164,7 +165,7 @@ def main():
     # Étape 1: Connexion Ollama
     logger.info("🔌 Vérification Ollama...")
     config = OllamaConfig(base_url="http://localhost:11434")
-    client = OllamaClient(config)
+    client = OllamaClient(config, cache=ResponseCache.from_config(RESPONSE_CACHE))
     
     if not client.check_connection():
         logger.error("❌ Ollama non disponible")
@@ -7,7 +7,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 logging.basicConfig(level=logging.INFO, format='%(levelname)s | %(message)s')
 logger = logging.getLogger(__name__)
 
-from src.core import OllamaClient, OllamaConfig, MultiAgentOrchestrator
+from src.core import OllamaClient, OllamaConfig, MultiAgentOrchestrator, ResponseCache
+from src.config.settings import RESPONSE_CACHE
 from src.utils.exporters import SolutionExporter
 
 
@@ -20,7 +21,7 @@ def main():
     # 1. Connecter à Ollama
     logger.info("\n1️⃣  Connexion à Ollama...")
     config = OllamaConfig(base_url="http://localhost:11434")
-    client = OllamaClient(config)
+    client = OllamaClient(config, cache=ResponseCache.from_config(RESPONSE_CACHE))
     
     if not client.check_connection():
         logger.error("❌ Ollama non trouvé sur http://localhost:11434")
@@ -7,20 +7,34 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.core import OllamaClient, OllamaConfig, MultiAgentOrchestrator
+from src.core import OllamaClient, OllamaConfig, MultiAgentOrchestrator, ResponseCache, SemanticCache, Cassette, CheckpointError
 from src.core.logging_config import setup_logging
 from src.utils.exporters import SolutionExporter, ReportGenerator
-from src.config.settings import OLLAMA_CONFIG, AGENT_MODELS, SYSTEM_CONFIG
+from src.config.settings import OLLAMA_CONFIG, AGENT_MODELS, SYSTEM_CONFIG, RESIDENCY_CONFIG, PHASE_PARALLELISM, ARCHITECTURE_REUSE, CODE_REFINEMENT, CANDIDATE_SEARCH, CHECKPOINT, RESPONSE_CACHE, SEMANTIC_CACHE, SESSION_CONFIG
 
 logger = None
 
 
-def setup_ollama_client():
+def setup_cassette(args):
+    """Cassette d'enregistrement (--record) ou de rejeu (--replay), None sinon"""
+    if args.record:
+        logger.info(f"📼 Enregistrement du trafic Ollama: {args.record}")
+        return Cassette(args.record, mode="record")
+    if args.replay:
+        logger.info(f"📼 Rejeu de la cassette: {args.replay} (sans appel à Ollama)")
+        return Cassette(args.replay, mode="replay", time_scale=args.replay_timing)
+    return None
+
+
+def setup_ollama_client(use_cache: bool = True, cassette=None):
     """Initialise et teste le client Ollama"""
     logger.info("🔌 Initialisation client Ollama...")
     
     config = OllamaConfig(**OLLAMA_CONFIG)
-    client = OllamaClient(config)
+    cache = ResponseCache.from_config(RESPONSE_CACHE) if use_cache else None
+    client = OllamaClient(config, cache=cache, cassette=cassette)
+    if cache:
+        logger.info(f"💾 Cache réponses: {cache.path}")
     
     # Vérifier la connexion
     if not client.check_connection():
@@ -41,6 +55,18 @@ def setup_ollama_client():
     return client
 
 
+def setup_semantic_cache(client):
+    """Initialise le cache sémantique si activé (None si désactivé ou numpy absent)"""
+    try:
+        semantic_cache = SemanticCache.from_config(client, SEMANTIC_CACHE)
+    except ImportError as e:
+        logger.warning(f"⚠️  Cache sémantique désactivé: {e}")
+        return None
+    if semantic_cache:
+        logger.info(f"🧠 Cache sémantique: {', '.join(semantic_cache.thresholds)}")
+    return semantic_cache
+
+
 def check_models_available(client):
     """Vérifie que les modèles requis sont disponibles"""
     logger.info("🔍 Vérification des modèles requis...")
@@ -80,13 +106,21 @@ Exemples:
   python main.py --requirements "API REST avec FastAPI"
   python main.py --requirements "CLI tool en Python" --max-iterations 10
   python main.py --requirements "Microservice" --threshold 85
+  python main.py --requirements "API REST" --record runs/api.jsonl.gz
+  python main.py --requirements "API REST" --replay runs/api.jsonl.gz
+  python main.py --resume ./outputs
         """
     )
     
     parser.add_argument(
         '--requirements',
-        required=True,
-        help='Description des requirements du projet'
+        help='Description des requirements du projet (optionnel avec --resume)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        metavar='DIR',
+        help='Reprend le run interrompu dont le checkpoint est dans DIR (remplace --output)'
     )
     
     parser.add_argument(
@@ -109,13 +143,46 @@ Exemples:
         help='Répertoire de sortie (défaut: ./outputs)'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Désactive le cache persistant des réponses LLM'
+    )
+    
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        '--record',
+        metavar='CASSETTE',
+        help='Enregistre tout le trafic Ollama dans une cassette (.jsonl.gz)'
+    )
+    cassette.add_argument(
+        '--replay',
+        metavar='CASSETTE',
+        help='Rejoue une cassette enregistrée au lieu d\'appeler Ollama'
+    )
+    
+    parser.add_argument(
+        '--replay-timing',
+        type=float,
+        nargs='?',
+        const=1.0,
+        default=0.0,
+        metavar='ECHELLE',
+        help='Rejeu au rythme d\'origine (1 = temps réel, 0.1 = 10x plus rapide; défaut: instantané)'
+    )
+    
     parser.add_argument(
         '--verbose',
         action='store_true',
         help='Affichage détaillé (DEBUG)'
     )
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not args.requirements and not args.resume:
+        parser.error("--requirements est obligatoire (sauf avec --resume)")
+    if args.resume:
+        args.output = args.resume
+    return args
 
 
 def main():
@@ -134,8 +201,16 @@ def main():
     logger.info("║      🤖 SYSTÈME MULTI-AGENTS AUTO-CORRECTIF 🤖            ║")
     logger.info("╚════════════════════════════════════════════════════════════╝")
     
+    # Cassette: les caches serviraient des réponses hors cassette
+    try:
+        cassette = setup_cassette(args)
+    except FileNotFoundError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+    use_cache = not args.no_cache and cassette is None
+    
     # Initialiser Ollama
-    ollama_client = setup_ollama_client()
+    ollama_client = setup_ollama_client(use_cache=use_cache, cassette=cassette)
     if not ollama_client:
         logger.error("❌ Impossible de démarrer sans Ollama")
         sys.exit(1)
@@ -150,13 +225,36 @@ def main():
         ollama_client=ollama_client,
         max_iterations=args.max_iterations,
         quality_threshold=args.threshold,
-        output_dir=args.output
+        output_dir=args.output,
+        enable_streaming=SYSTEM_CONFIG.get('enable_streaming', False),
+        manage_residency=RESIDENCY_CONFIG.get('enabled', False),
+        parallel_phases=PHASE_PARALLELISM.get('enabled', False),
+        reuse_architecture=ARCHITECTURE_REUSE.get('enabled', True),
+        refine_code=CODE_REFINEMENT.get('enabled', True),
+        search_candidates=CANDIDATE_SEARCH.get('enabled', False),
+        checkpoint=CHECKPOINT.get('enabled', True) or bool(args.resume),
+        semantic_cache=setup_semantic_cache(ollama_client) if use_cache else None,
+        use_sessions=SESSION_CONFIG.get('enabled', False)
     )
     
     logger.info(f"   ✓ {len(orchestrator.agents)} agents initialisés")
     for name, agent in orchestrator.agents.items():
         logger.info(f"     • {agent.role} ({agent.model_name})")
     
+    # Reprise d'un run interrompu: requirements et état depuis le checkpoint
+    if args.resume:
+        try:
+            requirements = orchestrator.resume()
+        except CheckpointError as e:
+            logger.error(f"❌ {e}")
+            sys.exit(1)
+        if requirements is None:
+            logger.error(f"❌ Aucun checkpoint dans {args.resume}")
+            sys.exit(1)
+        if args.requirements and args.requirements != requirements:
+            logger.warning("⚠️  --requirements ignoré: reprise avec les requirements du checkpoint")
+        args.requirements = requirements
+    
     # Afficher les requirements
     logger.info("\n📋 REQUIREMENTS:")
     for line in args.requirements.split('\n'):
@@ -196,18 +294,36 @@ def main():
         logger.info("\n" + "="*60)
         logger.info("🎉 EXÉCUTION COMPLÉTÉE AVEC SUCCÈS!")
         logger.info(f"   Score final: {solution.get('score', 0):.1f}%")
+        if solution.get('cache'):
+            cache_stats = solution['cache']
+            logger.info(f"   Cache: {cache_stats['hits']} hit(s) / {cache_stats['misses']} miss(es)")
+        if solution.get('semantic_cache'):
+            semantic_stats = solution['semantic_cache']
+            logger.info(
+                f"   Cache sémantique: {semantic_stats['hits']} hit(s), "
+                f"~{semantic_stats['llm_seconds_saved']:.0f}s de LLM économisées"
+            )
+        if cassette and not cassette.recording:
+            cassette_stats = cassette.stats()
+            logger.info(f"   Cassette: {cassette_stats['replayed']} réponse(s) rejouée(s), {cassette_stats['misses']} absente(s)")
         logger.info(f"   Dossier résultats: {export_result['output_dir']}")
         logger.info("="*60 + "\n")
         
         return 0
-        
+    
     except KeyboardInterrupt:
         logger.info("\n⚠️  Exécution interrompue par l'utilisateur")
+        if orchestrator.checkpoint is not None:
+            logger.info(f"   Reprise possible: python main.py --resume {args.output}")
         return 130
     
     except Exception as e:
         logger.error(f"❌ Erreur fatale: {e}", exc_info=True)
         return 1
+    
+    finally:
+        if cassette:
+            cassette.close()
 
 
 if __name__ == "__main__":
@@ -7,7 +7,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
-from src.core import OllamaClient, OllamaConfig
+from src.core import OllamaClient, OllamaConfig, OllamaError
 
 
 def test_ollama_connection():
@@ -52,11 +52,15 @@ def test_ollama_connection():
     model = models[0]
     logger.info(f"   Test avec: {model}")
     
-    response = client.generate(
-        model=model,
-        prompt="Réponds simplement: Ollama fonctionne!",
-        temperature=0.5
-    )
+    try:
+        response = client.generate(
+            model=model,
+            prompt="Réponds simplement: Ollama fonctionne!",
+            temperature=0.5
+        )
+    except OllamaError as e:
+        logger.error(f"❌ ÉCHOUÉ: {e}")
+        return False
     
     if response:
         logger.info("✅ SUCCÈS: Génération OK")
@@ -3,6 +3,9 @@ __init__ pour le package agents
 """
 
 from .base_agent import BaseAgent, AgentOutput
+from .prompt_templates import PromptSection, PromptTemplate, PrefixReuse
+from .prompt_budget import PromptAssembler, TokenEstimator
+from .session import AgentSession
 from .specialized_agents import (
     ArchitectAgent,
     DeveloperAgent,
@@ -15,6 +18,12 @@ from .specialized_agents import (
 __all__ = [
     "BaseAgent",
     "AgentOutput",
+    "AgentSession",
+    "PromptSection",
+    "PromptTemplate",
+    "PrefixReuse",
+    "PromptAssembler",
+    "TokenEstimator",
     "ArchitectAgent",
     "DeveloperAgent",
     "ReviewerAgent",
@@ -5,11 +5,43 @@ Définit l'interface commune et les utilitaires.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, asdict
-from typing import Optional
+from typing import Callable, Optional
+import asyncio
+import copy
+import inspect
+import json
 import logging
+import re
+import time
+
+from ..config.settings import GENERATION_PARAMS, SYSTEM_CONFIG
+from ..utils.helpers import truncate_middle
+from ..utils.llm_usage import NANOSECONDS, LLMUsage
+from ..utils.streaming import (
+    SCORE_PATTERN,
+    EarlyStopStats,
+    IncrementalParser,
+    JsonCompletion,
+    ResponseBuffer,
+    StreamEvent,
+)
+from ..utils.structured_output import parse_json_object, validate_schema
+from .prompt_budget import PromptAssembler
+from .prompt_templates import PrefixReuse, PromptSection, PromptTemplate
+from .session import AgentSession
 
 logger = logging.getLogger(__name__)
 
+REPAIR_PROMPT = """La réponse ci-dessous devait être un objet JSON conforme à ce schéma:
+{schema}
+
+Erreurs: {errors}
+
+RÉPONSE À CORRIGER:
+{response}
+
+Renvoie uniquement l'objet JSON corrigé, avec le même contenu."""
+
 
 @dataclass
 class AgentOutput:
@@ -21,6 +53,7 @@ class AgentOutput:
     issues: list = None
     recommendations: list = None
     token_count: Optional[int] = None
+    usage: Optional[LLMUsage] = None  # Compteurs Ollama réels de l'appel
     
     def __post_init__(self):
         if self.issues is None:
@@ -30,65 +63,553 @@ class AgentOutput:
     
     def to_dict(self):
         return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "AgentOutput":
+        """Inverse de to_dict (reprise depuis un checkpoint)"""
+        usage = data.get("usage")
+        return cls(**{**data, "usage": LLMUsage(**usage) if usage else None})
 
 
 class BaseAgent(ABC):
-    """Classe de base pour tous les agents"""
+    """
+    Classe de base pour tous les agents.
+    
+    Chaque agent décrit son prompt (build_prompt) et l'interprétation de la
+    réponse (parse_output); l'appel au LLM est commun, en version synchrone
+    (execute) comme asynchrone (aexecute).
+    
+    Avec stream=True, la réponse est reçue en streaming et analysée au fil de
+    l'eau: les listeners reçoivent les StreamEvent (score, problèmes,
+    recommandations) avant la fin de la génération.
+    
+    En streaming, un agent à score (stream_sections) interrompt la génération
+    dès que score et listes sont complets (SYSTEM_CONFIG["early_stop"]): la
+    prose qui suit n'est pas exploitée.
+    
+    Avec une AgentSession, le context Ollama est conservé entre les
+    itérations: les appels suivants n'envoient que les entrées modifiées
+    (build_followup), et la session repart d'un prompt complet à l'approche
+    de la fenêtre de contexte du modèle.
     
-    def __init__(self, ollama_client, model_name: str, role: str):
+    Avec un output_schema (et SYSTEM_CONFIG["structured_output"]), la réponse
+    est demandée en JSON contraint par le schéma (format Ollama), validée, et
+    une réponse invalide obtient une relance de réparation à température 0;
+    en dernier recours, parse_output se rabat sur le format texte.
+    
+    Les options de génération (température, num_predict, num_ctx, stop...)
+    viennent de GENERATION_PARAMS[config_key] et sont modifiables par agent
+    via self.options; num_ctx et num_predict fixent aussi le budget de tokens
+    du prompt (render_prompt).
+    """
+    
+    temperature: float = 0.7  # Si GENERATION_PARAMS n'en fixe pas
+    # Clé de l'agent dans la configuration (AGENT_MODELS, seuils du cache sémantique...)
+    config_key: str = ""
+    # Titres de sections à suivre en streaming -> type d'événement émis
+    stream_sections: dict = {}
+    stream_score: bool = False
+    # Ligne du score suivi en streaming (None = "score ...: N") et type de l'événement émis
+    stream_score_pattern: Optional[re.Pattern] = None
+    stream_score_kind: str = "score"
+    # Template à préfixe stable (sections réutilisées par les prompts de suite de session)
+    prompt_template: Optional[PromptTemplate] = None
+    # Schéma JSON de la réponse (None = texte libre) et consignes de format de chaque mode
+    output_schema: Optional[dict] = None
+    text_format: str = ""
+    json_format: str = ""
+    
+    def __init__(self, ollama_client, model_name: str, role: str, async_client=None):
         self.ollama_client = ollama_client
+        self.async_client = async_client
         self.model_name = model_name
         self.role = role
         self.call_count = 0
         self.total_tokens = 0
+        self.usage = LLMUsage()  # Cumul des compteurs Ollama de l'agent
+        self.last_usage: Optional[LLMUsage] = None
+        self.stream = False
+        self.keep_alive: Optional[int] = None  # Fixé par le gestionnaire de résidence
+        self.semantic_cache = None  # SemanticCache optionnel, partagé par les agents
+        self.session: Optional[AgentSession] = None
+        self.prefix_reuse = PrefixReuse()
+        self.prompt_assembler = PromptAssembler()
+        self.structured = self.output_schema is not None and SYSTEM_CONFIG.get("structured_output", True)
+        self.repairs = 0  # Relances de réparation d'un JSON invalide
+        # Flux des agents à score coupé dès la réponse utile complète (score, listes)
+        self.early_stop = bool(self.stream_sections) and SYSTEM_CONFIG.get("early_stop", True)
+        self.early_stops = EarlyStopStats()
+        self.options: dict = {"temperature": self.temperature, **GENERATION_PARAMS.get(self.config_key, {})}
+        self.event_listeners: list[Callable[[StreamEvent], None]] = []
+    
+    def variant(self, **options) -> "BaseAgent":
+        """
+        Copie de l'agent pour un appel simultané (candidats best-of-N): options
+        modifiées, sans session, compteurs et état de prompt propres (rien
+        n'est modifié en commun depuis plusieurs threads). Ses compteurs sont
+        reportés sur l'agent d'origine par absorb().
+        """
+        clone = copy.copy(self)
+        clone.options = {**self.options, **options}
+        clone.session = None
+        clone.call_count = 0
+        clone.total_tokens = 0
+        clone.repairs = 0
+        clone.usage = LLMUsage()
+        clone.last_usage = None
+        clone.prefix_reuse = self.prefix_reuse.fork()
+        clone.prompt_assembler = self.prompt_assembler.fork()
+        clone.early_stops = self.early_stops.fork()
+        clone.event_listeners = list(self.event_listeners)
+        return clone
+    
+    def absorb(self, clone: "BaseAgent", winner: bool = False) -> None:
+        """
+        Reporte les compteurs d'une variante (variant()) sur l'agent; winner:
+        la variante retenue, dont l'agent reprend aussi le dernier prompt
+        (base des compressions et de la réutilisation du préfixe suivantes).
+        """
+        if clone is self:
+            return
+        self.call_count += clone.call_count
+        self.total_tokens += clone.total_tokens
+        self.repairs += clone.repairs
+        self.usage.add(clone.usage)
+        self.prefix_reuse.absorb(clone.prefix_reuse, adopt=winner)
+        self.prompt_assembler.absorb(clone.prompt_assembler, adopt=winner)
+        self.early_stops.absorb(clone.early_stops)
+        if winner:
+            self.early_stops.last = clone.early_stops.last
+    
+    def counters_state(self) -> dict:
+        """Compteurs de l'agent et état de ses prompts, pour un checkpoint"""
+        return {
+            "call_count": self.call_count,
+            "total_tokens": self.total_tokens,
+            "repairs": self.repairs,
+            "usage": asdict(self.usage),
+            "flagged": self.prompt_assembler.flagged_state(),
+            "token_ratios": dict(self.prompt_assembler.estimator.ratios),
+        }
+    
+    def restore_counters(self, state: dict) -> None:
+        """Restaure l'état enregistré par counters_state()"""
+        self.call_count = state["call_count"]
+        self.total_tokens = state["total_tokens"]
+        self.repairs = state["repairs"]
+        self.usage = LLMUsage(**state["usage"])
+        self.prompt_assembler.restore_flagged(state["flagged"])
+        self.prompt_assembler.estimator.ratios = dict(state["token_ratios"])
+    
+    @abstractmethod
+    def build_prompt(self, *args, **kwargs) -> str:
+        """Construit le prompt de l'agent à partir de ses entrées"""
+        pass
     
     @abstractmethod
+    def parse_output(self, content: str) -> AgentOutput:
+        """Transforme la réponse brute du LLM en AgentOutput"""
+        pass
+    
+    def render_prompt(self, iteration: int, template: Optional[PromptTemplate] = None, **inputs) -> str:
+        """Rend prompt_template (ou template) dans le budget de tokens du modèle de l'agent"""
+        return self.prompt_assembler.render(
+            template or self.prompt_template, iteration, self.model_name, self.options, **inputs
+        )
+    
+    def build_followup(self, inputs: dict, changed: dict) -> str:
+        """Prompt de suite de session: uniquement les entrées modifiées depuis l'appel précédent"""
+        parts = []
+        if changed:
+            parts.append("MISES À JOUR depuis l'itération précédente (le reste est inchangé):")
+            for name, value in changed.items():
+                section = self.prompt_template.section(name) if self.prompt_template else None
+                parts.append((section or PromptSection(name, name.upper())).render(value))
+        else:
+            parts.append("Aucune entrée n'a changé depuis l'itération précédente.")
+        parts.append(f"ITÉRATION: {inputs.get('iteration', '?')}")
+        parts.append("Produis une nouvelle réponse complète, avec les mêmes consignes et le même format.")
+        return "\n\n".join(parts) + "\n"
+    
     def execute(self, *args, **kwargs) -> AgentOutput:
         """Exécute la tâche spécifique de l'agent"""
-        pass
+        prompt, turn = self._begin_turn(args, kwargs)
+        content = self._call_llm(prompt, temperature=self.options["temperature"], turn=turn)
+        repair = self._repair_prompt(content)
+        if repair:
+            usage = self.last_usage
+            content = self._call_llm(repair, temperature=0.0) or content
+            self._merge_usage(usage)
+        return self._finish_output(self.parse_output(content))
+    
+    async def aexecute(self, *args, **kwargs) -> AgentOutput:
+        """Version asynchrone de execute (nécessite un AsyncOllamaClient)"""
+        prompt, turn = self._begin_turn(args, kwargs)
+        content = await self._acall_llm(prompt, temperature=self.options["temperature"], turn=turn)
+        repair = self._repair_prompt(content)
+        if repair:
+            usage = self.last_usage
+            content = await self._acall_llm(repair, temperature=0.0) or content
+            self._merge_usage(usage)
+        return self._finish_output(self.parse_output(content))
+    
+    def output_format(self) -> str:
+        """Consignes de format de la réponse selon le mode (JSON ou texte)"""
+        return self.json_format if self.structured else self.text_format
+    
+    def parse_structured(self, content: str) -> Optional[dict]:
+        """Réponse JSON conforme à output_schema (None si invalide ou mode texte)"""
+        if not self.structured:
+            return None
+        data = parse_json_object(content)
+        if data is None or validate_schema(data, self.output_schema):
+            return None
+        return data
+    
+    def _repair_prompt(self, content: str) -> Optional[str]:
+        """Prompt de réparation d'une réponse JSON invalide (None si rien à réparer)"""
+        if not self.structured or not content:
+            return None
+        data = parse_json_object(content)
+        errors = validate_schema(data, self.output_schema) if data is not None else ["JSON illisible"]
+        if not errors:
+            return None
+        self.repairs += 1
+        logger.warning(f"🔧 [{self.role}] Réponse JSON invalide ({'; '.join(errors[:3])}), relance de réparation")
+        return REPAIR_PROMPT.format(
+            schema=json.dumps(self.output_schema, ensure_ascii=False),
+            errors="; ".join(errors[:5]),
+            response=truncate_middle(content, 4000),
+        )
+    
+    def _merge_usage(self, previous: Optional[LLMUsage]) -> None:
+        """Compteurs de la tâche = appel initial + relance"""
+        if previous is None or self.last_usage is None:
+            return
+        merged = LLMUsage()
+        merged.add(previous)
+        merged.add(self.last_usage)
+        self.last_usage = merged
+    
+    def _finish_output(self, output: AgentOutput) -> AgentOutput:
+        """
+        Attache les compteurs du dernier appel; en mode JSON, les événements
+        de streaming (illisibles au fil du JSON) sont émis une fois la réponse validée.
+        """
+        if self.structured and self.stream and self.event_listeners:
+            events = [StreamEvent("score", output.score, self.role)] if output.score is not None else []
+            events += [StreamEvent("issue", issue, self.role) for issue in output.issues]
+            events += [StreamEvent("recommendation", rec, self.role) for rec in output.recommendations]
+            self._emit(events)
+        return self._with_usage(output)
+    
+    def _with_usage(self, output: AgentOutput) -> AgentOutput:
+        """Attache à la sortie les compteurs réels du dernier appel"""
+        if self.last_usage is not None and self.last_usage.calls:
+            output.usage = self.last_usage
+            output.token_count = self.last_usage.total_tokens
+        return output
+    
+    def _begin_turn(self, args: tuple, kwargs: dict) -> tuple[str, Optional[dict]]:
+        """
+        Prompt à envoyer: complet, ou seulement les entrées modifiées si la
+        session est active et que la fenêtre de contexte le permet.
+        """
+        prompt = self.build_prompt(*args, **kwargs)
+        if self.session is None:
+            return prompt, None
+        
+        bound = inspect.signature(self.build_prompt).bind(*args, **kwargs)
+        bound.apply_defaults()
+        turn = {"inputs": dict(bound.arguments), "context": None, "tokens_saved": 0}
+        
+        if self.session.active:
+            followup = self.build_followup(turn["inputs"], self.session.changed_inputs(turn["inputs"]))
+            if self.session.has_room_for(followup):
+                turn["context"] = self.session.context
+                turn["tokens_saved"] = (len(prompt) - len(followup)) // 4
+                return followup, turn
+            logger.info(f"♻️  [{self.role}] Session réinitialisée (fenêtre de contexte presque pleine)")
+            self.session.reset()
+        
+        return prompt, turn
     
     def _call_llm(
         self,
         prompt: str,
         temperature: float = 0.7,
-        instruction_prefix: str = ""
+        instruction_prefix: str = "",
+        turn: Optional[dict] = None
     ) -> str:
         """Appelle le LLM avec gestion d'erreur"""
-        self.call_count += 1
+        full_prompt = self._prepare_call(prompt, instruction_prefix)
+        context = turn["context"] if turn else None
         
-        full_prompt = f"{instruction_prefix}\n\n{prompt}" if instruction_prefix else prompt
+        cached = None if context else self._semantic_lookup(full_prompt)
+        if cached is not None:
+            self._record_usage(full_prompt, cached, LLMUsage())
+            return cached
         
-        logger.debug(f"🤖 [{self.role}] Appel #{self.call_count} avec {self.model_name}")
+        started = time.perf_counter()
+        if self.stream:
+            response, final = self._stream_llm(full_prompt, temperature, context)
+            new_context = final.get("context") or []
+            usage = LLMUsage.from_response(final) if final else LLMUsage()
+        else:
+            result = self.ollama_client.generate_result(
+                model=self.model_name,
+                prompt=full_prompt,
+                temperature=temperature,
+                keep_alive=self.keep_alive,
+                context=context,
+                options=self._call_options(temperature),
+                format=self._call_format()
+            )
+            response, new_context, usage = result.text, result.context, result.usage
         
-        response = self.ollama_client.generate(
+        if not context:
+            self._semantic_store(full_prompt, response, time.perf_counter() - started)
+        self._end_turn(turn, response, new_context)
+        self._record_usage(full_prompt, response, usage)
+        return response
+    
+    async def _acall_llm(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        instruction_prefix: str = "",
+        turn: Optional[dict] = None
+    ) -> str:
+        """Appelle le LLM sans bloquer la boucle asyncio"""
+        if self.async_client is None:
+            raise RuntimeError(f"[{self.role}] Aucun client asynchrone configuré")
+        
+        full_prompt = self._prepare_call(prompt, instruction_prefix)
+        context = turn["context"] if turn else None
+        
+        cached = None if context else await asyncio.to_thread(self._semantic_lookup, full_prompt)
+        if cached is not None:
+            self._record_usage(full_prompt, cached, LLMUsage())
+            return cached
+        
+        started = time.perf_counter()
+        if self.stream:
+            response, final = await self._astream_llm(full_prompt, temperature, context)
+            new_context = final.get("context") or []
+            usage = LLMUsage.from_response(final) if final else LLMUsage()
+        else:
+            result = await self.async_client.generate_result(
+                model=self.model_name,
+                prompt=full_prompt,
+                temperature=temperature,
+                keep_alive=self.keep_alive,
+                context=context,
+                options=self._call_options(temperature),
+                format=self._call_format()
+            )
+            response, new_context, usage = result.text, result.context, result.usage
+        
+        if not context:
+            await asyncio.to_thread(
+                self._semantic_store, full_prompt, response, time.perf_counter() - started
+            )
+        self._end_turn(turn, response, new_context)
+        self._record_usage(full_prompt, response, usage)
+        return response
+    
+    def _call_options(self, temperature: float) -> dict:
+        """Options Ollama de l'appel: profil de l'agent, température de l'appel"""
+        return {**self.options, "temperature": temperature}
+    
+    def _call_format(self) -> Optional[dict]:
+        """Format Ollama de l'appel: schéma de sortie en mode JSON"""
+        return self.output_schema if self.structured else None
+    
+    def _end_turn(self, turn: Optional[dict], response: str, context: list) -> None:
+        """Met à jour la session (un appel en échec la réinitialise)"""
+        if turn is None or self.session is None:
+            return
+        self.session.record_turn(context if response else [], turn["inputs"], turn["tokens_saved"])
+    
+    def _stream_llm(self, full_prompt: str, temperature: float, context: Optional[list] = None) -> tuple[str, dict]:
+        """
+        Reçoit la réponse en streaming en émettant les événements parsés.
+        Retourne le texte et le dernier message du flux (context, compteurs).
+        """
+        buffer, parser, tracker = self._new_stream_state()
+        final: dict = {}
+        
+        for chunk in self.ollama_client.stream_generate(
             model=self.model_name,
             prompt=full_prompt,
-            temperature=temperature
+            temperature=temperature,
+            keep_alive=self.keep_alive,
+            context=context,
+            on_done=final.update,
+            options=self._call_options(temperature),
+            format=self._call_format(),
+            stop_when=self._stop_condition(parser, tracker)
+        ):
+            buffer.append(chunk)
+            self._emit(parser.feed(chunk))
+            if tracker is not None:
+                tracker.feed(chunk)
+        
+        return self._end_stream(buffer, parser, tracker, final), final
+    
+    async def _astream_llm(self, full_prompt: str, temperature: float, context: Optional[list] = None) -> tuple[str, dict]:
+        """Version asynchrone de _stream_llm"""
+        buffer, parser, tracker = self._new_stream_state()
+        final: dict = {}
+        
+        async for chunk in self.async_client.stream_generate(
+            model=self.model_name,
+            prompt=full_prompt,
+            temperature=temperature,
+            keep_alive=self.keep_alive,
+            context=context,
+            on_done=final.update,
+            options=self._call_options(temperature),
+            format=self._call_format(),
+            stop_when=self._stop_condition(parser, tracker)
+        ):
+            buffer.append(chunk)
+            self._emit(parser.feed(chunk))
+            if tracker is not None:
+                tracker.feed(chunk)
+        
+        return self._end_stream(buffer, parser, tracker, final), final
+    
+    def _new_stream_state(self) -> tuple[ResponseBuffer, IncrementalParser, Optional[JsonCompletion]]:
+        buffer = ResponseBuffer(SYSTEM_CONFIG.get("max_response_chars", 400_000))
+        parser = IncrementalParser(
+            self.stream_sections,
+            agent=self.role,
+            track_score=self.stream_score,
+            score_pattern=self.stream_score_pattern or SCORE_PATTERN,
+            score_kind=self.stream_score_kind
         )
+        tracker = None
+        if self.structured:
+            tracker = JsonCompletion(tuple(self.output_schema.get("required", ())), self._early_stop_items())
+        return buffer, parser, tracker
+    
+    def _early_stop_items(self) -> Optional[int]:
+        return SYSTEM_CONFIG.get("early_stop_max_items") or None
+    
+    def _stop_condition(self, parser: IncrementalParser, tracker: Optional[JsonCompletion]) -> Optional[Callable[[], bool]]:
+        """
+        Arrêt anticipé du flux (None si désactivé): en texte, score lu et
+        sections fermées ou pleines; en JSON, dernière liste pleine (un objet
+        refermé met de lui-même fin à la génération contrainte par le schéma).
+        """
+        if not self.early_stop:
+            return None
+        if tracker is not None:
+            return lambda: tracker.capped
+        max_items = self._early_stop_items()
+        return lambda: parser.is_complete(max_items)
+    
+    def _end_stream(
+        self,
+        buffer: ResponseBuffer,
+        parser: IncrementalParser,
+        tracker: Optional[JsonCompletion],
+        final: dict
+    ) -> str:
+        """Texte exploitable du flux, et gain de l'arrêt anticipé s'il a eu lieu"""
+        self._emit(parser.close())
+        text = buffer.text()
+        if tracker is not None and tracker.complete:
+            text = tracker.finish(text)
         
-        # Estimation tokens (approximation: ~4 chars = 1 token)
-        self.total_tokens += len(full_prompt) // 4 + len(response) // 4
+        if final.get("done_reason") == "early_stop":
+            saved = self.early_stops.record_cut(
+                final.get("eval_count", 0),
+                final.get("eval_duration", 0) / NANOSECONDS,
+                self.options.get("num_predict")
+            )
+            logger.info(
+                f"✂️  [{self.role}] Génération arrêtée après {saved['tokens_generated']} tokens "
+                f"(~{saved['tokens_saved']} tokens, ~{saved['seconds_saved']}s économisés)"
+            )
+        elif final:
+            self.early_stops.record_full(final.get("eval_count", 0))
+        return text.strip()
+    
+    def _emit(self, events: list[StreamEvent]) -> None:
+        """Transmet les événements aux listeners (une erreur n'interrompt pas le flux)"""
+        for event in events:
+            for listener in self.event_listeners:
+                try:
+                    listener(event)
+                except Exception as e:
+                    logger.warning(f"Listener streaming en erreur: {e}")
+    
+    def _uses_semantic_cache(self) -> bool:
+        return self.semantic_cache is not None and self.semantic_cache.enabled_for(self.config_key)
+    
+    def _semantic_lookup(self, full_prompt: str) -> Optional[str]:
+        """Réponse d'un prompt quasi identique déjà traité (None si absent ou cache inactif)"""
+        if not self._uses_semantic_cache():
+            return None
+        return self.semantic_cache.lookup(self.config_key, self.model_name, full_prompt)
+    
+    def _semantic_store(self, full_prompt: str, response: str, seconds: float) -> None:
+        if self._uses_semantic_cache():
+            self.semantic_cache.store(self.config_key, self.model_name, full_prompt, response, seconds)
+    
+    def _prepare_call(self, prompt: str, instruction_prefix: str = "") -> str:
+        """Comptabilise l'appel et assemble le prompt complet"""
+        self.call_count += 1
         
-        return response
+        full_prompt = f"{instruction_prefix}\n\n{prompt}" if instruction_prefix else prompt
+        reuse = self.prefix_reuse.record(full_prompt)
+        
+        logger.debug(
+            f"🤖 [{self.role}] Appel #{self.call_count} avec {self.model_name} "
+            f"(préfixe réutilisable: {reuse:.0%})"
+        )
+        return full_prompt
+    
+    def _record_usage(self, full_prompt: str, response: str, usage: LLMUsage) -> None:
+        """Met à jour les compteurs de tokens (réels si Ollama les a renvoyés)"""
+        self.last_usage = usage
+        self.usage.add(usage)
+        if usage.calls and self.prefix_reuse.last_ratio == 0.0:
+            # Prompt évalué en entier (aucun préfixe en cache): calibre l'estimation
+            self.prompt_assembler.estimator.observe(self.model_name, len(full_prompt), usage.prompt_eval_count)
+        if usage.calls:
+            self.total_tokens += usage.total_tokens
+        else:
+            # Estimation tokens (approximation: ~4 chars = 1 token)
+            self.total_tokens += len(full_prompt) // 4 + len(response) // 4
     
-    def extract_score(self, content: str) -> float:
-        """Extrait un score (0-100) du contenu"""
-        import re
-        # Cherche patterns comme "score: 85", "qualité: 92%", etc.
+    def extract_score(
+        self, content: str, labels: tuple = ("SCORE GLOBAL", "SCORE"), fallback: bool = True
+    ) -> Optional[float]:
+        """
+        Extrait un score (0-100) du contenu: ligne "LABEL: N" (labels par
+        ordre de priorité), sinon (fallback) note "N/100" ou "N%". Les plages
+        recopiées des consignes ("0-100") ne comptent pas. None si aucun score.
+        """
+        number = r"(\d{1,3}(?:[.,]\d+)?)(?![\d.,]|\s*[-–]\s*\d)"
         patterns = [
-            r"score[:\s]+(\d+)",
-            r"qualité[:\s]+(\d+)",
-            r"(\d+)\s*%",
-            r"(\d+)/100"
+            rf"^[\s>*#-]*{re.escape(label)}\**\s*[:=]\s*\**\s*{number}" for label in labels
         ]
+        if fallback:
+            patterns += [
+                rf"(?<![\d.,-]){number}\s*/\s*100\b",
+                rf"(?<![\d.,-]){number}\s*%",
+            ]
         
         for pattern in patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
+            match = re.search(pattern, content, re.IGNORECASE | re.MULTILINE)
             if match:
-                score = float(match.group(1))
-                return min(100, max(0, score))
+                score = float(match.group(1).replace(",", "."))
+                return min(100.0, max(0.0, score))
         
-        return 0.0
+        return None
     
     def __str__(self) -> str:
         return f"🤖 {self.role} ({self.model_name}) - {self.call_count} appels"
@@ -0,0 +1,297 @@
+"""
+Assemblage des prompts dans le budget de tokens du modèle.
+
+Au lieu de tronquer chaque section à un nombre fixe de caractères, le budget
+du prompt est dérivé de la fenêtre réelle de l'agent (num_ctx, moins
+num_predict réservé à la réponse) et réparti entre les sections
+compressibles (architecture, code) au prorata de leur poids. Une section
+trop longue garde en priorité ses lignes importantes: lignes citées par les
+derniers problèmes remontés, signatures et titres, lignes modifiées depuis
+le prompt précédent; le reste est remplacé par des marqueurs d'omission.
+"""
+
+import logging
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..config.settings import PROMPT_BUDGET
+from ..utils.helpers import truncate_middle
+from .prompt_templates import PromptTemplate
+
+logger = logging.getLogger(__name__)
+
+# Caractères par token selon la famille du modèle (estimation prudente pour
+# du code et du français, corrigée ensuite par les compteurs réels d'Ollama)
+CHARS_PER_TOKEN = {
+    "codellama": 3.0,
+    "llama2": 3.0,
+    "mistral": 3.2,
+    "deepseek-coder": 3.4,
+    "qwen": 3.8,
+    "llama3": 4.0,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.2
+
+# Importance des lignes d'une section (la plus haute est gardée d'abord)
+FLAGGED, SIGNATURE, CHANGED, PLAIN, BLANK = 4, 3, 2, 1, 0
+
+_SIGNATURE = re.compile(
+    r"^\s*(?:(?:async\s+)?def |class |@\w|import |from \S+ import |(?:export\s+)?(?:async\s+)?function |"
+    r"interface |struct |(?:pub\s+)?fn |func |(?:public|private|protected)\s|#{1,6} |```)"
+)
+_ISSUE_TERMS = (
+    re.compile(r"`([^`\n]{3,60})`"),                   # `nom_de_fonction`, `SELECT ...`
+    re.compile(r"\b([A-Za-z_]\w*)\(\)"),               # appel: validate_token()
+    re.compile(r"\b([a-z]\w*_\w+)\b"),                 # snake_case
+    re.compile(r"\b([A-Z][a-z0-9]+[A-Z]\w*)\b"),       # CamelCase
+)
+_MAX_FLAGGED_TERMS = 50
+_FLAGGED_CONTEXT_LINES = 2   # Lignes gardées autour d'une ligne signalée
+_FLAGGED_BLOCK_LINES = 40    # Corps gardé sous une signature signalée
+_MARKER_CHARS = 26  # "... [NNN lignes omises]" + saut de ligne
+
+
+@dataclass
+class TokenEstimator:
+    """Estimation des tokens par modèle, ajustée sur les prompt_eval_count d'Ollama"""
+    ratios: dict = field(default_factory=dict)  # {modèle: caractères par token observés}
+    smoothing: float = 0.3
+    
+    def chars_per_token(self, model: str) -> float:
+        if model in self.ratios:
+            return self.ratios[model]
+        family = model.split(":")[0].lower()
+        for prefix, ratio in CHARS_PER_TOKEN.items():
+            if family.startswith(prefix):
+                return ratio
+        return DEFAULT_CHARS_PER_TOKEN
+    
+    def estimate(self, text: str, model: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token(model)) if text else 0
+    
+    def observe(self, model: str, chars: int, prompt_tokens: int) -> None:
+        """Intègre un comptage réel (prompt entièrement évalué, sans cache de préfixe)"""
+        if chars <= 0 or prompt_tokens <= 0:
+            return
+        ratio = chars / prompt_tokens
+        if not 1.5 <= ratio <= 6.0:  # Comptage partiel ou aberrant
+            return
+        previous = self.chars_per_token(model)
+        self.ratios[model] = round(previous + self.smoothing * (ratio - previous), 3)
+
+
+class PromptAssembler:
+    """
+    Rend un PromptTemplate dans le budget de tokens d'un modèle et comptabilise
+    le contenu omis (par appel et en cumul).
+    """
+    
+    def __init__(self, estimator: Optional[TokenEstimator] = None):
+        self.estimator = estimator or TokenEstimator()
+        self.calls = 0
+        self.compressed_calls = 0
+        self.dropped_chars = 0
+        self.dropped_tokens = 0
+        self.last_dropped: dict = {}  # {section: tokens omis au dernier appel}
+        self._flagged: dict = {}      # {source: termes cités par ses derniers problèmes}
+        self._previous: dict = {}     # {section: valeur envoyée au dernier appel}
+    
+    def fork(self) -> "PromptAssembler":
+        """
+        Assembleur d'une copie d'agent (variant()): même estimateur, termes
+        signalés et dernières valeurs copiés, compteurs à zéro.
+        """
+        clone = PromptAssembler(self.estimator)
+        clone._flagged = {source: list(terms) for source, terms in self._flagged.items()}
+        clone._previous = dict(self._previous)
+        return clone
+    
+    def absorb(self, clone: "PromptAssembler", adopt: bool = False) -> None:
+        """Reporte les compteurs de clone (fork()); adopt: reprend aussi son dernier prompt"""
+        self.calls += clone.calls
+        self.compressed_calls += clone.compressed_calls
+        self.dropped_chars += clone.dropped_chars
+        self.dropped_tokens += clone.dropped_tokens
+        if adopt:
+            self.last_dropped = dict(clone.last_dropped)
+            self._previous = dict(clone._previous)
+    
+    def flag(self, source: str, issues: list) -> None:
+        """Remplace les termes signalés par source (reviewer, security...)"""
+        terms = []
+        for issue in issues:
+            for pattern in _ISSUE_TERMS:
+                terms.extend(match.strip() for match in pattern.findall(str(issue)))
+        self._flagged[source] = list(dict.fromkeys(t for t in terms if len(t) >= 3))[:_MAX_FLAGGED_TERMS]
+    
+    @property
+    def flagged_terms(self) -> list:
+        return [term for terms in self._flagged.values() for term in terms]
+    
+    def flagged_state(self) -> dict:
+        """Termes signalés par source (checkpoint)"""
+        return {source: list(terms) for source, terms in self._flagged.items()}
+    
+    def restore_flagged(self, state: dict) -> None:
+        """Restaure les termes enregistrés par flagged_state()"""
+        self._flagged = {source: list(terms) for source, terms in state.items()}
+    
+    def budget(self, options: dict) -> int:
+        """Tokens disponibles pour le prompt: num_ctx - num_predict - marge"""
+        num_ctx = options.get("num_ctx") or PROMPT_BUDGET["default_num_ctx"]
+        num_predict = options.get("num_predict")
+        if not num_predict or num_predict < 0:  # -1 = illimité: un quart de la fenêtre
+            num_predict = num_ctx // 4
+        return num_ctx - min(num_predict, num_ctx) - PROMPT_BUDGET["reserve_tokens"]
+    
+    def render(self, template: PromptTemplate, iteration: int, model: str, options: dict, **inputs) -> str:
+        """Prompt complet, sections compressibles réduites à leur part du budget"""
+        compressible = {
+            s.name: str(inputs[s.name]) for s in template.sections
+            if s.weight and s.name in inputs
+        }
+        fixed = template.render(iteration, **{**inputs, **{name: "" for name in compressible}})
+        available = self.budget(options) - self.estimator.estimate(fixed, model)
+        demands = {
+            name: (self.estimator.estimate(value, model), template.section(name).weight)
+            for name, value in compressible.items()
+        }
+        
+        ratio = self.estimator.chars_per_token(model)
+        self.last_dropped = {}
+        for name, tokens in allocate(available, demands).items():
+            value = compressible[name]
+            if demands[name][0] > tokens:
+                kept = compress(value, int(tokens * ratio), self.flagged_terms, self._previous.get(name))
+                dropped = len(value) - len(kept)
+                self.last_dropped[name] = math.ceil(dropped / ratio)
+                self.dropped_chars += dropped
+                inputs[name] = kept
+            self._previous[name] = value
+        
+        self.calls += 1
+        if self.last_dropped:
+            self.compressed_calls += 1
+            self.dropped_tokens += sum(self.last_dropped.values())
+            logger.info(
+                f"✂️  Prompt {model}: ~{sum(self.last_dropped.values())} tokens omis "
+                f"({', '.join(f'{n}: {t}' for n, t in self.last_dropped.items())})"
+            )
+        return template.render(iteration, **inputs)
+    
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "compressed_calls": self.compressed_calls,
+            "dropped_chars": self.dropped_chars,
+            "dropped_tokens": self.dropped_tokens,
+            "last_dropped": dict(self.last_dropped),
+        }
+
+
+def allocate(available: int, demands: dict) -> dict:
+    """
+    Répartit available tokens entre sections {nom: (tokens demandés, poids)}:
+    une section plus courte que sa part la garde entière, le surplus revient
+    aux autres au prorata de leur poids.
+    """
+    minimum = PROMPT_BUDGET["min_section_tokens"]
+    budgets = {}
+    pending = dict(demands)
+    available = max(available, 0)
+    while pending:
+        total_weight = sum(weight for _, weight in pending.values())
+        fitting = [
+            name for name, (tokens, weight) in pending.items()
+            if tokens <= available * weight / total_weight
+        ]
+        if not fitting:
+            for name, (_, weight) in pending.items():
+                budgets[name] = max(minimum, int(available * weight / total_weight))
+            break
+        for name in fitting:
+            budgets[name] = pending.pop(name)[0]
+            available -= budgets[name]
+    return budgets
+
+
+def compress(text: str, max_chars: int, flagged_terms: list = (), previous: Optional[str] = None) -> str:
+    """
+    Réduit text à environ max_chars en gardant les lignes les plus importantes,
+    dans leur ordre d'origine; chaque passage omis devient un marqueur.
+    """
+    if len(text) <= max_chars:
+        return text
+    
+    lines = text.split("\n")
+    scores = _score_lines(lines, flagged_terms, previous)
+    # Lignes non vides; une ligne vide suit le sort de la ligne qui la précède
+    content = [i for i, score in enumerate(scores) if score != BLANK]
+    cost = {
+        i: sum(len(line) + 1 for line in lines[i:after])
+        for i, after in zip(content, content[1:] + [len(lines)])
+    }
+    last = len(content) - 1
+    # À importance égale, le début et la fin du texte d'abord (comme truncate_middle)
+    order = sorted(range(len(content)), key=lambda k: (-scores[content[k]], min(k, last - k)))
+    
+    kept = [False] * len(content)
+    used = _MARKER_CHARS  # Au départ, un seul passage omis: tout le texte
+    for k in order:
+        # Garder une ligne peut couper un passage omis en deux, ou en fusionner deux
+        before = k == 0 or kept[k - 1]
+        after = k == last or kept[k + 1]
+        markers = -1 if before and after else (1 if not before and not after else 0)
+        if used + cost[content[k]] + markers * _MARKER_CHARS <= max_chars:
+            kept[k] = True
+            used += cost[content[k]] + markers * _MARKER_CHARS
+    if not any(kept):
+        return truncate_middle(text, max_chars)
+    
+    parts, skipped = [], 0
+    for k, i in enumerate(content):
+        if not kept[k]:
+            skipped += 1
+            continue
+        if skipped:
+            parts.append(f"... [{skipped} lignes omises]")
+            skipped = 0
+        after = content[k + 1] if k < last else len(lines)
+        parts.extend(lines[i:after])
+    if skipped:
+        parts.append(f"... [{skipped} lignes omises]")
+    return "\n".join(parts)
+
+
+def _score_lines(lines: list, flagged_terms, previous: Optional[str]) -> list:
+    previous_lines = {line.strip() for line in previous.split("\n")} if previous else None
+    flagged = (
+        re.compile(r"(?<!\w)(?:" + "|".join(map(re.escape, flagged_terms)) + r")(?!\w)")
+        if flagged_terms else None
+    )
+    scores = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            scores.append(BLANK)
+        elif flagged and flagged.search(line):
+            scores.append(FLAGGED)
+        elif _SIGNATURE.match(line):
+            scores.append(SIGNATURE)
+        elif previous_lines is not None and stripped not in previous_lines:
+            scores.append(CHANGED)
+        else:
+            scores.append(PLAIN)
+    
+    # Une ligne signalée entraîne son voisinage, une signature signalée tout son bloc
+    for i in [i for i, score in enumerate(scores) if score == FLAGGED]:
+        end = i + 1
+        if _SIGNATURE.match(lines[i]):
+            while end < len(lines) and end - i <= _FLAGGED_BLOCK_LINES and not _SIGNATURE.match(lines[end]):
+                end += 1
+        for j in range(max(0, i - _FLAGGED_CONTEXT_LINES), min(len(lines), max(end, i + _FLAGGED_CONTEXT_LINES + 1))):
+            if scores[j] != BLANK:
+                scores[j] = FLAGGED
+    return scores
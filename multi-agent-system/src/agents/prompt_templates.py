@@ -0,0 +1,110 @@
+"""
+Templates de prompts à préfixe stable.
+
+llama.cpp (sous Ollama) réutilise le KV-cache du plus long préfixe commun
+avec le prompt précédent. Un numéro d'itération placé en tête invalide donc
+tout le cache à chaque itération. Les templates ordonnent le contenu du plus
+stable (rôle, consignes, requirements) au plus volatil (dernier code,
+numéro d'itération), et sont compilés une seule fois.
+
+Les sections pondérées (weight > 0) sont compressibles: PromptAssembler
+(prompt_budget.py) les réduit à leur part du budget de tokens du modèle.
+"""
+
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from string import Formatter
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class PromptSection:
+    """Bloc d'entrée d'un prompt (titre + valeur)"""
+    name: str           # Nom du paramètre de build_prompt
+    title: str
+    weight: float = 0.0  # Part du budget de tokens (0 = section envoyée entière)
+    
+    def render(self, value) -> str:
+        return f"{self.title}:\n{value}"
+
+
+class PromptTemplate:
+    """
+    Prompt précompilé: consignes fixes, puis sections du plus stable au plus
+    volatil, puis numéro d'itération et rappel final.
+
+    Les consignes peuvent contenir des champs stables sur tout un run
+    (ex: {language}); leur rendu est mémorisé.
+    """
+    
+    def __init__(self, instructions: str, sections: tuple = (), footer: str = ""):
+        self.instructions = instructions.strip("\n")
+        self.sections = tuple(sections)
+        self.footer = footer.strip("\n")
+        self.fields = tuple(
+            name for _, name, _, _ in Formatter().parse(self.instructions) if name
+        )
+        self._by_name = {section.name: section for section in self.sections}
+        self._render_instructions = lru_cache(maxsize=16)(self._format_instructions)
+    
+    def section(self, name: str) -> Optional[PromptSection]:
+        return self._by_name.get(name)
+    
+    def render(self, iteration: int, **inputs) -> str:
+        """Assemble le prompt (les entrées absentes des sections et champs sont ignorées)"""
+        parts = [self._render_instructions(tuple(inputs.get(name) for name in self.fields))]
+        parts += [
+            section.render(inputs[section.name])
+            for section in self.sections
+            if section.name in inputs
+        ]
+        parts.append(f"ITÉRATION: {iteration}")
+        if self.footer:
+            parts.append(self.footer)
+        return "\n\n".join(parts) + "\n"
+    
+    def _format_instructions(self, values: tuple) -> str:
+        if not self.fields:
+            return self.instructions
+        return self.instructions.format(**dict(zip(self.fields, values)))
+
+
+@dataclass
+class PrefixReuse:
+    """Part de chaque prompt identique au début du prompt précédent de l'agent"""
+    calls: int = 0
+    reused_chars: int = 0
+    prompt_chars: int = 0
+    last_ratio: float = 0.0
+    _previous: str = field(default="", repr=False)
+    
+    def record(self, prompt: str) -> float:
+        """Enregistre un appel et retourne la fraction du prompt réutilisable"""
+        reused = len(os.path.commonprefix([self._previous, prompt])) if self._previous else 0
+        self.calls += 1
+        self.reused_chars += reused
+        self.prompt_chars += len(prompt)
+        self.last_ratio = reused / len(prompt) if prompt else 0.0
+        self._previous = prompt
+        return self.last_ratio
+    
+    def fork(self) -> "PrefixReuse":
+        """Mesure d'une copie d'agent (variant()): même prompt précédent, compteurs à zéro"""
+        return PrefixReuse(_previous=self._previous)
+    
+    def absorb(self, clone: "PrefixReuse", adopt: bool = False) -> None:
+        """Reporte les compteurs de clone (fork()); adopt: reprend aussi son dernier prompt"""
+        self.calls += clone.calls
+        self.reused_chars += clone.reused_chars
+        self.prompt_chars += clone.prompt_chars
+        if adopt:
+            self.last_ratio = clone.last_ratio
+            self._previous = clone._previous
+    
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "reuse_ratio": round(self.reused_chars / self.prompt_chars, 3) if self.prompt_chars else 0.0,
+            "last_ratio": round(self.last_ratio, 3),
+        }
@@ -0,0 +1,69 @@
+"""
+Session LLM d'un agent d'une itération à l'autre.
+
+Ollama renvoie avec chaque génération un `context` (tokens de la conversation
+déjà évaluée). En le renvoyant à l'appel suivant, l'agent n'envoie plus que
+ce qui a changé depuis l'itération précédente (nouveau code, nouveaux
+problèmes) au lieu de ré-encoder requirements et architecture: sur CPU,
+l'évaluation du prompt domine le temps d'appel.
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class AgentSession:
+    """État de conversation d'un agent (context Ollama + dernières entrées envoyées)"""
+    num_ctx: int = 4096        # Fenêtre de contexte du modèle (tokens)
+    reset_ratio: float = 0.8   # Réinitialise au-delà de cette fraction de num_ctx
+    context: list = field(default_factory=list)
+    inputs: dict = field(default_factory=dict)
+    turns: int = 0
+    resets: int = 0
+    tokens_saved: int = 0      # Tokens de prompt non renvoyés (estimation)
+    
+    @property
+    def active(self) -> bool:
+        return bool(self.context)
+    
+    def changed_inputs(self, inputs: dict, ignore: tuple = ("iteration",)) -> dict:
+        """Entrées différentes de celles déjà envoyées dans la session"""
+        return {
+            name: value for name, value in inputs.items()
+            if name not in ignore and self.inputs.get(name) != value
+        }
+    
+    def has_room_for(self, prompt: str, expected_output_tokens: Optional[int] = None) -> bool:
+        """Vrai si le prompt (et la réponse attendue) tient sous le seuil de réinitialisation"""
+        # Estimation tokens (approximation: ~4 chars = 1 token)
+        expected = len(prompt) // 4 + (expected_output_tokens or self._average_turn_tokens())
+        return len(self.context) + expected <= self.num_ctx * self.reset_ratio
+    
+    def record_turn(self, context: list, inputs: dict, tokens_saved: int = 0) -> None:
+        """Enregistre le context renvoyé par Ollama après un appel"""
+        if not context:
+            self.reset()
+            return
+        self.context = list(context)
+        self.inputs = dict(inputs)
+        self.turns += 1
+        self.tokens_saved += max(0, tokens_saved)
+    
+    def reset(self) -> None:
+        if self.context:
+            self.resets += 1
+        self.context = []
+        self.inputs = {}
+        self.turns = 0
+    
+    def stats(self) -> dict:
+        return {
+            "context_tokens": len(self.context),
+            "turns": self.turns,
+            "resets": self.resets,
+            "prompt_tokens_saved": self.tokens_saved,
+        }
+    
+    def _average_turn_tokens(self) -> int:
+        return len(self.context) // self.turns if self.turns else 0
@@ -3,9 +3,12 @@ Implémentation des agents spécialisés.
 """
 
 from .base_agent import BaseAgent, AgentOutput
-from ..utils.helpers import truncate_middle, extract_bulleted_section
-from ..config.settings import PROMPT_LIMITS
+from .prompt_templates import PromptSection, PromptTemplate
+from ..utils.helpers import extract_bulleted_section
+from ..config.settings import PROMPT_BUDGET
 import logging
+import re
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -13,18 +16,10 @@ logger = logging.getLogger(__name__)
 class ArchitectAgent(BaseAgent):
     """Agent responsable de la conception architecture"""
     
-    def __init__(self, ollama_client, model_name: str = "mistral"):
-        super().__init__(ollama_client, model_name, "Architecte")
-    
-    def execute(self, requirements: str, iteration: int = 1) -> AgentOutput:
-        """Crée l'architecture du projet"""
-        
-        prompt = f"""Tu es un architecte logiciel expert en conception système.
-
-ITÉRATION: {iteration}
-
-REQUIREMENTS CLIENT:
-{requirements}
+    config_key = "architect"
+    temperature = 0.7
+    prompt_template = PromptTemplate(
+        instructions="""Tu es un architecte logiciel expert en conception système.
 
 Génère une architecture détaillée complète avec:
 1. **Diagramme composants** (en ASCII ou description textuelle)
@@ -35,11 +30,43 @@ Génère une architecture détaillée complète avec:
 6. **Stratégie de scalabilité**
 7. **Points de sécurité critiques** à prendre en compte
 
-Format ta réponse en sections claires avec markdown.
-"""
-        
-        content = self._call_llm(prompt, temperature=0.7)
-        
+Format ta réponse en sections claires avec markdown.""",
+        sections=(
+            PromptSection("requirements", "REQUIREMENTS CLIENT"),
+            PromptSection("architecture", "ARCHITECTURE ACTUELLE", PROMPT_BUDGET["weights"]["architecture"]),
+            PromptSection(
+                "feedback",
+                "PROBLÈMES ARCHITECTURAUX À CORRIGER (révise l'architecture actuelle, "
+                "garde ce qui n'est pas concerné)"
+            ),
+        )
+    )
+    
+    def __init__(self, ollama_client, model_name: str = "mistral", async_client=None):
+        super().__init__(ollama_client, model_name, "Architecte", async_client)
+    
+    def build_prompt(
+        self,
+        requirements: str,
+        iteration: int = 1,
+        architecture: str = "",
+        feedback: Optional[list] = None
+    ) -> str:
+        """
+        Construit le prompt de conception de l'architecture; avec architecture
+        et feedback, le prompt de révision de l'architecture existante.
+        """
+        if architecture and feedback:
+            return self.render_prompt(
+                iteration,
+                requirements=requirements,
+                architecture=architecture,
+                feedback="\n".join(f"- {issue}" for issue in feedback)
+            )
+        return self.render_prompt(iteration, requirements=requirements)
+    
+    def parse_output(self, content: str) -> AgentOutput:
+        """Interprète la réponse du LLM"""
         return AgentOutput(
             agent_name="ArchitectAgent",
             success=bool(content),
@@ -51,27 +78,10 @@ Format ta réponse en sections claires avec markdown.
 class DeveloperAgent(BaseAgent):
     """Agent responsable de la génération de code"""
     
-    def __init__(self, ollama_client, model_name: str = "codellama"):
-        super().__init__(ollama_client, model_name, "Développeur")
-    
-    def execute(
-        self,
-        architecture: str,
-        requirements: str,
-        language: str = "python",
-        iteration: int = 1
-    ) -> AgentOutput:
-        """Génère le code selon l'architecture"""
-        
-        prompt = f"""Tu es un développeur expert en {language}.
-
-ITÉRATION: {iteration}
-
-ARCHITECTURE À IMPLÉMENTER:
-{truncate_middle(architecture, PROMPT_LIMITS["architecture_context"])}
-
-REQUIREMENTS:
-{requirements}
+    config_key = "developer"
+    temperature = 0.5
+    prompt_template = PromptTemplate(
+        instructions="""Tu es un développeur expert en {language}.
 
 Génère du code professionnel:
 - Code complet et fonctionnel (pas de pseudocode)
@@ -84,12 +94,65 @@ Génère du code professionnel:
 
 Structure ta réponse:
 1. **Fichiers à créer** (liste avec chemins)
-2. **Code complet** (fichier par fichier)
-3. **Dépendances** (requirements.txt si Python)
-"""
-        
-        content = self._call_llm(prompt, temperature=0.5)
-        
+2. **Code complet** (fichier par fichier, chaque bloc précédé de son chemin: ### `chemin/fichier`)
+3. **Dépendances** (requirements.txt si Python)""",
+        sections=(
+            PromptSection("requirements", "REQUIREMENTS"),
+            PromptSection("architecture", "ARCHITECTURE À IMPLÉMENTER", PROMPT_BUDGET["weights"]["architecture"]),
+            PromptSection("findings", "PROBLÈMES SIGNALÉS À CORRIGER"),
+        )
+    )
+    # Raffinement: seules les modifications du code existant sont demandées
+    refine_template = PromptTemplate(
+        instructions="""Tu es un développeur expert en {language}.
+
+Corrige le CODE ACTUEL pour résoudre les PROBLÈMES À CORRIGER, sans rien
+changer d'autre. Réponds uniquement par des modifications:
+- un bloc ```diff par fichier modifié, au format diff unifié
+  (--- a/chemin, +++ b/chemin, hunks @@ avec 2-3 lignes de contexte inchangées)
+- ou, pour un nouveau fichier ou une réécriture importante: une ligne
+  FICHIER: chemin, puis le contenu complet du fichier dans un bloc de code
+N'inclus pas les fichiers inchangés. Pas d'explication hors des blocs.""",
+        sections=(
+            PromptSection("requirements", "REQUIREMENTS"),
+            PromptSection("architecture", "ARCHITECTURE", PROMPT_BUDGET["weights"]["architecture"]),
+            PromptSection("code", "CODE ACTUEL", PROMPT_BUDGET["weights"]["code"]),
+            PromptSection("findings", "PROBLÈMES À CORRIGER"),
+        )
+    )
+    
+    def __init__(self, ollama_client, model_name: str = "codellama", async_client=None):
+        super().__init__(ollama_client, model_name, "Développeur", async_client)
+    
+    def build_prompt(
+        self,
+        architecture: str,
+        requirements: str,
+        language: str = "python",
+        iteration: int = 1,
+        code: str = "",
+        findings: Optional[list] = None
+    ) -> str:
+        """
+        Construit le prompt de génération du code selon l'architecture; avec
+        code et findings, le prompt de correction par modifications (diffs
+        ou fichiers complets) du code existant.
+        """
+        inputs = {"language": language, "requirements": requirements, "architecture": architecture}
+        if findings:
+            inputs["findings"] = "\n".join(f"- {finding}" for finding in findings)
+        if code and findings:
+            return self.render_prompt(iteration, template=self.refine_template, code=code, **inputs)
+        return self.render_prompt(iteration, **inputs)
+    
+    def build_followup(self, inputs: dict, changed: dict) -> str:
+        """Prompt complet quand on passe d'une correction par diffs à une génération (ou l'inverse)"""
+        if inputs.get("code") or self.session.inputs.get("code"):
+            return self.build_prompt(**inputs)
+        return super().build_followup(inputs, changed)
+    
+    def parse_output(self, content: str) -> AgentOutput:
+        """Interprète la réponse du LLM"""
         return AgentOutput(
             agent_name="DeveloperAgent",
             success=bool(content),
@@ -101,37 +164,20 @@ Structure ta réponse:
 class ReviewerAgent(BaseAgent):
     """Agent responsable du contrôle qualité"""
     
-    def __init__(self, ollama_client, model_name: str = "deepseek-coder"):
-        super().__init__(ollama_client, model_name, "Reviewer")
-    
-    def execute(
-        self,
-        code: str,
-        architecture: str,
-        iteration: int = 1
-    ) -> AgentOutput:
-        """Analyse et score la qualité du code"""
-        
-        prompt = f"""Tu es un expert en revue de code et qualité logicielle.
-
-ITÉRATION: {iteration}
-
-CODE À ANALYSER:
-{truncate_middle(code, PROMPT_LIMITS["code_context"])}
-
-ARCHITECTURE CIBLE:
-{truncate_middle(architecture, PROMPT_LIMITS["architecture_context"])}
-
-Effectue un audit complet:
-1. **Conformité architecture** (0-100): Le code respecte-t-il l'architecture?
-2. **Qualité du code** (0-100): Lisibilité, maintenabilité, best practices
-3. **Gestion erreurs** (0-100): Complétude et pertinence
-4. **Type hints** (0-100): Couverture et strictness
-5. **Documentation** (0-100): Docstrings, commentaires utiles
-
-Calcule un SCORE MOYEN final (0-100).
-
-Format:
+    config_key = "reviewer"
+    temperature = 0.5
+    stream_sections = {"PROBLÈMES": "issue", "RECOMMANDATIONS": "recommendation"}
+    stream_score = True
+    output_schema = {
+        "type": "object",
+        "properties": {
+            "score_global": {"type": "integer", "minimum": 0, "maximum": 100},
+            "problemes": {"type": "array", "items": {"type": "string"}},
+            "recommandations": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["score_global", "problemes", "recommandations"],
+    }
+    text_format = """Format:
 SCORE GLOBAL: [nombre]
 PROBLÈMES DÉTECTÉS:
 - [problème 1]
@@ -141,15 +187,66 @@ PROBLÈMES DÉTECTÉS:
 RECOMMANDATIONS:
 - [recommandation 1]
 - [recommandation 2]
-...
-"""
+..."""
+    json_format = """Réponds uniquement par un objet JSON:
+{"score_global": [SCORE GLOBAL, entier 0-100],
+ "problemes": ["problème 1", "problème 2", ...],
+ "recommandations": ["recommandation 1", "recommandation 2", ...]}"""
+    prompt_template = PromptTemplate(
+        instructions="""Tu es un expert en revue de code et qualité logicielle.
+
+Effectue un audit complet du code fourni plus bas:
+1. **Conformité architecture** (0-100): Le code respecte-t-il l'architecture?
+2. **Qualité du code** (0-100): Lisibilité, maintenabilité, best practices
+3. **Gestion erreurs** (0-100): Complétude et pertinence
+4. **Type hints** (0-100): Couverture et strictness
+5. **Documentation** (0-100): Docstrings, commentaires utiles
+
+Calcule un SCORE MOYEN final (0-100).
+
+{output_format}""",
+        sections=(
+            PromptSection("architecture", "ARCHITECTURE CIBLE", PROMPT_BUDGET["weights"]["architecture"]),
+            PromptSection("code", "CODE À ANALYSER", PROMPT_BUDGET["weights"]["code"]),
+        ),
+        footer="Réponds en respectant exactement le format demandé."
+    )
+    
+    def __init__(self, ollama_client, model_name: str = "deepseek-coder", async_client=None):
+        super().__init__(ollama_client, model_name, "Reviewer", async_client)
+    
+    def build_prompt(
+        self,
+        code: str,
+        architecture: str,
+        iteration: int = 1
+    ) -> str:
+        """Construit le prompt d'analyse qualité du code"""
+        return self.render_prompt(
+            iteration,
+            output_format=self.output_format(),
+            architecture=architecture,
+            code=code
+        )
+    
+    def parse_output(self, content: str) -> AgentOutput:
+        """Interprète la réponse du LLM (JSON validé, sinon format texte)"""
+        data = self.parse_structured(content)
+        if data is not None:
+            return AgentOutput(
+                agent_name="ReviewerAgent",
+                success=True,
+                content=content,
+                score=float(data["score_global"]),
+                issues=data["problemes"],
+                recommendations=data["recommandations"]
+            )
         
-        content = self._call_llm(prompt, temperature=0.5)
-        score = self.extract_score(content)
+        score = self.extract_score(content, ("SCORE GLOBAL", "SCORE MOYEN", "SCORE"))
         
         return AgentOutput(
             agent_name="ReviewerAgent",
-            success=bool(content),
+            success=score is not None,
             content=content,
             score=score,
             issues=extract_bulleted_section(content, "PROBLÈMES"),
@@ -160,28 +257,37 @@ RECOMMANDATIONS:
 class SecurityAgent(BaseAgent):
     """Agent responsable de l'audit sécurité"""
     
-    def __init__(self, ollama_client, model_name: str = "mistral"):
-        super().__init__(ollama_client, model_name, "Sécurité")
-    
-    def execute(
-        self,
-        code: str,
-        requirements: str,
-        iteration: int = 1
-    ) -> AgentOutput:
-        """Audit sécurité du code"""
-        
-        prompt = f"""Tu es un expert en sécurité logicielle et OWASP.
-
-ITÉRATION: {iteration}
-
-CODE À AUDITER:
-{truncate_middle(code, PROMPT_LIMITS["code_context"])}
+    config_key = "security"
+    temperature = 0.3  # Température basse pour sécurité
+    stream_sections = {"VULNÉRABILITÉS": "issue", "CORRECTIONS": "recommendation"}
+    stream_score = True
+    stream_score_pattern = re.compile(r"risque[\w\s]{0,20}?[:=]\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+    stream_score_kind = "risk"
+    output_schema = {
+        "type": "object",
+        "properties": {
+            "risque_maximum": {"type": "integer", "minimum": 0, "maximum": 100},
+            "vulnerabilites": {"type": "array", "items": {"type": "string"}},
+            "corrections": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["risque_maximum", "vulnerabilites", "corrections"],
+    }
+    text_format = """Format:
+RISQUE MAXIMUM: [nombre 0-100]
 
-REQUIREMENTS:
-{requirements}
+VULNÉRABILITÉS TROUVÉES:
+- [vulnérabilité]
 
-Analyse les risques sécurité (OWASP Top 10):
+CORRECTIONS RECOMMANDÉES:
+- [correction]"""
+    json_format = """Réponds uniquement par un objet JSON:
+{"risque_maximum": [RISQUE MAXIMUM des catégories, entier 0-100],
+ "vulnerabilites": ["VULNÉRABILITÉS trouvées", ...],
+ "corrections": ["correction recommandée", ...]}"""
+    prompt_template = PromptTemplate(
+        instructions="""Tu es un expert en sécurité logicielle et OWASP.
+
+Analyse les risques sécurité (OWASP Top 10) du code fourni plus bas:
 1. **Injection** (SQL, Command, etc.) - Risque 0-100
 2. **Authentification faible** - Risque 0-100
 3. **Exposition données sensibles** - Risque 0-100
@@ -189,52 +295,70 @@ Analyse les risques sécurité (OWASP Top 10):
 5. **Contrôle d'accès** - Risque 0-100
 6. **Mauvaise configuration** - Risque 0-100
 
-Score de sécurité final: 100 - RISQUE_MAXIMUM
-
-VULNÉRABILITÉS TROUVÉES:
-- [vulnérabilité]
-
-CORRECTIONS RECOMMANDÉES:
-- [correction]
-"""
+{output_format}""",
+        sections=(
+            PromptSection("requirements", "REQUIREMENTS"),
+            PromptSection("code", "CODE À AUDITER", PROMPT_BUDGET["weights"]["code"]),
+        ),
+        footer="Réponds en respectant exactement le format demandé."
+    )
+    
+    def __init__(self, ollama_client, model_name: str = "mistral", async_client=None):
+        super().__init__(ollama_client, model_name, "Sécurité", async_client)
+    
+    def build_prompt(
+        self,
+        code: str,
+        requirements: str,
+        iteration: int = 1
+    ) -> str:
+        """Construit le prompt d'audit sécurité du code"""
+        return self.render_prompt(
+            iteration,
+            output_format=self.output_format(),
+            requirements=requirements,
+            code=code
+        )
+    
+    def parse_output(self, content: str) -> AgentOutput:
+        """Interprète la réponse du LLM (JSON validé, sinon format texte)"""
+        data = self.parse_structured(content)
+        if data is not None:
+            return AgentOutput(
+                agent_name="SecurityAgent",
+                success=True,
+                content=content,
+                score=100.0 - data["risque_maximum"],  # Inverser le risque (100 = secure)
+                issues=data["vulnerabilites"],
+                recommendations=data["corrections"]
+            )
         
-        content = self._call_llm(prompt, temperature=0.3)  # Température basse pour sécurité
-        score = 100 - self.extract_score(content)  # Inverser le score (100 = secure)
+        # Une note "N/100" isolée serait ambiguë (risque ou score): libellés seulement
+        risk = self.extract_score(content, ("RISQUE MAXIMUM", "RISQUE_MAXIMUM"), fallback=False)
+        if risk is not None:
+            score = 100.0 - risk  # Inverser le risque (100 = secure)
+        else:
+            score = self.extract_score(content, ("SCORE DE SÉCURITÉ", "SCORE SÉCURITÉ"), fallback=False)
         
         return AgentOutput(
             agent_name="SecurityAgent",
-            success=bool(content),
+            success=score is not None,
             content=content,
-            score=max(0, min(100, score)),
+            score=score,
             issues=extract_bulleted_section(content, "VULNÉRABILITÉS"),
+            recommendations=extract_bulleted_section(content, "CORRECTIONS"),
         )
 
 
 class TesterAgent(BaseAgent):
     """Agent responsable de la génération de tests"""
     
-    def __init__(self, ollama_client, model_name: str = "qwen2.5-coder"):
-        super().__init__(ollama_client, model_name, "Testeur")
-    
-    def execute(
-        self,
-        code: str,
-        requirements: str,
-        iteration: int = 1
-    ) -> AgentOutput:
-        """Génère les tests unitaires et intégration"""
-        
-        prompt = f"""Tu es un expert en tests logiciel et TDD.
-
-ITÉRATION: {iteration}
-
-CODE À TESTER:
-{truncate_middle(code, PROMPT_LIMITS["code_context"])}
+    config_key = "tester"
+    temperature = 0.5
+    prompt_template = PromptTemplate(
+        instructions="""Tu es un expert en tests logiciel et TDD.
 
-REQUIREMENTS:
-{requirements}
-
-Génère une suite de tests complète:
+Génère une suite de tests complète pour le code fourni plus bas:
 1. **Tests unitaires** - 1 test par fonction/méthode
 2. **Tests d'intégration** - Interaction entre composants
 3. **Tests d'erreur** - Cas limites et exceptions
@@ -244,13 +368,28 @@ Format:
 - Framework: pytest (Python) ou Jest (JS)
 - Nommer les tests clairement: test_<fonction>_<cas>
 - Inclure setup/teardown si nécessaire
-- Documenter les cas de test
-
-Génère le code complet des tests.
-"""
-        
-        content = self._call_llm(prompt, temperature=0.5)
-        
+- Documenter les cas de test""",
+        sections=(
+            PromptSection("requirements", "REQUIREMENTS"),
+            PromptSection("code", "CODE À TESTER", PROMPT_BUDGET["weights"]["code"]),
+        ),
+        footer="Génère le code complet des tests."
+    )
+    
+    def __init__(self, ollama_client, model_name: str = "qwen2.5-coder", async_client=None):
+        super().__init__(ollama_client, model_name, "Testeur", async_client)
+    
+    def build_prompt(
+        self,
+        code: str,
+        requirements: str,
+        iteration: int = 1
+    ) -> str:
+        """Construit le prompt de génération des tests unitaires et intégration"""
+        return self.render_prompt(iteration, requirements=requirements, code=code)
+    
+    def parse_output(self, content: str) -> AgentOutput:
+        """Interprète la réponse du LLM"""
         return AgentOutput(
             agent_name="TesterAgent",
             success=bool(content),
@@ -262,32 +401,12 @@ Génère le code complet des tests.
 class DocumentationAgent(BaseAgent):
     """Agent responsable de la documentation"""
     
-    def __init__(self, ollama_client, model_name: str = "mistral"):
-        super().__init__(ollama_client, model_name, "Documentation")
-    
-    def execute(
-        self,
-        architecture: str,
-        code: str,
-        requirements: str,
-        iteration: int = 1
-    ) -> AgentOutput:
-        """Génère la documentation complète"""
-        
-        prompt = f"""Tu es un expert en documentation logicielle.
-
-ITÉRATION: {iteration}
-
-Génère la documentation complète du projet:
-
-REQUIREMENTS:
-{requirements}
-
-ARCHITECTURE:
-{truncate_middle(architecture, PROMPT_LIMITS["architecture_context"])}
+    config_key = "documentation"
+    temperature = 0.7
+    prompt_template = PromptTemplate(
+        instructions="""Tu es un expert en documentation logicielle.
 
-CODE:
-{truncate_middle(code, PROMPT_LIMITS["architecture_context"])}
+Génère la documentation complète du projet décrit plus bas.
 
 Crée une documentation structurée en markdown:
 1. **README.md** - Vue d'ensemble, installation, usage rapide
@@ -301,11 +420,34 @@ Crée une documentation structurée en markdown:
 Chaque section doit être:
 - Complète et auto-contenue
 - Avec exemples concrets
-- Bien formatée en markdown
-"""
-        
-        content = self._call_llm(prompt, temperature=0.7)
-        
+- Bien formatée en markdown""",
+        sections=(
+            PromptSection("requirements", "REQUIREMENTS"),
+            PromptSection("architecture", "ARCHITECTURE", PROMPT_BUDGET["weights"]["architecture"]),
+            PromptSection("code", "CODE", PROMPT_BUDGET["weights"]["code"]),
+        )
+    )
+    
+    def __init__(self, ollama_client, model_name: str = "mistral", async_client=None):
+        super().__init__(ollama_client, model_name, "Documentation", async_client)
+    
+    def build_prompt(
+        self,
+        architecture: str,
+        code: str,
+        requirements: str,
+        iteration: int = 1
+    ) -> str:
+        """Construit le prompt de génération de la documentation complète"""
+        return self.render_prompt(
+            iteration,
+            requirements=requirements,
+            architecture=architecture,
+            code=code
+        )
+    
+    def parse_output(self, content: str) -> AgentOutput:
+        """Interprète la réponse du LLM"""
         return AgentOutput(
             agent_name="DocumentationAgent",
             success=bool(content),
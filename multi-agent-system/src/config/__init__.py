@@ -2,6 +2,15 @@
 from .settings import (
     OLLAMA_CONFIG,
     AGENT_MODELS,
+    RESIDENCY_CONFIG,
+    PHASE_PARALLELISM,
+    ARCHITECTURE_REUSE,
+    CODE_REFINEMENT,
+    CANDIDATE_SEARCH,
+    CHECKPOINT,
+    RESPONSE_CACHE,
+    SEMANTIC_CACHE,
+    SESSION_CONFIG,
     SYSTEM_CONFIG,
     GENERATION_PARAMS,
     SCORE_WEIGHTS,
@@ -11,6 +20,15 @@ from .settings import (
 __all__ = [
     'OLLAMA_CONFIG',
     'AGENT_MODELS',
+    'RESIDENCY_CONFIG',
+    'PHASE_PARALLELISM',
+    'ARCHITECTURE_REUSE',
+    'CODE_REFINEMENT',
+    'CANDIDATE_SEARCH',
+    'CHECKPOINT',
+    'RESPONSE_CACHE',
+    'SEMANTIC_CACHE',
+    'SESSION_CONFIG',
     'SYSTEM_CONFIG',
     'GENERATION_PARAMS',
     'SCORE_WEIGHTS',
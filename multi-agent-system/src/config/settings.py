@@ -8,7 +8,24 @@ OLLAMA_CONFIG = {
     "base_url": "http://localhost:11434",
     "timeout": 300,  # 5 minutes
     "max_retries": 3,
-    "retry_delay": 2.0
+    "retry_delay": 2.0,
+    "pool_size": 20,        # Connexions simultanées (AsyncOllamaClient)
+    "pool_keepalive": 10,   # Connexions keep-alive conservées
+    "keepalive_expiry": 30.0,
+    "min_timeout": 30.0,             # Timeout adaptatif: p95 des latences x multiplicateur,
+    "timeout_multiplier": 3.0,       # borné entre min_timeout et timeout
+    "backoff_cap": 30.0,             # Backoff exponentiel avec jitter (base: retry_delay)
+    "retry_budget_ratio": 0.2,       # Retries max: 3 + 20% des requêtes de la dernière minute
+    "retry_budget_min": 3,
+    "breaker_threshold": 5,          # Échecs consécutifs avant ouverture du circuit (par nœud)
+    "breaker_reset_seconds": 30.0,
+    # Pool de nœuds: ex. ["http://node1:11434", "http://node2:11434"] (vide = base_url seul)
+    "endpoints": [],
+    "cold_model_penalty": 2.0,       # Routage: le moins chargé, un modèle non résident compte pour 2 requêtes
+    "health_check_interval": 30.0,   # Sonde /api/ps des nœuds
+    "hedge_percentile": None,        # ex. 0.9: requête doublée sur un autre nœud au-delà du p90 de latence
+    "parallel_slots": 0,             # = OLLAMA_NUM_PARALLEL du serveur: file locale au-delà (0 = pas de plafond)
+    "model_slots": {}                # Plafonds par modèle, ex. {"codellama": 1}
 }
 
 # Modèles LLM pour chaque agent
@@ -32,6 +49,93 @@ AGENT_MODELS = {
 #     "documentation": "mistral:latest"
 # }
 
+# Résidence des modèles en mémoire (préchargement, keep_alive, éviction)
+RESIDENCY_CONFIG = {
+    "enabled": True,
+    "max_loaded_models": 2,         # Modèles résidents simultanés (None = illimité)
+    "max_resident_bytes": None,     # Ex: 16 * 1024**3 pour 16 Go de RAM
+    "horizon": 2,                   # Phases à venir dont les modèles sont protégés
+    "default_phase_seconds": 90.0,  # Durée estimée d'une phase (affinée en cours de run)
+    "min_keep_alive": 30,
+    "max_keep_alive": 1800
+}
+
+# Phases indépendantes d'une itération exécutées simultanément (revue, sécurité,
+# tests et documentation ne dépendent que de l'architecture et du code)
+PHASE_PARALLELISM = {
+    "enabled": True,
+    "max_parallel_phases": 0,            # 0 = nœuds x parallel_slots (1 nœud sans plafond: séquentiel)
+    "model_limits": {}                   # Phases simultanées max par modèle (défaut: nœuds x créneaux du modèle)
+}
+
+# Architecture conservée d'une itération à l'autre (l'Architecte ne repasse que
+# sur problèmes architecturaux signalés par Reviewer/Sécurité, ou sur calendrier)
+ARCHITECTURE_REUSE = {
+    "enabled": True,
+    "refresh_every": 0,                  # Régénération complète toutes les N itérations (0 = jamais)
+    "min_issues": 1,                     # Problèmes architecturaux déclenchant une révision
+    "keywords": [                        # Termes qui classent un problème comme architectural
+        "architectur", "conception", "couplage", "coupling", "couche", "layer",
+        "responsabilit", "séparation des", "découpage", "scalabilit", "design pattern",
+        "monolith", "dépendance circulaire", "circular dependenc", "point unique de défaillance",
+        "single point of failure"
+    ]
+}
+
+# Code corrigé par correctifs (diffs / fichiers complets) tant que l'architecture
+# ne change pas, au lieu d'être régénéré entièrement à chaque itération
+CODE_REFINEMENT = {
+    "enabled": True,
+    "max_findings": 12                   # Problèmes Reviewer/Sécurité transmis au Développeur
+}
+
+# Best-of-N: plusieurs candidats de code par itération sur les créneaux Ollama
+# libres, classés par un pré-score local avant la revue
+CANDIDATE_SEARCH = {
+    "enabled": True,
+    "candidates": 0,                     # 0 = nœuds x créneaux du modèle du Développeur (1 = désactivé)
+    "max_candidates": 4,
+    "temperature_step": 0.15,            # Candidat k: température du Développeur + k x pas
+    "max_temperature": 1.0,
+    "review_top": 1                      # Candidats relus par le Reviewer (les mieux pré-notés)
+}
+
+# Point de reprise: état du run écrit dans le répertoire de sortie après chaque
+# phase (reprise avec scripts/main.py --resume <répertoire>)
+CHECKPOINT = {
+    "enabled": True,
+    "filename": "checkpoint.json"
+}
+
+# Cache persistant des réponses LLM (relances / démos / CI sur les mêmes specs)
+RESPONSE_CACHE = {
+    "enabled": True,
+    "path": ".cache/llm_responses.sqlite",
+    "max_bytes": 256 * 1024 * 1024,      # Taille max des réponses stockées
+    "max_age_seconds": 7 * 24 * 3600,    # Expiration (None = jamais)
+    "cache_nondeterministic": True       # False: ignore les appels temperature > 0 sans seed
+}
+
+# Sessions LLM par agent (réutilisation du context Ollama entre itérations)
+SESSION_CONFIG = {
+    "enabled": False,
+    "agents": ["developer", "reviewer", "security", "tester", "documentation"],
+    "num_ctx": 4096,                     # Fenêtre de contexte si GENERATION_PARAMS n'en fixe pas
+    "reset_ratio": 0.8                   # Session réinitialisée au-delà de 80% de num_ctx
+}
+
+# Cache sémantique (prompts quasi identiques, nécessite numpy)
+SEMANTIC_CACHE = {
+    "enabled": False,
+    "embedding_model": "nomic-embed-text",
+    "thresholds": {                      # Similarité cosinus minimale par agent
+        "architect": 0.95,
+        "documentation": 0.93
+    },
+    "max_entries": 500,                  # Au-delà: éviction LRU
+    "path": ".cache/semantic_index.npz"
+}
+
 # Paramètres du système
 SYSTEM_CONFIG = {
     "max_iterations": 15,
@@ -39,39 +143,59 @@ SYSTEM_CONFIG = {
     "output_dir": "./outputs",
     "log_level": "INFO",  # DEBUG, INFO, WARNING, ERROR
     "enable_streaming": True,  # Afficher la génération en temps réel
+    "max_response_chars": 400_000,  # Taille max d'une réponse streamée
+    "structured_output": True,  # Reviewer et Sécurité répondent en JSON (schéma Ollama)
+    "early_stop": True,  # Streaming: coupe Reviewer/Sécurité dès score et listes complets
+    "early_stop_max_items": 10,  # Puces par liste au-delà desquelles la liste est pleine
 }
 
-# Paramètres de génération LLM
+# Paramètres de génération LLM par agent (envoyés dans les options Ollama)
+# - num_predict: tokens générés max (coupe les réponses qui s'éternisent)
+# - num_ctx: fenêtre de contexte (prompt + réponse; sert aussi aux sessions)
+# - num_thread: threads CPU (absent = choix d'Ollama)
+# - stop: séquences qui terminent la génération
 GENERATION_PARAMS = {
     "architect": {
         "temperature": 0.7,
         "top_p": 0.9,
-        "top_k": 40
+        "top_k": 40,
+        "num_predict": 2048,
+        "num_ctx": 4096
     },
     "developer": {
         "temperature": 0.5,  # Plus bas pour code déterministe
         "top_p": 0.9,
-        "top_k": 40
+        "top_k": 40,
+        "num_predict": 4096,
+        "num_ctx": 8192      # Architecture en entrée + code complet en sortie
     },
     "reviewer": {
         "temperature": 0.5,
         "top_p": 0.9,
-        "top_k": 40
+        "top_k": 40,
+        "num_predict": 512,  # Seuls le score et les listes à puces sont exploités
+        "num_ctx": 4096
     },
     "security": {
         "temperature": 0.3,  # Très bas pour sécurité stricte
         "top_p": 0.9,
-        "top_k": 40
+        "top_k": 40,
+        "num_predict": 512,  # Idem reviewer: risque maximum + listes
+        "num_ctx": 4096
     },
     "tester": {
         "temperature": 0.6,
         "top_p": 0.9,
-        "top_k": 40
+        "top_k": 40,
+        "num_predict": 3072,
+        "num_ctx": 8192
     },
     "documentation": {
         "temperature": 0.7,
         "top_p": 0.9,
-        "top_k": 40
+        "top_k": 40,
+        "num_predict": 3072,
+        "num_ctx": 4096
     }
 }
 
@@ -91,8 +215,14 @@ STOP_CRITERIA = {
     "review_min_score": 85.0             # Score minimum qualité
 }
 
-PROMPT_LIMITS = {
-    "architecture_context": 2000,
-    "code_context": 3000,
-    "requirements_context": 1000
+# Budget des prompts: num_ctx de l'agent, moins num_predict et une marge,
+# réparti entre sections compressibles au prorata de leur poids
+PROMPT_BUDGET = {
+    "weights": {
+        "architecture": 2,
+        "code": 3
+    },
+    "reserve_tokens": 128,       # Marge pour l'erreur d'estimation des tokens
+    "default_num_ctx": 2048,     # Fenêtre par défaut d'Ollama (num_ctx absent)
+    "min_section_tokens": 128    # Minimum par section, même fenêtre pleine
 }
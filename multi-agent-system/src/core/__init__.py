@@ -2,12 +2,66 @@
 __init__ pour le package core
 """
 
-from .ollama_client import OllamaClient, OllamaConfig
+from .ollama_client import (
+    OllamaClient,
+    OllamaConfig,
+    OllamaError,
+    OllamaTimeoutError,
+    OllamaConnectionError,
+    OllamaHTTPError,
+    OllamaUnavailableError,
+    GenerationResult,
+)
+from .async_ollama_client import AsyncOllamaClient
+from .resilience import ResiliencePolicy, CircuitBreaker, RetryBudget, LatencyTracker
+from .endpoint_pool import EndpointPool, Endpoint
+from .concurrency import ConcurrencyGovernor, RunContext, run_context
+from .cassette import Cassette
+from .response_cache import ResponseCache
+from .semantic_cache import SemanticCache
+from .model_residency import ModelResidencyManager
+from .phase_scheduler import PhaseScheduler, SchedulePlan
+from .phase_graph import PhaseGraph, GraphRun, PhaseTiming
+from .architecture_policy import ArchitecturePolicy
+from .code_refinement import CodeRefiner
+from .candidate_search import CandidateSearch, prescore
+from .checkpoint import Checkpoint, CheckpointError
 from .orchestrator import MultiAgentOrchestrator, IterationMetrics
 
 __all__ = [
     "OllamaClient",
     "OllamaConfig",
+    "OllamaError",
+    "OllamaTimeoutError",
+    "OllamaConnectionError",
+    "OllamaHTTPError",
+    "OllamaUnavailableError",
+    "GenerationResult",
+    "AsyncOllamaClient",
+    "ResiliencePolicy",
+    "CircuitBreaker",
+    "RetryBudget",
+    "LatencyTracker",
+    "EndpointPool",
+    "Endpoint",
+    "ConcurrencyGovernor",
+    "RunContext",
+    "run_context",
+    "Cassette",
+    "ResponseCache",
+    "SemanticCache",
+    "ModelResidencyManager",
+    "PhaseScheduler",
+    "SchedulePlan",
+    "PhaseGraph",
+    "GraphRun",
+    "PhaseTiming",
+    "ArchitecturePolicy",
+    "CodeRefiner",
+    "CandidateSearch",
+    "prescore",
+    "Checkpoint",
+    "CheckpointError",
     "MultiAgentOrchestrator",
     "IterationMetrics"
 ]
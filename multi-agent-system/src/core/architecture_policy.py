@@ -0,0 +1,84 @@
+"""
+Réutilisation de l'architecture d'une itération à l'autre.
+
+Régénérer l'architecture à chaque itération coûte un appel LLM complet et
+change la cible du Développeur alors que le code converge. La politique
+garde l'architecture courante et ne rappelle l'Architecte que:
+- à la première itération (aucune architecture)
+- pour une révision, quand Reviewer ou Sécurité remontent des problèmes
+  architecturaux (termes de settings.ARCHITECTURE_REUSE["keywords"])
+- pour une régénération complète, toutes les refresh_every itérations
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# Décisions possibles pour une itération
+GENERATE, REFINE, REFRESH, REUSE = "generate", "refine", "refresh", "reuse"
+
+
+@dataclass
+class ArchitecturePolicy:
+    """Décide, à chaque itération, de réutiliser, réviser ou régénérer l'architecture"""
+    keywords: tuple = ()
+    refresh_every: int = 0  # 0 = pas de régénération planifiée
+    min_issues: int = 1
+    actions: dict = field(default_factory=lambda: {GENERATE: 0, REFINE: 0, REFRESH: 0, REUSE: 0})
+    _feedback: dict = field(default_factory=dict, repr=False)  # {source: problèmes architecturaux}
+    _last_generated: int = 0
+    
+    @classmethod
+    def from_config(cls, config: dict) -> "ArchitecturePolicy":
+        """Construit la politique depuis settings.ARCHITECTURE_REUSE"""
+        return cls(
+            keywords=tuple(k.lower() for k in config.get("keywords", ())),
+            refresh_every=config.get("refresh_every", 0),
+            min_issues=max(1, config.get("min_issues", 1)),
+        )
+    
+    def is_architectural(self, issue) -> bool:
+        text = str(issue).lower()
+        return any(keyword in text for keyword in self.keywords)
+    
+    def record_feedback(self, source: str, issues: list) -> list:
+        """Remplace les problèmes architecturaux remontés par source; les retourne"""
+        self._feedback[source] = [issue for issue in issues if self.is_architectural(issue)]
+        return self._feedback[source]
+    
+    @property
+    def feedback(self) -> list:
+        """Problèmes architecturaux en attente (toutes sources, sans doublon)"""
+        return list(dict.fromkeys(issue for issues in self._feedback.values() for issue in issues))
+    
+    def decide(self, iteration: int, has_architecture: bool) -> str:
+        """Décision pour l'itération (à appeler une fois, avant de planifier ses phases)"""
+        if not has_architecture:
+            action = GENERATE
+        elif self.refresh_every and iteration - self._last_generated >= self.refresh_every:
+            action = REFRESH
+        elif len(self.feedback) >= self.min_issues:
+            action = REFINE
+        else:
+            action = REUSE
+        
+        self.actions[action] += 1
+        if action != REUSE:
+            self._last_generated = iteration
+            if action != REFINE:
+                self._feedback.clear()
+        return action
+    
+    def consume_feedback(self) -> list:
+        """Problèmes à transmettre à l'Architecte pour une révision (vidés ensuite)"""
+        feedback = self.feedback
+        self._feedback.clear()
+        return feedback
+    
+    def stats(self) -> dict:
+        return {
+            **self.actions,
+            "llm_calls_saved": self.actions[REUSE],
+            "pending_issues": len(self.feedback),
+        }
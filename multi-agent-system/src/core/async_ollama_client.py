@@ -0,0 +1,602 @@
+"""
+Client asynchrone pour Ollama (asyncio + httpx).
+Même interface que OllamaClient, avec un pool de connexions keep-alive borné
+et des retries non bloquants: un seul process peut piloter des dizaines
+d'appels d'agents en parallèle.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import AsyncExitStack, nullcontext
+from typing import AsyncIterator, Callable, Optional, Union
+
+import httpx
+
+from ..utils.llm_usage import LLMUsage
+from .concurrency import ConcurrencyGovernor
+from .endpoint_pool import Endpoint, EndpointPool
+from .ollama_client import (
+    GenerationResult,
+    OllamaConfig,
+    OllamaConnectionError,
+    OllamaError,
+    OllamaHTTPError,
+    OllamaTimeoutError,
+    OllamaUnavailableError,
+    early_stop_message,
+    generation_options,
+    resolve_model_digest,
+)
+from .resilience import ResiliencePolicy
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOllamaClient:
+    """
+    Client asynchrone pour interagir avec Ollama (ResponseCache optionnel).
+    Routage multi-nœuds et requêtes doublées comme OllamaClient; la requête
+    perdante est annulée (connexion fermée, Ollama abandonne la génération).
+    Avec une Cassette, le trafic est enregistré ou rejoué (transport httpx).
+    """
+    
+    def __init__(
+        self,
+        config: Optional[OllamaConfig] = None,
+        cache=None,
+        resilience=None,
+        pool=None,
+        governor=None,
+        cassette=None,
+    ):
+        """
+        resilience, pool, governor, cassette: ResiliencePolicy, EndpointPool,
+        ConcurrencyGovernor et Cassette à partager avec un OllamaClient
+        """
+        self.config = config or OllamaConfig()
+        self.models_cache: list[str] = []
+        self.model_digests: Optional[dict[str, str]] = None
+        self.cache = cache
+        self.resilience = resilience or ResiliencePolicy(self.config)
+        self.pool = pool or EndpointPool.from_config(self.config, self.resilience.breaker)
+        self.governor = governor or ConcurrencyGovernor.from_config(self.config)
+        self.cassette = cassette
+        self._client: Optional[httpx.AsyncClient] = None
+        self._probe_task: Optional[asyncio.Task] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Client HTTP partagé (créé à la première utilisation)"""
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.config.pool_size,
+                max_keepalive_connections=self.config.pool_keepalive,
+                keepalive_expiry=self.config.keepalive_expiry,
+            )
+            self._client = httpx.AsyncClient(
+                base_url=self.pool.primary.url,
+                timeout=httpx.Timeout(self.config.timeout, connect=10.0),
+                limits=limits,
+                transport=self.cassette.async_transport(limits) if self.cassette else None,
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Ferme le pool de connexions"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self) -> "AsyncOllamaClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def check_connection(self) -> bool:
+        """Vérifie que Ollama est disponible (au moins un nœud du pool)"""
+        for endpoint in self.pool.endpoints:
+            try:
+                response = await self.client.get(f"{endpoint.url}/api/tags", timeout=5)
+                if response.status_code == 200:
+                    return True
+            except Exception as e:
+                logger.error(f"❌ Ollama non disponible ({endpoint.url}): {e}")
+        return False
+    
+    async def probe_endpoints(self) -> None:
+        """Sonde /api/ps sur chaque nœud (en parallèle): santé et modèles résidents"""
+        await asyncio.gather(*(self._probe(endpoint) for endpoint in self.pool.endpoints))
+    
+    async def _probe(self, endpoint: Endpoint) -> None:
+        try:
+            response = await self.client.get(f"{endpoint.url}/api/ps", timeout=5)
+            running = response.json().get("models", []) if response.status_code == 200 else None
+        except (httpx.HTTPError, ValueError):
+            running = None
+        self.pool.record_probe(endpoint, running)
+    
+    async def get_available_models(self) -> list[str]:
+        """Récupère les modèles disponibles"""
+        try:
+            response = await self.client.get("/api/tags", timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                models = [m["name"].split(":")[0] for m in data.get("models", [])]
+                self.models_cache = models
+                self.model_digests = {m["name"]: m.get("digest", "") for m in data.get("models", [])}
+                return models
+            return []
+        except Exception as e:
+            logger.error(f"Erreur récupération modèles: {e}")
+            return self.models_cache
+    
+    async def get_model_digest(self, model: str) -> str:
+        """Digest des poids du modèle (à défaut, son nom)"""
+        if self.model_digests is None:
+            self.model_digests = {}
+            await self.get_available_models()
+        return resolve_model_digest(self.model_digests, model)
+    
+    async def generate(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        top_k: int = 40,
+        keep_alive: Optional[int] = None,
+        seed: Optional[int] = None,
+        options: Optional[dict] = None,
+        format: Optional[Union[str, dict]] = None,
+    ) -> str:
+        """
+        Génère du texte avec le modèle spécifié.
+        Les retries attendent via asyncio.sleep sans bloquer les autres appels.
+        keep_alive (secondes) fixe la durée de résidence du modèle après l'appel.
+        options complète les paramètres d'échantillonnage (num_predict, num_ctx, stop...).
+        format ("json" ou schéma JSON) contraint la réponse à un JSON valide.
+        """
+        result = await self.generate_result(
+            model, prompt, temperature, top_p, top_k,
+            keep_alive=keep_alive, seed=seed, options=options, format=format
+        )
+        return result.text
+    
+    async def generate_result(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        top_k: int = 40,
+        keep_alive: Optional[int] = None,
+        seed: Optional[int] = None,
+        context: Optional[list] = None,
+        options: Optional[dict] = None,
+        format: Optional[Union[str, dict]] = None,
+    ) -> GenerationResult:
+        """Comme generate, en retournant aussi le context Ollama (appels avec context non cachés)"""
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "options": generation_options(temperature, top_p, top_k, seed, options),
+        }
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        if context:
+            payload["context"] = context
+        if format:
+            payload["format"] = format
+        
+        cache_key = None if context else await self._cache_key(model, prompt, payload["options"], format)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"💾 Réponse {model} servie depuis le cache")
+                return GenerationResult(cached)
+        
+        policy = self.resilience
+        endpoint = self._choose_endpoint(model)
+        policy.retry_budget.record_request()
+        timeout = policy.latency.timeout_for(model)
+        tried: set[str] = set()
+        
+        for attempt in range(self.config.max_retries):
+            try:
+                result = await self._hedged_generate(endpoint, model, payload, timeout)
+                text = result.get("response", "").strip()
+                if cache_key:
+                    self.cache.put(cache_key, model, text)
+                return GenerationResult(text, result.get("context") or [], LLMUsage.from_response(result))
+            
+            except OllamaHTTPError as e:
+                if not e.retryable:
+                    raise
+                error = e
+            except OllamaTimeoutError as e:
+                error = e
+                timeout = min(policy.latency.default_timeout, timeout * 2)
+            except OllamaError as e:
+                error = e
+            
+            logger.warning(f"{error} (tentative {attempt + 1}/{self.config.max_retries})")
+            if attempt == self.config.max_retries - 1 or not policy.retry_budget.try_spend():
+                break
+            await asyncio.sleep(policy.next_delay(attempt))
+            tried.add(endpoint.url)
+            endpoint = self._choose_endpoint(model, exclude=tried)
+        
+        logger.error(f"❌ Impossible de générer avec {model}: {error}")
+        raise error
+    
+    async def _hedged_generate(self, endpoint: Endpoint, model: str, payload: dict, timeout: float) -> dict:
+        """
+        Génération couverte: au-delà du percentile hedge_percentile des
+        latences du modèle, la même requête part sur un second nœud; la
+        première réponse gagne et l'autre tâche est annulée.
+        """
+        delay = None
+        if self.config.hedge_percentile and len(self.pool) > 1:
+            delay = self.resilience.latency.latency_percentile(model, self.config.hedge_percentile)
+        if delay is None:
+            with self.pool.track(endpoint):
+                return await self._post_generate(endpoint, model, payload, timeout)
+        
+        tasks = {}
+        
+        def start(target: Endpoint):
+            # Nœud compté comme occupé dès maintenant: les appels concurrents lancés
+            # avant le démarrage de la tâche doivent le voir
+            self.pool.acquire(target)
+            task = asyncio.create_task(self._post_generate(target, model, payload, timeout))
+            task.add_done_callback(lambda _: self.pool.release(target))
+            tasks[task] = target
+        
+        try:
+            start(endpoint)
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                backup = self.pool.choose(model, exclude={endpoint.url})
+                if backup is not None:
+                    logger.debug(f"⏱️ {model}: pas de réponse de {endpoint.url} après {delay:.1f}s, doublée sur {backup.url}")
+                    self.pool.record_hedge()
+                    start(backup)
+            
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    if len(tasks) > 1:
+                        self.pool.record_hedge(tasks[task])
+                    return task.result()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _post_generate(self, endpoint: Endpoint, model: str, payload: dict, timeout: float) -> dict:
+        """POST /api/generate sur un nœud (déjà compté comme occupé); lève une OllamaError typée"""
+        async with self._slot(endpoint, model):
+            started = time.monotonic()
+            try:
+                response = await self.client.post(
+                    f"{endpoint.url}/api/generate",
+                    json=payload,
+                    timeout=timeout,
+                )
+                if response.status_code != 200:
+                    raise OllamaHTTPError(response.status_code, response.text)
+                result = response.json()
+            
+            except httpx.TimeoutException as e:
+                self.pool.record_failure(endpoint)
+                raise OllamaTimeoutError(f"{model}: pas de réponse de {endpoint.url} en {timeout:.0f}s") from e
+            except httpx.TransportError as e:
+                self.pool.record_failure(endpoint, unreachable=True)
+                raise OllamaConnectionError(f"Ollama injoignable ({endpoint.url}): {e}") from e
+            except httpx.HTTPError as e:
+                self.pool.record_failure(endpoint)
+                raise OllamaConnectionError(f"Réponse interrompue par {endpoint.url}: {e}") from e
+            except OllamaHTTPError as e:
+                if e.retryable:
+                    self.pool.record_failure(endpoint)
+                raise
+            except ValueError as e:
+                self.pool.record_failure(endpoint)
+                raise OllamaError(f"Réponse invalide: {e}") from e
+            
+            self.resilience.latency.record(model, time.monotonic() - started)
+            self.pool.record_success(endpoint, model)
+            return result
+    
+    async def stream_generate(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float = 0.7,
+        keep_alive: Optional[int] = None,
+        seed: Optional[int] = None,
+        context: Optional[list] = None,
+        on_done: Optional[Callable[[dict], None]] = None,
+        options: Optional[dict] = None,
+        format: Optional[Union[str, dict]] = None,
+        stop_when: Optional[Callable[[], bool]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Génère du texte en streaming (pour affichage progressif).
+        L'ouverture du flux (jusqu'au premier chunk) est relancée comme
+        generate_result; un flux qui échoue ensuite lève OllamaError.
+        on_done reçoit le dernier message du flux (context, compteurs...).
+        stop_when, vérifié après chaque chunk transmis, interrompt la génération
+        (connexion fermée) dès que la suite est inutile: on_done reçoit alors
+        un message done_reason "early_stop"; le texte reçu est transmis à
+        l'appelant mais jamais écrit dans le cache des réponses (incomplet).
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "options": generation_options(temperature, seed=seed, options=options),
+        }
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        if context:
+            payload["context"] = context
+        if format:
+            payload["format"] = format
+        
+        cache_key = None if context else await self._cache_key(model, prompt, payload["options"], format)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"💾 Réponse {model} servie depuis le cache")
+                yield cached
+                return
+        chunks: list[str] = []
+        received = 0
+        stopped = False  # Flux coupé par stop_when: réponse incomplète, jamais mise en cache
+        started, first_chunk = time.perf_counter(), None
+        endpoint, stream, data, messages = await self._open_stream(model, payload)
+        
+        async with stream:
+            try:
+                while data is not None:
+                    chunk = data.get("response", "")
+                    if cache_key:
+                        chunks.append(chunk)
+                    received += 1
+                    first_chunk = first_chunk or time.perf_counter()
+                    yield chunk
+                    if data.get("done") and on_done:
+                        on_done(data)
+                    if stop_when is not None and not data.get("done") and stop_when():
+                        # Quitter le bloc ferme la connexion: Ollama abandonne la génération
+                        logger.debug(f"✂️  {model}: génération interrompue après {received} chunks")
+                        if on_done:
+                            on_done(early_stop_message(model, received, started, first_chunk))
+                        stopped = True
+                        break
+                    data = await anext(messages, None)
+            except Exception as e:
+                # Chunks déjà transmis à l'appelant: le flux n'est pas relancé
+                error = self._stream_error(endpoint, model, e)
+                logger.error(f"Erreur streaming: {error}")
+                raise error
+        
+        self.pool.record_success(endpoint, model)
+        if cache_key and not stopped:
+            self.cache.put(cache_key, model, "".join(chunks).strip())
+    
+    async def _open_stream(self, model: str, payload: dict) -> tuple:
+        """
+        Ouvre le flux de /api/generate avec la politique de generate_result
+        (timeout adaptatif, retries avec backoff et budget, changement de
+        nœud) jusqu'au premier message reçu. Retourne (nœud, AsyncExitStack
+        à fermer, premier message, itérateur des messages suivants).
+        """
+        policy = self.resilience
+        endpoint = self._choose_endpoint(model)
+        policy.retry_budget.record_request()
+        timeout = policy.latency.timeout_for(model)
+        tried: set[str] = set()
+        
+        for attempt in range(self.config.max_retries):
+            stream = AsyncExitStack()
+            try:
+                stream.enter_context(self.pool.track(endpoint))
+                await stream.enter_async_context(self._slot(endpoint, model))
+                started = time.monotonic()
+                response = await stream.enter_async_context(self.client.stream(
+                    "POST",
+                    f"{endpoint.url}/api/generate",
+                    json=payload,
+                    timeout=timeout,
+                ))
+                if response.status_code != 200:
+                    await response.aread()
+                    raise OllamaHTTPError(response.status_code, response.text)
+                messages = self._stream_messages(response, model, started)
+                stream.push_async_callback(messages.aclose)
+                first = await anext(messages, None)
+                if first is None:
+                    raise OllamaError(f"Flux vide reçu de {endpoint.url}")
+                return endpoint, stream, first, messages
+            
+            except Exception as e:
+                await stream.aclose()
+                error = self._stream_error(endpoint, model, e)
+                if isinstance(error, OllamaHTTPError) and not error.retryable:
+                    logger.error(f"Erreur streaming: {error}")
+                    raise error
+                if isinstance(error, OllamaTimeoutError):
+                    timeout = min(policy.latency.default_timeout, timeout * 2)
+            except BaseException:
+                await stream.aclose()
+                raise
+            
+            logger.warning(f"{error} (tentative {attempt + 1}/{self.config.max_retries})")
+            if attempt == self.config.max_retries - 1 or not policy.retry_budget.try_spend():
+                break
+            await asyncio.sleep(policy.next_delay(attempt))
+            tried.add(endpoint.url)
+            endpoint = self._choose_endpoint(model, exclude=tried)
+        
+        logger.error(f"❌ Impossible d'ouvrir le flux {model}: {error}")
+        raise error
+    
+    async def _stream_messages(self, response, model: str, started: float) -> AsyncIterator[dict]:
+        """Messages JSON du flux; la durée d'une génération menée à terme alimente le timeout adaptatif"""
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            data = json.loads(line)
+            if "error" in data:
+                raise OllamaError(data["error"])
+            if data.get("done"):
+                self.resilience.latency.record(model, time.monotonic() - started)
+            yield data
+    
+    def _stream_error(self, endpoint: Endpoint, model: str, error: Exception) -> OllamaError:
+        """OllamaError typée correspondant à une erreur du flux (échec compté sur le nœud)"""
+        if isinstance(error, OllamaError):
+            if not isinstance(error, OllamaHTTPError) or error.retryable:
+                self.pool.record_failure(endpoint)
+            return error
+        if isinstance(error, httpx.TimeoutException):
+            self.pool.record_failure(endpoint)
+            typed = OllamaTimeoutError(f"{model}: flux interrompu ({error})")
+        elif isinstance(error, httpx.TransportError):
+            self.pool.record_failure(endpoint, unreachable=True)
+            typed = OllamaConnectionError(f"Ollama injoignable ({endpoint.url}): {error}")
+        elif isinstance(error, httpx.HTTPError):
+            self.pool.record_failure(endpoint)
+            typed = OllamaConnectionError(f"Flux interrompu par {endpoint.url}: {error}")
+        elif isinstance(error, ValueError):
+            self.pool.record_failure(endpoint)
+            typed = OllamaError(f"Réponse invalide: {error}")
+        else:
+            typed = OllamaError(str(error))
+        typed.__cause__ = error
+        return typed
+    
+    def _slot(self, endpoint: Endpoint, model: str):
+        """Créneau d'appel du gouverneur de concurrence (sans gouverneur: aucun plafond)"""
+        return self.governor.aslot(endpoint.url, model) if self.governor else nullcontext()
+    
+    def _choose_endpoint(self, model: str, exclude: set = frozenset()) -> Endpoint:
+        """
+        Nœud de l'appel (de préférence hors exclude). Sonde les nœuds en
+        tâche de fond quand c'est dû; échoue immédiatement si tous les
+        circuits sont ouverts.
+        """
+        if self.pool.probe_due():
+            self._probe_task = asyncio.create_task(self.probe_endpoints())
+        endpoint = self.pool.choose(model, exclude)
+        if endpoint is None and exclude:
+            endpoint = self.pool.choose(model)
+        if endpoint is None:
+            retry_after = min(e.breaker.retry_after() for e in self.pool.endpoints)
+            raise OllamaUnavailableError(
+                f"Ollama indisponible (circuit ouvert, nouvel essai dans {retry_after:.0f}s)"
+            )
+        return endpoint
+    
+    async def _cache_key(
+        self, model: str, prompt: str, options: dict, format: Optional[Union[str, dict]] = None
+    ) -> Optional[str]:
+        """Clé de cache de l'appel (None si pas de cache ou appel non cacheable)"""
+        if self.cache is None or not self.cache.is_cacheable(options):
+            return None
+        params = {**options, "format": format} if format else options
+        return self.cache.make_key(await self.get_model_digest(model), prompt, params)
+    
+    async def embed(self, model: str, text: str) -> list[float]:
+        """Vecteur d'embedding du texte (/api/embeddings), liste vide en cas d'erreur"""
+        endpoint = self.pool.choose(model) or self.pool.primary
+        try:
+            response = await self.client.post(
+                f"{endpoint.url}/api/embeddings",
+                json={"model": model, "prompt": text},
+                timeout=60,
+            )
+            if response.status_code == 200:
+                return response.json().get("embedding", [])
+            logger.warning(f"Status {response.status_code}: {response.text}")
+            return []
+        except Exception as e:
+            logger.error(f"Erreur embeddings: {e}")
+            return []
+    
+    async def list_running_models(self) -> list[dict]:
+        """Modèles actuellement chargés en mémoire (/api/ps)"""
+        try:
+            response = await self.client.get("/api/ps", timeout=10)
+            if response.status_code == 200:
+                return response.json().get("models", [])
+            return []
+        except Exception as e:
+            logger.error(f"Erreur récupération modèles chargés: {e}")
+            return []
+    
+    async def load_model(self, model: str, keep_alive: Optional[int] = None, options: Optional[dict] = None) -> bool:
+        """
+        Charge un modèle en mémoire sans générer (prompt vide).
+        options doit reprendre le num_ctx des appels à venir: Ollama recharge
+        le modèle quand il change.
+        """
+        payload = {"model": model}
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        if options:
+            payload["options"] = options
+        try:
+            response = await self.client.post("/api/generate", json=payload)
+            return response.status_code == 200
+        except Exception as e:
+            logger.error(f"Erreur chargement {model}: {e}")
+            return False
+    
+    async def unload_model(self, model: str) -> bool:
+        """Décharge immédiatement un modèle (keep_alive=0)"""
+        return await self.load_model(model, keep_alive=0)
+    
+    async def pull_model(self, model_name: str) -> bool:
+        """Télécharge un modèle (si disponible)"""
+        try:
+            logger.info(f"📥 Téléchargement du modèle {model_name}...")
+            response = await self.client.post(
+                "/api/pull",
+                json={"name": model_name},
+                timeout=3600,  # 1 heure max
+            )
+            return response.status_code == 200
+        except Exception as e:
+            logger.error(f"Erreur téléchargement: {e}")
+            return False
+    
+    async def health_check(self) -> dict:
+        """Vérifie l'état de santé d'Ollama"""
+        try:
+            if not await self.check_connection():
+                return {
+                    "status": "error",
+                    "message": "Ollama non accessible",
+                    "url": self.pool.primary.url
+                }
+            
+            models = await self.get_available_models()
+            return {
+                "status": "ok",
+                "models_available": len(models),
+                "models": models[:5] if models else [],
+                "url": self.pool.primary.url
+            }
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
@@ -0,0 +1,135 @@
+"""
+Recherche best-of-N: plusieurs candidats de code par itération.
+
+Une itération ne produit qu'un candidat: la progression dépend du tirage
+de chaque génération. Quand des créneaux Ollama restent libres pendant la
+phase de développement, le Développeur est appelé N fois en parallèle avec
+des températures et seeds différents. Un pré-score local (syntaxe,
+docstrings, annotations, gestion d'erreurs, aucun appel LLM) classe les
+candidats; les review_top meilleurs passent en revue complète et
+l'orchestrateur garde le mieux noté.
+"""
+
+import ast
+import logging
+import re
+from dataclasses import dataclass, field
+
+from ..utils.code_patch import split_files
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"\bTODO\b|\bFIXME\b|^\s*(?:pass|\.\.\.)\s*$|NotImplementedError", re.MULTILINE)
+
+
+def prescore(code: str) -> float:
+    """
+    Note locale (0-100) d'un code, sans appel LLM: fichiers Python valides,
+    puis, parmi les fonctions, part documentée et annotée, présence de
+    gestion d'erreurs et de logging, absence de TODO et de corps vides.
+    """
+    files = split_files(code) if code.strip() else {}
+    if not files:
+        return 0.0
+    
+    sources = [content for path, content in files.items() if path.endswith(".py")]
+    trees = []
+    for source in sources:
+        try:
+            trees.append(ast.parse(source))
+        except SyntaxError:
+            pass
+    if not sources:
+        # Autre langage: seuls les marqueurs d'inachèvement sont mesurables
+        return max(0.0, 60.0 - 10.0 * len(_PLACEHOLDER.findall(code)))
+    
+    functions = [
+        node for tree in trees for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    ]
+    documented = sum(1 for node in functions if ast.get_docstring(node))
+    annotated = sum(1 for node in functions if node.returns is not None)
+    handles_errors = any(isinstance(node, ast.Try) for tree in trees for node in ast.walk(tree))
+    
+    score = 40.0 * len(trees) / len(sources)
+    if functions:
+        score += 15.0 * documented / len(functions) + 15.0 * annotated / len(functions)
+    score += 10.0 * handles_errors + 5.0 * ("logging" in code)
+    score += max(0.0, 15.0 - 5.0 * len(_PLACEHOLDER.findall(code)))
+    return round(score, 1)
+
+
+@dataclass
+class CandidateSearch:
+    """Génère N variantes du Développeur et sélectionne les candidats à relire"""
+    candidates: int = 3
+    temperature_step: float = 0.15
+    max_temperature: float = 1.0
+    review_top: int = 1
+    iterations: int = 0
+    generated: int = 0
+    reviewed: int = 0
+    winners: dict = field(default_factory=dict)  # {rang du gagnant: itérations}, 0 = candidat par défaut
+    fallbacks: int = 0  # Itérations sans correctif applicable (code régénéré, aucun gagnant)
+    
+    @classmethod
+    def from_config(cls, config: dict, available_slots: int) -> "CandidateSearch":
+        """
+        Construit la recherche depuis settings.CANDIDATE_SEARCH; candidates à
+        0 = créneaux libres du modèle du Développeur (available_slots).
+        """
+        candidates = config.get("candidates") or available_slots
+        return cls(
+            candidates=max(1, min(candidates, config.get("max_candidates", 4))),
+            temperature_step=config.get("temperature_step", 0.15),
+            max_temperature=config.get("max_temperature", 1.0),
+            review_top=max(1, config.get("review_top", 1)),
+        )
+    
+    @property
+    def active(self) -> bool:
+        return self.candidates > 1
+    
+    def variants(self, agent) -> list:
+        """L'agent lui-même (candidat par défaut), puis ses variantes plus chaudes et à seed fixé"""
+        base = agent.options["temperature"]
+        return [agent] + [
+            agent.variant(
+                temperature=round(min(base + rank * self.temperature_step, self.max_temperature), 2),
+                seed=rank
+            )
+            for rank in range(1, self.candidates)
+        ]
+    
+    def shortlist(self, codes: list) -> list:
+        """Rangs des candidats à relire (meilleurs pré-scores, le candidat par défaut en cas d'égalité)"""
+        scores = [prescore(code) for code in codes]
+        ranking = sorted(range(len(codes)), key=lambda rank: (-scores[rank], rank))
+        logger.info(
+            f"🎲 {len(codes)} candidats, pré-scores: {', '.join(f'{score:.0f}' for score in scores)}"
+        )
+        return ranking[:self.review_top]
+    
+    def record_iteration(self, generated: int) -> None:
+        """Itération de recherche: generated candidats produits, applicables ou non"""
+        self.iterations += 1
+        self.generated += generated
+    
+    def record_winner(self, rank: int, reviewed: int) -> None:
+        self.reviewed += reviewed
+        self.winners[rank] = self.winners.get(rank, 0) + 1
+    
+    def record_fallback(self) -> None:
+        """Itération dont aucun candidat ne s'applique: le code est régénéré hors sélection"""
+        self.fallbacks += 1
+    
+    def stats(self) -> dict:
+        return {
+            "candidates": self.candidates,
+            "review_top": self.review_top,
+            "iterations": self.iterations,
+            "generated": self.generated,
+            "reviewed": self.reviewed,
+            "winners_by_rank": dict(sorted(self.winners.items())),
+            "fallbacks": self.fallbacks,
+        }
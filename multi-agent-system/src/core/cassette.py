@@ -0,0 +1,528 @@
+"""
+Cassettes d'enregistrement / rejeu du trafic Ollama.
+
+En mode record, chaque échange HTTP des clients (requête, statut, chunks de
+la réponse avec leur horodatage, erreurs réseau) est ajouté à un fichier
+JSON Lines compressé (gzip). En mode replay, les réponses sont resservies
+depuis la cassette sans contacter Ollama, instantanément ou au rythme
+d'origine (time_scale).
+
+L'interception se fait au niveau transport: adaptateur requests pour
+OllamaClient, transport httpx pour AsyncOllamaClient. Le reste du client
+(routage, retries, streaming, annulation des requêtes doublées) est exercé
+comme contre un vrai serveur.
+
+Correspondance au rejeu: requête identique (méthode, chemin, corps JSON)
+d'abord, puis, hors mode strict, prochain échange non servi du même modèle
+sur le même chemin (prompts modifiés entre l'enregistrement et le rejeu).
+Un flux abandonné par le client (arrêt anticipé) n'est rejoué qu'à
+l'identique et faute d'échange complet: le client s'y arrête au même point.
+"""
+
+import asyncio
+import codecs
+import gzip
+import json
+import logging
+import threading
+import time
+import zlib
+from http import HTTPStatus
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.exceptions import ProtocolError
+
+logger = logging.getLogger(__name__)
+
+MODES = ("record", "replay")
+
+
+class Cassette:
+    """Fichier d'échanges HTTP enregistrés, partagé par les clients sync et async"""
+    
+    def __init__(self, path: str, mode: str = "replay", time_scale: float = 0.0, strict: bool = False):
+        """
+        Args:
+            path: fichier .jsonl.gz (créé ou complété en record)
+            mode: "record" ou "replay"
+            time_scale: rejeu, 0 = instantané, 1 = durées d'origine
+            strict: rejeu, uniquement les requêtes identiques à l'enregistrement
+        """
+        if mode not in MODES:
+            raise ValueError(f"Mode de cassette inconnu: {mode} (attendu: {', '.join(MODES)})")
+        self.path = Path(path)
+        self.mode = mode
+        self.time_scale = max(0.0, time_scale)
+        self.strict = strict
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._interactions: list[dict] = []
+        self._by_request: dict[tuple, list[int]] = {}
+        self._abandoned: dict[tuple, list[int]] = {}
+        self._by_model: dict[tuple, list[int]] = {}
+        self._served: set[int] = set()
+        self._lock = threading.Lock()
+        self._file = None
+        
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Nouveau membre gzip à la fin du fichier: une cassette peut cumuler plusieurs runs
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+        else:
+            self._load()
+    
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+    
+    def adapter(self) -> "CassetteAdapter":
+        """Adaptateur à monter sur une requests.Session"""
+        return CassetteAdapter(self)
+    
+    def async_transport(self, limits: Optional[httpx.Limits] = None) -> "AsyncCassetteTransport":
+        """Transport httpx (en record, il enveloppe un transport réel configuré avec limits)"""
+        transport = None
+        if self.recording:
+            transport = httpx.AsyncHTTPTransport(limits=limits or httpx.Limits())
+        return AsyncCassetteTransport(self, transport)
+    
+    def close(self) -> None:
+        if self._file is not None:
+            with self._lock:
+                self._file.close()
+                self._file = None
+            logger.info(f"📼 Cassette enregistrée: {self.path} ({self.recorded} échange(s))")
+    
+    def __enter__(self) -> "Cassette":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "path": str(self.path),
+                "interactions": self.recorded if self.recording else len(self._interactions),
+                "replayed": self.replayed,
+                "misses": self.misses,
+            }
+    
+    # ------------------------------------------------------------------
+    # Enregistrement
+    # ------------------------------------------------------------------
+    
+    def start(self, method: str, url: str, body) -> "_Recording":
+        """Échange en cours d'enregistrement (complété par les chunks de la réponse)"""
+        return _Recording(self, method, urlsplit(url).path, _decode_body(body))
+    
+    def _write(self, interaction: dict) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(interaction, ensure_ascii=False) + "\n")
+            self._file.flush()  # Z_SYNC_FLUSH: un run interrompu laisse une cassette lisible
+            self.recorded += 1
+    
+    # ------------------------------------------------------------------
+    # Rejeu
+    # ------------------------------------------------------------------
+    
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette introuvable: {self.path}")
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+        except (EOFError, zlib.error, ValueError) as e:
+            # Enregistrement interrompu: les échanges complets restent utilisables
+            logger.warning(f"⚠️  Cassette tronquée ({e}), {len(self._interactions)} échange(s) chargé(s)")
+        logger.info(f"📼 Cassette chargée: {self.path} ({len(self._interactions)} échange(s))")
+    
+    def _index(self, interaction: dict) -> None:
+        position = len(self._interactions)
+        self._interactions.append(interaction)
+        method, path, body = interaction["method"], interaction["path"], interaction.get("body")
+        if not interaction.get("complete", True):
+            # Réponse abandonnée par le client (requête doublée perdante, arrêt anticipé):
+            # rejouée seulement si aucun échange complet ne correspond à l'identique
+            self._abandoned.setdefault(_request_key(method, path, body), []).append(position)
+            return
+        self._by_request.setdefault(_request_key(method, path, body), []).append(position)
+        self._by_model.setdefault(_fallback_key(method, path, body), []).append(position)
+    
+    def match(self, method: str, url: str, body) -> Optional[dict]:
+        """
+        Échange enregistré pour la requête: le prochain non servi à l'identique,
+        sinon (hors strict) le prochain non servi du même modèle, sinon le
+        dernier servi à l'identique. None si la cassette n'a rien.
+        """
+        path, body = urlsplit(url).path, _decode_body(body)
+        key = _request_key(method, path, body)
+        exact = self._by_request.get(key, [])
+        with self._lock:
+            position = self._next_unserved(exact)
+            if position is None:
+                position = self._next_unserved(self._abandoned.get(key, []))
+            if position is None and not self.strict:
+                position = self._next_unserved(self._by_model.get(_fallback_key(method, path, body), []))
+            if position is None and exact:
+                position = exact[-1]
+            if position is None:
+                self.misses += 1
+                logger.warning(f"📼 {method} {path}: requête absente de la cassette")
+                return None
+            self._served.add(position)
+            self.replayed += 1
+        interaction = self._interactions[position]
+        if isinstance(body, dict) and body.get("stream") is False and _is_stream(interaction):
+            return _collapse_stream(interaction)
+        return interaction
+    
+    def _next_unserved(self, positions: list[int]) -> Optional[int]:
+        for position in positions:
+            if position not in self._served:
+                return position
+        return None
+    
+    def delay(self, started: float, offset: float) -> float:
+        """Attente avant l'instant offset (secondes depuis started) de l'enregistrement"""
+        if not self.time_scale:
+            return 0.0
+        return max(0.0, started + offset * self.time_scale - time.monotonic())
+
+
+class _Recording:
+    """Échange en cours: chunks horodatés depuis l'envoi de la requête"""
+    
+    def __init__(self, cassette: Cassette, method: str, path: str, body):
+        self.cassette = cassette
+        self.interaction = {
+            "timestamp": time.time(),
+            "method": method,
+            "path": path,
+            "body": body,
+        }
+        self.started = time.monotonic()
+        self.chunks: list[list] = []
+        self.eof = False
+        self.truncated = False  # Connexion coupée par le serveur en cours de réponse
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._finished = False
+    
+    def response(self, status: int, content_type: Optional[str]) -> None:
+        self.interaction["status"] = status
+        self.interaction["content_type"] = content_type
+        self.interaction["elapsed"] = self._offset()
+    
+    def chunk(self, data: bytes) -> None:
+        text = self._decoder.decode(data)
+        if text:
+            self.chunks.append([self._offset(), text])
+    
+    def error(self, kind: str, error: Exception) -> None:
+        """Échec réseau ("timeout" ou "connection"), rejoué comme tel"""
+        self.interaction["elapsed"] = self._offset()
+        self.interaction["error"] = {"kind": kind, "message": str(error)}
+        self._finish(complete=True)
+    
+    def finish(self) -> None:
+        """Réponse lue (ou abandonnée): l'échange est écrit une seule fois"""
+        tail = self._decoder.decode(b"", final=True)
+        if tail:
+            self.chunks.append([self._offset(), tail])
+        if self.truncated:
+            self.interaction["truncated"] = True
+        self._finish(self.eof or self.truncated or _ends_cleanly(self.chunks))
+    
+    def _finish(self, complete: bool) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        self.interaction["chunks"] = self.chunks
+        self.interaction["complete"] = complete
+        self.interaction["duration"] = self._offset()
+        self.cassette._write(self.interaction)
+    
+    def _offset(self) -> float:
+        return round(time.monotonic() - self.started, 4)
+
+
+# ----------------------------------------------------------------------
+# requests (OllamaClient)
+# ----------------------------------------------------------------------
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Adaptateur requests qui enregistre ou rejoue les échanges d'une Cassette"""
+    
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if not self.cassette.recording:
+            return self._replay(request)
+        
+        recording = self.cassette.start(request.method, request.url, request.body)
+        try:
+            response = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        except requests.Timeout as e:
+            recording.error("timeout", e)
+            raise
+        except requests.ConnectionError as e:
+            recording.error("connection", e)
+            raise
+        recording.response(response.status_code, response.headers.get("content-type"))
+        response.raw = _RecordingRaw(response.raw, recording)
+        return response
+    
+    def _replay(self, request) -> requests.Response:
+        started = time.monotonic()
+        interaction = self.cassette.match(request.method, request.url, request.body) or _missing(request.method, request.url)
+        time.sleep(self.cassette.delay(started, interaction["elapsed"]))
+        
+        error = interaction.get("error")
+        if error:
+            exception = requests.ReadTimeout if error["kind"] == "timeout" else requests.ConnectionError
+            raise exception(error["message"], request=request)
+        
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = _reason(interaction["status"])
+        response.headers = CaseInsensitiveDict({"content-type": interaction.get("content_type") or "application/json"})
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _ReplayRaw(self.cassette, interaction, started)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+class _RecordingRaw:
+    """Corps de réponse urllib3 dont les chunks lus sont copiés dans l'enregistrement"""
+    
+    def __init__(self, raw, recording: _Recording):
+        self._raw = raw
+        self._recording = recording
+    
+    def stream(self, amt: int = 2 ** 16, decode_content: Optional[bool] = None) -> Iterator[bytes]:
+        try:
+            for chunk in self._raw.stream(amt, decode_content=decode_content):
+                self._recording.chunk(chunk)
+                yield chunk
+            self._recording.eof = True
+        except Exception:
+            self._recording.truncated = True
+            raise
+        finally:
+            self._recording.finish()
+    
+    def close(self) -> None:
+        self._recording.finish()
+        self._raw.close()
+    
+    def release_conn(self) -> None:
+        self._recording.finish()
+        self._raw.release_conn()
+    
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class _ReplayRaw:
+    """Corps de réponse rejoué (interface urllib3 utilisée par requests)"""
+    
+    def __init__(self, cassette: Cassette, interaction: dict, started: float):
+        self._cassette = cassette
+        self._interaction = interaction
+        self._started = started
+    
+    def stream(self, amt: Optional[int] = None, decode_content: Optional[bool] = None) -> Iterator[bytes]:
+        for offset, text in self._interaction["chunks"]:
+            time.sleep(self._cassette.delay(self._started, offset))
+            yield text.encode("utf-8")
+        if self._interaction.get("truncated"):
+            raise ProtocolError("Réponse interrompue (rejouée depuis la cassette)")
+    
+    def close(self) -> None:
+        pass
+    
+    def release_conn(self) -> None:
+        pass
+
+
+# ----------------------------------------------------------------------
+# httpx (AsyncOllamaClient)
+# ----------------------------------------------------------------------
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    """Transport httpx qui enregistre ou rejoue les échanges d'une Cassette"""
+    
+    def __init__(self, cassette: Cassette, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.cassette = cassette
+        self._transport = transport
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.cassette.recording:
+            return await self._replay(request)
+        
+        # Corps non compressé: les chunks enregistrés sont du texte lisible
+        request.headers["Accept-Encoding"] = "identity"
+        recording = self.cassette.start(request.method, str(request.url), request.content)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TimeoutException as e:
+            recording.error("timeout", e)
+            raise
+        except httpx.TransportError as e:
+            recording.error("connection", e)
+            raise
+        recording.response(response.status_code, response.headers.get("content-type"))
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_AsyncRecordingStream(response.stream, recording),
+            extensions=response.extensions,
+            request=request,
+        )
+    
+    async def _replay(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        interaction = self.cassette.match(request.method, str(request.url), request.content) or _missing(
+            request.method, str(request.url)
+        )
+        await asyncio.sleep(self.cassette.delay(started, interaction["elapsed"]))
+        
+        error = interaction.get("error")
+        if error:
+            exception = httpx.ReadTimeout if error["kind"] == "timeout" else httpx.ConnectError
+            raise exception(error["message"], request=request)
+        
+        return httpx.Response(
+            interaction["status"],
+            headers={"content-type": interaction.get("content_type") or "application/json"},
+            stream=_AsyncReplayStream(self.cassette, interaction, started),
+            request=request,
+        )
+    
+    async def aclose(self) -> None:
+        if self._transport is not None:
+            await self._transport.aclose()
+
+
+class _AsyncRecordingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, recording: _Recording):
+        self._stream = stream
+        self._recording = recording
+    
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._stream:
+                self._recording.chunk(chunk)
+                yield chunk
+        except Exception:
+            self._recording.truncated = True
+            raise
+        self._recording.eof = True
+    
+    async def aclose(self) -> None:
+        self._recording.finish()
+        await self._stream.aclose()
+
+
+class _AsyncReplayStream(httpx.AsyncByteStream):
+    def __init__(self, cassette: Cassette, interaction: dict, started: float):
+        self._cassette = cassette
+        self._interaction = interaction
+        self._started = started
+    
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for offset, text in self._interaction["chunks"]:
+            await asyncio.sleep(self._cassette.delay(self._started, offset))
+            yield text.encode("utf-8")
+        if self._interaction.get("truncated"):
+            raise httpx.RemoteProtocolError("Réponse interrompue (rejouée depuis la cassette)")
+
+
+# ----------------------------------------------------------------------
+# Utilitaires
+# ----------------------------------------------------------------------
+
+
+def _decode_body(body):
+    """Corps de requête en JSON (texte brut s'il n'est pas JSON, None si vide)"""
+    if not body:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+def _request_key(method: str, path: str, body) -> tuple:
+    # Flux ou non: même génération (les requêtes doublées sont lues en flux)
+    if isinstance(body, dict):
+        body = {k: v for k, v in body.items() if k != "stream"}
+    return method, path, json.dumps(body, sort_keys=True, ensure_ascii=False)
+
+
+def _fallback_key(method: str, path: str, body) -> tuple:
+    """Même modèle, même nature d'appel (génération ou simple chargement)"""
+    if not isinstance(body, dict):
+        return method, path
+    return method, path, body.get("model"), bool(body.get("prompt"))
+
+
+def _is_stream(interaction: dict) -> bool:
+    body = interaction.get("body")
+    return isinstance(body, dict) and body.get("stream", True) is not False and interaction.get("status") == 200
+
+
+def _collapse_stream(interaction: dict) -> dict:
+    """Réponse en flux enregistrée, resservie à une requête non streamée (un seul message)"""
+    messages = [json.loads(line) for line in "".join(t for _, t in interaction["chunks"]).splitlines() if line.strip()]
+    if not messages or interaction.get("truncated"):
+        return interaction
+    message = {**messages[-1], "response": "".join(m.get("response", "") for m in messages)}
+    offset = interaction["chunks"][-1][0]
+    return {**interaction, "elapsed": offset, "chunks": [[offset, json.dumps(message, ensure_ascii=False)]]}
+
+
+def _ends_cleanly(chunks: list) -> bool:
+    """Réponse Ollama complète même si la connexion n'a pas été lue jusqu'au bout (dernier message done)"""
+    lines = "".join(text for _, text in chunks).strip().splitlines()
+    if not lines:
+        return False
+    try:
+        last = json.loads(lines[-1])
+    except ValueError:
+        return False
+    return not isinstance(last, dict) or last.get("done", True) is not False
+
+
+def _missing(method: str, url: str) -> dict:
+    """Réponse 404 d'une requête absente de la cassette (erreur non retentée par les clients)"""
+    message = json.dumps({"error": f"{method} {urlsplit(url).path}: requête absente de la cassette"})
+    return {"status": 404, "content_type": "application/json", "elapsed": 0.0, "chunks": [[0.0, message]]}
+
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
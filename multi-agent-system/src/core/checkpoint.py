@@ -0,0 +1,107 @@
+"""
+Point de reprise d'un run (checkpoint JSON dans le répertoire de sortie).
+
+best_solution et l'historique des métriques ne vivent qu'en mémoire: un
+crash ou un Ctrl-C à l'itération 12 perdait tout. L'orchestrateur écrit son
+état après chaque phase terminée; l'écriture passe par un fichier
+temporaire renommé (os.replace), si bien qu'un arrêt pendant l'écriture
+laisse le checkpoint précédent intact. La reprise (--resume) restaure cet
+état et ne relance que les phases non terminées.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import fields, is_dataclass
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+class CheckpointError(ValueError):
+    """Checkpoint illisible ou d'une version incompatible"""
+
+
+class Checkpoint:
+    """Lecture / écriture atomique de l'état d'un run"""
+    
+    def __init__(self, directory, filename: str = "checkpoint.json"):
+        self.path = Path(directory) / filename
+        self.saves = 0
+        self.save_seconds = 0.0
+    
+    def exists(self) -> bool:
+        return self.path.is_file()
+    
+    def save(self, state: dict) -> None:
+        """Écrit state (JSON) de façon atomique"""
+        started = time.perf_counter()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(
+            {"version": CHECKPOINT_VERSION, "saved_at": time.time(), "state": state},
+            ensure_ascii=False
+        )
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self.saves += 1
+        self.save_seconds += time.perf_counter() - started
+    
+    def load(self) -> Optional[dict]:
+        """État enregistré (None si aucun checkpoint); lève CheckpointError s'il est invalide"""
+        if not self.exists():
+            return None
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            raise CheckpointError(f"Checkpoint illisible ({self.path}): {e}") from e
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise CheckpointError(
+                f"Checkpoint version {data.get('version')} non supportée (attendue: {CHECKPOINT_VERSION})"
+            )
+        return data["state"]
+    
+    def stats(self) -> dict:
+        return {
+            "path": str(self.path),
+            "saves": self.saves,
+            "save_seconds": round(self.save_seconds, 3),
+        }
+
+
+def snapshot(obj, names: tuple) -> dict:
+    """Valeurs des attributs names de obj (dataclasses imbriquées converties en dict)"""
+    return {name: _plain(getattr(obj, name)) for name in names}
+
+
+def restore(obj, state: dict) -> None:
+    """Réaffecte à obj les attributs enregistrés par snapshot()"""
+    for name, value in state.items():
+        setattr(obj, name, value)
+
+
+def int_keys(mapping: dict) -> dict:
+    """Clés entières d'un dict relu depuis JSON (JSON n'a que des clés texte)"""
+    return {int(key): value for key, value in mapping.items()}
+
+
+def _plain(value):
+    if is_dataclass(value):
+        return {f.name: _plain(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
@@ -0,0 +1,77 @@
+"""
+Raffinement du code par correctifs d'une itération à l'autre.
+
+Régénérer tout le code à chaque itération fait produire au Développeur des
+milliers de tokens pour corriger quelques lignes. Tant que l'architecture
+ne change pas, le Développeur reçoit le code courant et les problèmes
+remontés par Reviewer/Sécurité, et ne renvoie que des modifications (diffs
+unifiés ou fichiers complets, utils/code_patch.py). L'orchestrateur les
+applique; un correctif inapplicable ou qui casse la syntaxe déclenche une
+régénération complète.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..utils.code_patch import PatchStats, apply_patch, render_files, split_files
+
+logger = logging.getLogger(__name__)
+
+# Mode de mise à jour du code d'une itération
+FULL, PATCH, FALLBACK = "full", "patch", "fallback"
+
+
+@dataclass
+class CodeRefiner:
+    """Choisit, à chaque itération, entre régénération complète et correctif"""
+    max_findings: int = 12
+    updates: dict = field(default_factory=lambda: {FULL: 0, PATCH: 0, FALLBACK: 0})
+    completion_tokens: dict = field(default_factory=lambda: {FULL: 0, PATCH: 0, FALLBACK: 0})
+    _findings: dict = field(default_factory=dict, repr=False)  # {source: problèmes}
+    
+    @classmethod
+    def from_config(cls, config: dict) -> "CodeRefiner":
+        """Construit le raffineur depuis settings.CODE_REFINEMENT"""
+        return cls(max_findings=max(1, config.get("max_findings", 12)))
+    
+    def record_findings(self, source: str, issues: list) -> None:
+        """Remplace les problèmes remontés par source (Reviewer, Sécurité)"""
+        self._findings[source] = list(issues)
+    
+    @property
+    def findings(self) -> list:
+        """Problèmes à corriger (toutes sources, sans doublon, plafonnés)"""
+        unique = dict.fromkeys(issue for issues in self._findings.values() for issue in issues)
+        return list(unique)[:self.max_findings]
+    
+    def decide(self, has_code: bool, architecture_changed: bool) -> str:
+        """Correctif si du code existe, que des problèmes sont connus et que l'architecture est inchangée"""
+        if has_code and self.findings and not architecture_changed:
+            return PATCH
+        return FULL
+    
+    def apply(self, code: str, patch: str) -> tuple:
+        """(code corrigé, PatchStats); lève PatchError si le correctif est inapplicable"""
+        files, stats = apply_patch(split_files(code), patch)
+        return render_files(files), stats
+    
+    def record(self, mode: str, completion_tokens: int, stats: Optional[PatchStats] = None) -> None:
+        self.updates[mode] += 1
+        self.completion_tokens[mode] += completion_tokens
+        if stats is not None:
+            logger.info(
+                f"🩹 Correctif appliqué: {len(stats.files_changed)} fichier(s), "
+                f"+{stats.lines_added}/-{stats.lines_removed} lignes"
+            )
+    
+    def stats(self) -> dict:
+        average = {
+            mode: round(self.completion_tokens[mode] / count) if count else 0
+            for mode, count in self.updates.items()
+        }
+        return {
+            **self.updates,
+            "completion_tokens": dict(self.completion_tokens),
+            "avg_completion_tokens": average,
+        }
@@ -0,0 +1,232 @@
+"""
+Gouverneur de concurrence côté client pour des backends Ollama partagés.
+
+Ollama ne traite que OLLAMA_NUM_PARALLEL requêtes simultanées par modèle:
+au-delà, elles attendent côté serveur, sans ordre garanti, jusqu'au timeout.
+Le gouverneur plafonne les appels en cours par (nœud, modèle) et met les
+autres en file d'attente locale:
+- priorité d'abord (la plus haute est servie en premier)
+- puis partage équitable entre runs: le run qui occupe le moins de créneaux
+- puis ordre d'arrivée
+
+Le run courant (identifiant + priorité) est porté par une ContextVar que
+l'orchestrateur positionne pendant run()/arun(): plusieurs orchestrateurs du
+même process qui partagent un client partagent aussi sa capacité.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .model_residency import model_base_name
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """Identité d'un run pour l'ordonnancement des appels"""
+    run_id: str = "default"
+    priority: int = 0
+
+
+current_run: ContextVar[RunContext] = ContextVar("ollama_run", default=RunContext())
+
+
+@contextmanager
+def run_context(run_id: str, priority: int = 0):
+    """Associe les appels Ollama du bloc (et des tâches qu'il crée) au run"""
+    token = current_run.set(RunContext(run_id, priority))
+    try:
+        yield
+    finally:
+        current_run.reset(token)
+
+
+@dataclass
+class _Waiter:
+    key: tuple
+    run: RunContext
+    seq: int
+    wake: Callable[[], None]
+    granted: bool = False
+
+
+@dataclass
+class _RunStats:
+    calls: int = 0
+    queued: int = 0
+    wait_seconds: float = 0.0
+
+
+@dataclass
+class _GovernorStats:
+    calls: int = 0
+    queued: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    max_queue_depth: int = 0
+    runs: dict = field(default_factory=dict)
+
+
+class ConcurrencyGovernor:
+    """Créneaux d'appels par (nœud, modèle), file d'attente prioritaire et équitable"""
+    
+    def __init__(self, slots: int = 1, model_slots: Optional[dict] = None):
+        """
+        Args:
+            slots: appels simultanés max par nœud et par modèle (OLLAMA_NUM_PARALLEL)
+            model_slots: plafonds spécifiques {modèle: créneaux}
+        """
+        self.slots = max(1, slots)
+        self.model_slots = {model_base_name(m): max(1, n) for m, n in (model_slots or {}).items()}
+        self._in_flight: dict[tuple, int] = {}
+        self._held: dict[str, int] = {}
+        self._queues: dict[tuple, list[_Waiter]] = {}
+        self._seq = itertools.count()
+        self._stats = _GovernorStats()
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, config) -> Optional["ConcurrencyGovernor"]:
+        """Gouverneur d'un OllamaConfig (None si parallel_slots vaut 0)"""
+        if not config.parallel_slots:
+            return None
+        return cls(config.parallel_slots, config.model_slots)
+    
+    def capacity(self, model: str) -> int:
+        return self.model_slots.get(model_base_name(model), self.slots)
+    
+    def queue_depth(self) -> int:
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+    
+    # ------------------------------------------------------------------
+    # Créneaux
+    # ------------------------------------------------------------------
+    
+    @contextmanager
+    def slot(self, endpoint: str, model: str):
+        """Bloque le thread jusqu'à obtenir un créneau sur (endpoint, model)"""
+        key, run = (endpoint, model_base_name(model)), current_run.get()
+        started = time.monotonic()
+        event = threading.Event()
+        waiter = self._acquire_or_enqueue(key, run, event.set)
+        if waiter is not None:
+            event.wait()
+        self._record_wait(run, time.monotonic() - started, waiter is not None)
+        try:
+            yield
+        finally:
+            self._release(key, run)
+    
+    @asynccontextmanager
+    async def aslot(self, endpoint: str, model: str):
+        """Équivalent asyncio de slot (l'attente ne bloque pas la boucle)"""
+        key, run = (endpoint, model_base_name(model)), current_run.get()
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+        waiter = self._acquire_or_enqueue(
+            key, run, lambda: loop.call_soon_threadsafe(_resolve, granted)
+        )
+        if waiter is not None:
+            try:
+                await granted
+            except asyncio.CancelledError:
+                self._abandon(waiter)
+                raise
+        self._record_wait(run, time.monotonic() - started, waiter is not None)
+        try:
+            yield
+        finally:
+            self._release(key, run)
+    
+    def _acquire_or_enqueue(self, key: tuple, run: RunContext, wake: Callable[[], None]) -> Optional[_Waiter]:
+        """Prend un créneau libre (None) ou met l'appel en file (son _Waiter)"""
+        with self._lock:
+            if self._in_flight.get(key, 0) < self.capacity(key[1]) and not self._queues.get(key):
+                self._grant(key, run)
+                return None
+            waiter = _Waiter(key, run, next(self._seq), wake)
+            self._queues.setdefault(key, []).append(waiter)
+            depth = sum(len(queue) for queue in self._queues.values())
+            self._stats.max_queue_depth = max(self._stats.max_queue_depth, depth)
+        logger.debug(f"🚦 {key[1]}@{key[0]}: appel de {run.run_id} en file (profondeur {depth})")
+        return waiter
+    
+    def _grant(self, key: tuple, run: RunContext) -> None:
+        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        self._held[run.run_id] = self._held.get(run.run_id, 0) + 1
+    
+    def _release(self, key: tuple, run: RunContext) -> None:
+        """Libère un créneau et le transmet au prochain appel en file"""
+        with self._lock:
+            self._in_flight[key] -= 1
+            self._held[run.run_id] -= 1
+            queue = self._queues.get(key)
+            waiter = None
+            if queue:
+                waiter = min(
+                    queue,
+                    key=lambda w: (-w.run.priority, self._held.get(w.run.run_id, 0), w.seq),
+                )
+                queue.remove(waiter)
+                waiter.granted = True
+                self._grant(key, waiter.run)
+        if waiter is not None:
+            waiter.wake()
+    
+    def _abandon(self, waiter: _Waiter) -> None:
+        """Appel annulé pendant l'attente: le retire de la file (ou rend le créneau déjà accordé)"""
+        with self._lock:
+            granted = waiter.granted
+            if not granted:
+                self._queues[waiter.key].remove(waiter)
+        if granted:
+            self._release(waiter.key, waiter.run)
+    
+    def _record_wait(self, run: RunContext, seconds: float, queued: bool) -> None:
+        with self._lock:
+            stats = self._stats
+            per_run = stats.runs.setdefault(run.run_id, _RunStats())
+            stats.calls += 1
+            per_run.calls += 1
+            if queued:
+                stats.queued += 1
+                stats.wait_seconds += seconds
+                stats.max_wait_seconds = max(stats.max_wait_seconds, seconds)
+                per_run.queued += 1
+                per_run.wait_seconds += seconds
+    
+    def stats(self) -> dict:
+        with self._lock:
+            stats = self._stats
+            return {
+                "queue_depth": sum(len(queue) for queue in self._queues.values()),
+                "max_queue_depth": stats.max_queue_depth,
+                "calls": stats.calls,
+                "queued_calls": stats.queued,
+                "avg_wait_seconds": round(stats.wait_seconds / stats.queued, 3) if stats.queued else 0.0,
+                "max_wait_seconds": round(stats.max_wait_seconds, 3),
+                "in_flight": {f"{model}@{url}": n for (url, model), n in self._in_flight.items() if n},
+                "runs": {
+                    run_id: {
+                        "calls": s.calls,
+                        "queued": s.queued,
+                        "wait_seconds": round(s.wait_seconds, 3),
+                    }
+                    for run_id, s in stats.runs.items()
+                },
+            }
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,208 @@
+"""
+Pool de nœuds Ollama.
+
+Chaque nœud (un serveur Ollama sur sa machine) a son propre circuit breaker,
+son nombre de requêtes en cours et la liste des modèles qu'il a en mémoire
+(lue sur /api/ps lors des sondes de santé, complétée par les appels réussis).
+Le routage choisit le nœud le moins chargé en pénalisant ceux qui devraient
+charger le modèle à froid. Le pool ne fait aucun appel réseau: les clients
+synchrone et asynchrone le sondent chacun avec leur transport.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from .model_residency import model_base_name
+from .resilience import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Endpoint:
+    """Un nœud Ollama du pool"""
+    url: str
+    breaker: CircuitBreaker
+    healthy: bool = True
+    in_flight: int = 0
+    requests: int = 0
+    failures: int = 0
+    hedges_won: int = 0
+    resident_models: set = field(default_factory=set)
+    
+    def stats(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "circuit": self.breaker.state,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "hedges_won": self.hedges_won,
+            "resident_models": sorted(self.resident_models),
+        }
+
+
+class EndpointPool:
+    """
+    Routage des appels entre plusieurs nœuds Ollama.
+
+    Score d'un nœud: requêtes en cours + cold_model_penalty si le modèle n'y
+    est pas résident (à égalité, le nœud le moins sollicité). Les nœuds dont
+    la dernière sonde a échoué ne sont utilisés qu'en dernier recours; ceux
+    dont le circuit est ouvert jamais.
+    """
+    
+    def __init__(
+        self,
+        urls: Iterable[str],
+        breaker: Optional[CircuitBreaker] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        cold_model_penalty: float = 2.0,
+        health_check_interval: float = 30.0,
+    ):
+        """
+        Args:
+            urls: URLs des nœuds (sans doublon)
+            breaker: circuit breaker à réutiliser si le pool n'a qu'un nœud
+                (celui de la ResiliencePolicy du client)
+        """
+        urls = list(dict.fromkeys(url.rstrip("/") for url in urls))
+        if not urls:
+            raise ValueError("EndpointPool: au moins une URL est requise")
+        self.endpoints = [
+            Endpoint(
+                url,
+                breaker if breaker is not None and len(urls) == 1
+                else CircuitBreaker(failure_threshold, reset_timeout),
+            )
+            for url in urls
+        ]
+        self.cold_model_penalty = cold_model_penalty
+        self.health_check_interval = health_check_interval
+        self.last_probe = 0.0
+        self.hedges = 0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, config, breaker: Optional[CircuitBreaker] = None) -> "EndpointPool":
+        """Pool des nœuds d'un OllamaConfig (base_url seul si endpoints est vide)"""
+        return cls(
+            config.endpoints or [config.base_url],
+            breaker=breaker,
+            failure_threshold=config.breaker_threshold,
+            reset_timeout=config.breaker_reset_seconds,
+            cold_model_penalty=config.cold_model_penalty,
+            health_check_interval=config.health_check_interval,
+        )
+    
+    def __len__(self) -> int:
+        return len(self.endpoints)
+    
+    @property
+    def primary(self) -> Endpoint:
+        """Premier nœud sain (appels d'administration: tags, pull, ps...)"""
+        return next((e for e in self.endpoints if e.healthy), self.endpoints[0])
+    
+    # ------------------------------------------------------------------
+    # Routage
+    # ------------------------------------------------------------------
+    
+    def choose(self, model: Optional[str] = None, exclude: Iterable[str] = ()) -> Optional[Endpoint]:
+        """
+        Nœud le plus adapté pour model, hors URLs exclues.
+        None si aucun nœud n'a son circuit fermé (ou en essai).
+        """
+        excluded = set(exclude)
+        name = model_base_name(model) if model else None
+        with self._lock:
+            candidates = [e for e in self.endpoints if e.url not in excluded]
+            ranked = sorted(
+                candidates,
+                key=lambda e: (
+                    not e.healthy,
+                    e.in_flight + (0 if name is None or name in e.resident_models else self.cold_model_penalty),
+                    e.requests,
+                ),
+            )
+        # allow() fait passer un circuit ouvert expiré en semi-ouvert: l'appeler
+        # seulement sur le nœud retenu
+        return next((e for e in ranked if e.breaker.allow()), None)
+    
+    def acquire(self, endpoint: Endpoint) -> None:
+        """Compte une requête en cours sur le nœud (dès son lancement, pour les appels concurrents)"""
+        with self._lock:
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+    
+    def release(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            endpoint.in_flight -= 1
+    
+    @contextmanager
+    def track(self, endpoint: Endpoint):
+        """Compte la requête en cours sur le nœud pendant le bloc"""
+        self.acquire(endpoint)
+        try:
+            yield endpoint
+        finally:
+            self.release(endpoint)
+    
+    def record_success(self, endpoint: Endpoint, model: str) -> None:
+        endpoint.breaker.record_success()
+        with self._lock:
+            endpoint.healthy = True
+            endpoint.resident_models.add(model_base_name(model))
+    
+    def record_failure(self, endpoint: Endpoint, unreachable: bool = False) -> None:
+        """Échec d'un appel; un nœud injoignable sort de la rotation jusqu'à la prochaine sonde"""
+        endpoint.breaker.record_failure()
+        with self._lock:
+            endpoint.failures += 1
+            if unreachable and endpoint.healthy and len(self.endpoints) > 1:
+                logger.warning(f"🩺 Nœud {endpoint.url} retiré de la rotation")
+                endpoint.healthy = False
+    
+    def record_hedge(self, winner: Optional[Endpoint] = None) -> None:
+        with self._lock:
+            if winner is None:
+                self.hedges += 1
+            else:
+                winner.hedges_won += 1
+    
+    # ------------------------------------------------------------------
+    # Sondes de santé
+    # ------------------------------------------------------------------
+    
+    def probe_due(self) -> bool:
+        """Vrai si les nœuds doivent être sondés (pool de plusieurs nœuds uniquement)"""
+        if len(self.endpoints) < 2:
+            return False
+        with self._lock:
+            if time.monotonic() - self.last_probe < self.health_check_interval:
+                return False
+            self.last_probe = time.monotonic()
+            return True
+    
+    def record_probe(self, endpoint: Endpoint, running_models: Optional[list]) -> None:
+        """Résultat d'une sonde /api/ps (None = nœud injoignable)"""
+        with self._lock:
+            healthy = running_models is not None
+            if healthy != endpoint.healthy:
+                logger.info(
+                    f"🩺 Nœud {endpoint.url} {'de retour dans' if healthy else 'retiré de'} la rotation"
+                )
+            endpoint.healthy = healthy
+            if healthy:
+                endpoint.resident_models = {model_base_name(m.get("name", "")) for m in running_models}
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hedges": self.hedges,
+                "endpoints": {e.url: e.stats() for e in self.endpoints},
+            }
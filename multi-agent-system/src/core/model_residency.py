@@ -0,0 +1,210 @@
+"""
+Gestion de la résidence des modèles Ollama en mémoire.
+
+Sur CPU, chaque chargement à froid coûte plusieurs dizaines de secondes.
+Le gestionnaire:
+- précharge les modèles en arrière-plan au démarrage (ordre de première utilisation)
+- fixe le keep_alive de chaque appel selon la date de prochaine utilisation du modèle
+- lit /api/ps et décharge les modèles qui ne serviront pas bientôt quand la
+  limite mémoire (nombre de modèles ou octets) serait dépassée
+"""
+
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def model_base_name(model: str) -> str:
+    """Nom de modèle sans tag ("mistral:latest" -> "mistral")"""
+    return model.split(":")[0]
+
+
+class ModelResidencyManager:
+    """Précharge, épingle (keep_alive) et évince les modèles selon le planning des phases"""
+    
+    def __init__(
+        self,
+        client,
+        phase_models: dict,
+        max_loaded_models: Optional[int] = None,
+        max_resident_bytes: Optional[int] = None,
+        horizon: int = 2,
+        default_phase_seconds: float = 90.0,
+        min_keep_alive: int = 30,
+        max_keep_alive: int = 1800,
+        model_options: Optional[dict] = None,
+    ):
+        """
+        Args:
+            client: OllamaClient synchrone
+            phase_models: {phase: modèle} dans l'ordre d'exécution d'une itération
+            max_loaded_models: nombre max de modèles résidents (None = illimité)
+            max_resident_bytes: mémoire max occupée par les modèles (None = illimitée)
+            horizon: nombre de phases à venir dont les modèles ne sont jamais évincés
+            model_options: {modèle: options de chargement}, ex. {"codellama": {"num_ctx": 8192}}
+        """
+        self.client = client
+        self.phase_order = list(phase_models)
+        self.phase_models = {phase: model_base_name(m) for phase, m in phase_models.items()}
+        self.max_loaded_models = max_loaded_models
+        self.max_resident_bytes = max_resident_bytes
+        self.horizon = max(1, horizon)
+        self.min_keep_alive = min_keep_alive
+        self.max_keep_alive = max_keep_alive
+        self.model_options = {model_base_name(m): o for m, o in (model_options or {}).items()}
+        self.phase_seconds = {phase: default_phase_seconds for phase in self.phase_order}
+        self.model_sizes: dict[str, int] = {}
+        self.evictions = 0
+        self.preloaded: list[str] = []
+        self._active: set[str] = set()  # Phases en cours (plusieurs si exécutées en parallèle)
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(
+        cls, client, phase_models: dict, config: dict, model_options: Optional[dict] = None
+    ) -> "ModelResidencyManager":
+        """Construit le gestionnaire depuis settings.RESIDENCY_CONFIG"""
+        options = {k: v for k, v in config.items() if k != "enabled"}
+        return cls(client, phase_models, model_options=model_options, **options)
+    
+    def set_phase_order(self, order: list[str]) -> None:
+        """Met à jour l'ordre d'exécution des phases (planning de l'itération)"""
+        self._active.clear()
+        self.phase_order = [phase for phase in order if phase in self.phase_models]
+    
+    # ------------------------------------------------------------------
+    # Préchargement
+    # ------------------------------------------------------------------
+    
+    def preload(self) -> threading.Thread:
+        """Lance le préchargement des modèles en arrière-plan"""
+        thread = threading.Thread(target=self._preload_models, name="model-preload", daemon=True)
+        thread.start()
+        return thread
+    
+    def _preload_models(self) -> None:
+        for model in self._models_by_first_use():
+            with self._lock:
+                loaded = self.loaded_models()
+                if any(model_base_name(name) == model for name in loaded):
+                    continue
+                if self._at_capacity(loaded):
+                    logger.debug(f"📦 Préchargement interrompu (limite mémoire) avant {model}")
+                    return
+            
+            keep_alive = self._clamp(self._seconds_until_use(model, after_index=-1) * 1.5)
+            logger.info(f"📦 Préchargement {model} (keep_alive {keep_alive}s)")
+            if self.client.load_model(model, keep_alive=keep_alive, options=self.model_options.get(model)):
+                self.preloaded.append(model)
+    
+    def _models_by_first_use(self) -> list[str]:
+        models = []
+        for phase in self.phase_order:
+            model = self.phase_models[phase]
+            if model not in models:
+                models.append(model)
+        return models
+    
+    # ------------------------------------------------------------------
+    # Pendant l'itération
+    # ------------------------------------------------------------------
+    
+    def before_phase(self, phase: str) -> int:
+        """
+        Prépare la mémoire pour une phase et retourne le keep_alive (secondes)
+        à utiliser pour ses appels.
+        """
+        with self._lock:
+            self._evict_for(phase)
+            self._active.add(phase)
+        return self.keep_alive_for(phase)
+    
+    def record_phase(self, phase: str, seconds: float) -> None:
+        """Affine la durée estimée d'une phase (moyenne mobile exponentielle)"""
+        with self._lock:
+            self._active.discard(phase)
+        if phase in self.phase_seconds:
+            self.phase_seconds[phase] = 0.7 * self.phase_seconds[phase] + 0.3 * seconds
+    
+    def keep_alive_for(self, phase: str) -> int:
+        """Durée pendant laquelle garder le modèle de la phase après son appel"""
+        model = self.phase_models[phase]
+        index = self.phase_order.index(phase)
+        return self._clamp(self._seconds_until_use(model, after_index=index) * 1.5)
+    
+    def loaded_models(self) -> dict[str, int]:
+        """Modèles chargés selon /api/ps: {nom: taille en octets}"""
+        loaded = {}
+        for entry in self.client.list_running_models():
+            name = entry.get("name") or entry.get("model", "")
+            size = int(entry.get("size", 0) or 0)
+            loaded[name] = size
+            self.model_sizes[model_base_name(name)] = size
+        return loaded
+    
+    def stats(self) -> dict:
+        return {
+            "preloaded": list(self.preloaded),
+            "evictions": self.evictions,
+            "phase_seconds": {p: round(s, 1) for p, s in self.phase_seconds.items()},
+        }
+    
+    def _evict_for(self, phase: str) -> None:
+        if self.max_loaded_models is None and self.max_resident_bytes is None:
+            return
+        
+        model = self.phase_models[phase]
+        loaded = self.loaded_models()
+        if any(model_base_name(name) == model for name in loaded):
+            return
+        
+        needed = self._models_needed_soon(phase)
+        index = self.phase_order.index(phase)
+        candidates = sorted(
+            (name for name in loaded if model_base_name(name) not in needed),
+            key=lambda name: self._seconds_until_use(model_base_name(name), after_index=index),
+            reverse=True
+        )
+        
+        incoming = self.model_sizes.get(model, 0)
+        for name in candidates:
+            if not self._at_capacity(loaded, incoming=incoming):
+                break
+            logger.info(f"📤 Éviction de {name} (inutile avant plusieurs phases)")
+            if self.client.unload_model(name):
+                loaded.pop(name, None)
+                self.evictions += 1
+    
+    def _models_needed_soon(self, phase: str) -> set[str]:
+        index = self.phase_order.index(phase)
+        count = len(self.phase_order)
+        upcoming = {
+            self.phase_order[(index + offset) % count]
+            for offset in range(min(self.horizon, count))
+        }
+        # Jamais le modèle d'une phase encore en cours
+        return {self.phase_models[p] for p in upcoming | self._active}
+    
+    def _at_capacity(self, loaded: dict[str, int], incoming: int = 0) -> bool:
+        """Vrai si charger un modèle de plus dépasserait les limites"""
+        if self.max_loaded_models is not None and len(loaded) >= self.max_loaded_models:
+            return True
+        if self.max_resident_bytes is not None:
+            return sum(loaded.values()) + incoming > self.max_resident_bytes
+        return False
+    
+    def _seconds_until_use(self, model: str, after_index: int) -> float:
+        """Temps estimé avant la prochaine phase utilisant le modèle (planning cyclique)"""
+        count = len(self.phase_order)
+        seconds = 0.0
+        for offset in range(1, count + 1):
+            phase = self.phase_order[(after_index + offset) % count]
+            if self.phase_models[phase] == model:
+                return seconds
+            seconds += self.phase_seconds[phase]
+        return seconds
+    
+    def _clamp(self, seconds: float) -> int:
+        return int(min(self.max_keep_alive, max(self.min_keep_alive, seconds + self.min_keep_alive)))
@@ -4,61 +4,229 @@ Gère les retries, erreurs et optimisation des prompts.
 """
 
 import requests
+import contextvars
 import json
+import threading
 import time
-from typing import Optional
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import ExitStack, nullcontext
+from typing import Callable, Iterator, Optional, Union
+from dataclasses import dataclass, field
 import logging
 
+from ..utils.llm_usage import NANOSECONDS, LLMUsage
+from .concurrency import ConcurrencyGovernor
+from .endpoint_pool import Endpoint, EndpointPool
+from .resilience import ResiliencePolicy
+
 logger = logging.getLogger(__name__)
 
 
+class OllamaError(Exception):
+    """Erreur de communication avec Ollama"""
+
+
+class OllamaTimeoutError(OllamaError):
+    """Ollama n'a pas répondu dans le délai imparti"""
+
+
+class OllamaConnectionError(OllamaError):
+    """Ollama injoignable"""
+
+
+class OllamaHTTPError(OllamaError):
+    """Réponse HTTP en erreur"""
+    
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Status {status_code}: {message}")
+        self.status_code = status_code
+    
+    @property
+    def retryable(self) -> bool:
+        """Erreurs serveur et surcharge (429) seulement: un 404 (modèle absent) ne passera pas au retry"""
+        return self.status_code >= 500 or self.status_code == 429
+
+
+class OllamaUnavailableError(OllamaError):
+    """Circuit ouvert: Ollama est considéré indisponible, l'appel n'est pas tenté"""
+
+
 @dataclass
 class OllamaConfig:
     """Configuration pour Ollama"""
     base_url: str = "http://localhost:11434"
     timeout: int = 300
-    max_retries: int = 3
+    max_retries: int = 3  # Tentatives par appel (première comprise), au moins 1
     retry_delay: float = 2.0
+    pool_size: int = 20  # Connexions HTTP simultanées max (client asynchrone)
+    pool_keepalive: int = 10  # Connexions gardées ouvertes entre deux appels
+    keepalive_expiry: float = 30.0
+    min_timeout: float = 30.0  # Plancher du timeout adaptatif (timeout sert de plafond)
+    timeout_multiplier: float = 3.0  # Timeout = p95 des latences observées x multiplicateur
+    backoff_cap: float = 30.0  # Délai max entre deux tentatives (backoff exponentiel + jitter)
+    retry_budget_ratio: float = 0.2  # Retries autorisés par requête (fenêtre glissante d'une minute)
+    retry_budget_min: int = 3
+    breaker_threshold: int = 5  # Échecs consécutifs avant ouverture du circuit (par nœud)
+    breaker_reset_seconds: float = 30.0
+    endpoints: list = field(default_factory=list)  # Nœuds Ollama du pool (vide = base_url seul)
+    cold_model_penalty: float = 2.0  # Routage: un chargement à froid "coûte" autant de requêtes en cours
+    health_check_interval: float = 30.0  # Secondes entre deux sondes /api/ps des nœuds
+    hedge_percentile: Optional[float] = None  # Requête doublée sur un 2e nœud au-delà de ce percentile (ex: 0.9)
+    parallel_slots: int = 0  # Appels simultanés max par nœud et modèle (OLLAMA_NUM_PARALLEL), 0 = pas de plafond
+    model_slots: dict = field(default_factory=dict)  # Plafonds spécifiques {modèle: créneaux}
+    
+    def __post_init__(self):
+        if self.max_retries < 1:
+            raise ValueError(f"max_retries doit valoir au moins 1 (reçu: {self.max_retries})")
+
+
+@dataclass
+class GenerationResult:
+    """Réponse complète de /api/generate"""
+    text: str
+    context: list = field(default_factory=list)  # État de conversation renvoyé par Ollama
+    usage: LLMUsage = field(default_factory=LLMUsage)  # Compteurs et durées (vide si servi par le cache)
+
+
+def generation_options(
+    temperature: float,
+    top_p: Optional[float] = None,
+    top_k: Optional[int] = None,
+    seed: Optional[int] = None,
+    options: Optional[dict] = None,
+) -> dict:
+    """
+    Champ options d'une requête Ollama: échantillonnage puis profil de
+    l'appel (num_predict, num_ctx, num_thread, stop...), sans les valeurs
+    vides. Ollama ignore ces paramètres hors de options.
+    """
+    merged = {"temperature": temperature, "top_p": top_p, "top_k": top_k, "seed": seed, **(options or {})}
+    return {name: value for name, value in merged.items() if value is not None and value != []}
+
+
+def early_stop_message(model: str, eval_count: int, started: float, first_chunk: Optional[float]) -> dict:
+    """
+    Dernier message d'un flux interrompu par stop_when (Ollama n'envoie pas
+    le sien): tokens reçus et durées mesurées côté client.
+    """
+    now = time.perf_counter()
+    return {
+        "model": model,
+        "done": True,
+        "done_reason": "early_stop",
+        "eval_count": eval_count,
+        "eval_duration": int((now - (first_chunk or now)) * NANOSECONDS),
+        "total_duration": int((now - started) * NANOSECONDS),
+    }
+
+
+def resolve_model_digest(digests: dict[str, str], model: str) -> str:
+    """Digest d'un modèle depuis /api/tags ("mistral" correspond à "mistral:latest")"""
+    for name in (model, f"{model}:latest"):
+        if digests.get(name):
+            return digests[name]
+    return model
 
 
 class OllamaClient:
-    """Client pour interagir avec Ollama"""
+    """
+    Client pour interagir avec Ollama.
+    
+    Avec un ResponseCache, generate et stream_generate servent depuis le disque
+    les appels déjà effectués (même modèle, prompt et paramètres).
+    
+    Les appels de génération suivent une ResiliencePolicy (timeouts adaptatifs,
+    backoff avec jitter, budget de retries, circuit breaker) et lèvent une
+    OllamaError typée en cas d'échec.
+    
+    Avec plusieurs nœuds (config.endpoints), chaque génération part sur le
+    nœud le moins chargé de l'EndpointPool, les retries sur un autre nœud, et
+    une requête lente peut être doublée (hedge_percentile).
+    
+    Avec parallel_slots (ou un ConcurrencyGovernor partagé), les appels au-delà
+    des créneaux d'un nœud attendent leur tour dans une file locale.
     
-    def __init__(self, config: Optional[OllamaConfig] = None):
+    Avec une Cassette, tout le trafic HTTP est enregistré (record) ou servi
+    depuis la cassette sans contacter Ollama (replay).
+    """
+    
+    def __init__(
+        self,
+        config: Optional[OllamaConfig] = None,
+        cache=None,
+        resilience=None,
+        pool=None,
+        governor=None,
+        cassette=None,
+    ):
         self.config = config or OllamaConfig()
         self.session = requests.Session()
+        self.cassette = cassette
+        if cassette is not None:
+            adapter = cassette.adapter()
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
         self.models_cache: list[str] = []
-        
+        self.model_digests: Optional[dict[str, str]] = None
+        self.cache = cache
+        self.resilience = resilience or ResiliencePolicy(self.config)
+        self.pool = pool or EndpointPool.from_config(self.config, self.resilience.breaker)
+        self.governor = governor or ConcurrencyGovernor.from_config(self.config)
+    
+    @property
+    def base_url(self) -> str:
+        """Nœud des appels d'administration (tags, ps, pull, chargement)"""
+        return self.pool.primary.url
+    
     def check_connection(self) -> bool:
-        """Vérifie que Ollama est disponible"""
-        try:
-            response = self.session.get(
-                f"{self.config.base_url}/api/tags",
-                timeout=5
-            )
-            return response.status_code == 200
-        except Exception as e:
-            logger.error(f"❌ Ollama non disponible: {e}")
-            return False
+        """Vérifie que Ollama est disponible (au moins un nœud du pool)"""
+        for endpoint in self.pool.endpoints:
+            try:
+                response = self.session.get(
+                    f"{endpoint.url}/api/tags",
+                    timeout=5
+                )
+                if response.status_code == 200:
+                    return True
+            except Exception as e:
+                logger.error(f"❌ Ollama non disponible ({endpoint.url}): {e}")
+        return False
+    
+    def probe_endpoints(self) -> None:
+        """Sonde /api/ps sur chaque nœud: santé et modèles résidents"""
+        for endpoint in self.pool.endpoints:
+            try:
+                response = self.session.get(f"{endpoint.url}/api/ps", timeout=5)
+                running = response.json().get("models", []) if response.status_code == 200 else None
+            except (requests.RequestException, ValueError):
+                running = None
+            self.pool.record_probe(endpoint, running)
     
     def get_available_models(self) -> list[str]:
         """Récupère les modèles disponibles"""
         try:
             response = self.session.get(
-                f"{self.config.base_url}/api/tags",
+                f"{self.base_url}/api/tags",
                 timeout=10
             )
             if response.status_code == 200:
                 data = response.json()
                 models = [m["name"].split(":")[0] for m in data.get("models", [])]
                 self.models_cache = models
+                self.model_digests = {m["name"]: m.get("digest", "") for m in data.get("models", [])}
                 return models
             return []
         except Exception as e:
             logger.error(f"Erreur récupération modèles: {e}")
             return self.models_cache
     
+    def get_model_digest(self, model: str) -> str:
+        """Digest des poids du modèle (à défaut, son nom)"""
+        if self.model_digests is None:
+            self.model_digests = {}
+            self.get_available_models()
+        return resolve_model_digest(self.model_digests, model)
+    
     def generate(
         self,
         model: str,
@@ -66,83 +234,512 @@ class OllamaClient:
         temperature: float = 0.7,
         top_p: float = 0.9,
         top_k: int = 40,
+        keep_alive: Optional[int] = None,
+        seed: Optional[int] = None,
+        options: Optional[dict] = None,
+        format: Optional[Union[str, dict]] = None,
     ) -> str:
         """
         Génère du texte avec le modèle spécifié.
         Avec retry automatique en cas d'erreur.
+        keep_alive (secondes) fixe la durée de résidence du modèle après l'appel.
+        options complète les paramètres d'échantillonnage (num_predict, num_ctx, stop...).
+        format ("json" ou schéma JSON) contraint la réponse à un JSON valide.
+        """
+        return self.generate_result(
+            model, prompt, temperature, top_p, top_k,
+            keep_alive=keep_alive, seed=seed, options=options, format=format
+        ).text
+    
+    def generate_result(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        top_k: int = 40,
+        keep_alive: Optional[int] = None,
+        seed: Optional[int] = None,
+        context: Optional[list] = None,
+        options: Optional[dict] = None,
+        format: Optional[Union[str, dict]] = None,
+    ) -> GenerationResult:
         """
+        Comme generate, en retournant aussi le context Ollama.
+        Avec context (issu d'un appel précédent), le prompt prolonge la
+        conversation sans ré-encoder les échanges déjà traités; ces appels
+        ne passent pas par le cache.
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "options": generation_options(temperature, top_p, top_k, seed, options),
+        }
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        if context:
+            payload["context"] = context
+        if format:
+            payload["format"] = format
+        
+        cache_key = None if context else self._cache_key(model, prompt, payload["options"], format)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"💾 Réponse {model} servie depuis le cache")
+                return GenerationResult(cached)
+        
+        policy = self.resilience
+        endpoint = self._choose_endpoint(model)
+        policy.retry_budget.record_request()
+        timeout = policy.latency.timeout_for(model)
+        tried: set[str] = set()
+        
         for attempt in range(self.config.max_retries):
             try:
+                result = self._hedged_generate(endpoint, model, payload, timeout)
+                text = result.get("response", "").strip()
+                if cache_key:
+                    self.cache.put(cache_key, model, text)
+                return GenerationResult(text, result.get("context") or [], LLMUsage.from_response(result))
+            
+            except OllamaHTTPError as e:
+                if not e.retryable:
+                    raise
+                error = e
+            except OllamaTimeoutError as e:
+                error = e
+                timeout = min(policy.latency.default_timeout, timeout * 2)
+            except OllamaError as e:
+                error = e
+            
+            logger.warning(f"{error} (tentative {attempt + 1}/{self.config.max_retries})")
+            if attempt == self.config.max_retries - 1 or not policy.retry_budget.try_spend():
+                break
+            time.sleep(policy.next_delay(attempt))
+            tried.add(endpoint.url)
+            endpoint = self._choose_endpoint(model, exclude=tried)
+        
+        logger.error(f"❌ Impossible de générer avec {model}: {error}")
+        raise error
+    
+    def _hedged_generate(self, endpoint: Endpoint, model: str, payload: dict, timeout: float) -> dict:
+        """
+        Génération couverte: si endpoint n'a pas répondu au bout du percentile
+        hedge_percentile des latences du modèle, la même requête part sur un
+        second nœud. La première réponse gagne, l'autre génération est
+        abandonnée (connexion fermée au chunk suivant).
+        """
+        delay = None
+        if self.config.hedge_percentile and len(self.pool) > 1:
+            delay = self.resilience.latency.latency_percentile(model, self.config.hedge_percentile)
+        if delay is None:
+            with self.pool.track(endpoint):
+                return self._post_generate(endpoint, model, payload, timeout)
+        
+        cancel = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ollama-hedge")
+        
+        def submit(target: Endpoint):
+            self.pool.acquire(target)
+            future = executor.submit(
+                contextvars.copy_context().run,  # Run courant (gouverneur de concurrence)
+                self._post_generate, target, model, payload, timeout, cancel
+            )
+            future.add_done_callback(lambda _: self.pool.release(target))
+            futures[future] = target
+        
+        futures = {}
+        try:
+            submit(endpoint)
+            done, _ = wait(futures, timeout=delay)
+            if not done:
+                backup = self.pool.choose(model, exclude={endpoint.url})
+                if backup is not None:
+                    logger.debug(f"⏱️ {model}: pas de réponse de {endpoint.url} après {delay:.1f}s, doublée sur {backup.url}")
+                    self.pool.record_hedge()
+                    submit(backup)
+            
+            pending, error = set(futures), None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except OllamaError as e:
+                        error = error or e
+                        continue
+                    if len(futures) > 1:
+                        self.pool.record_hedge(futures[future])
+                    return result
+            raise error
+        finally:
+            cancel.set()
+            executor.shutdown(wait=False)
+    
+    def _post_generate(
+        self,
+        endpoint: Endpoint,
+        model: str,
+        payload: dict,
+        timeout: float,
+        cancel: Optional[threading.Event] = None,
+    ) -> Optional[dict]:
+        """
+        POST /api/generate sur un nœud (déjà compté comme occupé par
+        l'appelant), avec mise à jour du circuit et des modèles résidents.
+        Lève une OllamaError typée en cas d'échec.
+        Avec cancel, la réponse est lue en flux et l'appel retourne None dès
+        que cancel est positionné.
+        """
+        with self._slot(endpoint, model):
+            if cancel is not None and cancel.is_set():
+                return None
+            return self._send_generate(endpoint, model, payload, timeout, cancel)
+    
+    def _send_generate(
+        self,
+        endpoint: Endpoint,
+        model: str,
+        payload: dict,
+        timeout: float,
+        cancel: Optional[threading.Event],
+    ) -> Optional[dict]:
+        started = time.monotonic()
+        try:
+            if cancel is None:
                 response = self.session.post(
-                    f"{self.config.base_url}/api/generate",
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "temperature": temperature,
-                        "top_p": top_p,
-                        "top_k": top_k,
-                        "stream": False,
-                    },
-                    timeout=self.config.timeout,
+                    f"{endpoint.url}/api/generate",
+                    json=payload,
+                    timeout=timeout,
                 )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get("response", "").strip()
-                else:
-                    logger.warning(f"Status {response.status_code}: {response.text}")
-                    
-            except requests.Timeout:
-                logger.warning(f"Timeout tentative {attempt + 1}/{self.config.max_retries}")
-            except requests.ConnectionError:
-                logger.warning(f"Connexion échouée tentative {attempt + 1}/{self.config.max_retries}")
-            except Exception as e:
-                logger.error(f"Erreur génération: {e}")
-            
-            if attempt < self.config.max_retries - 1:
-                time.sleep(self.config.retry_delay)
+                if response.status_code != 200:
+                    raise OllamaHTTPError(response.status_code, response.text)
+                result = response.json()
+            else:
+                result = self._read_until_done(endpoint, payload, timeout, cancel)
+                if result is None:
+                    return None
+        
+        except requests.Timeout as e:
+            self.pool.record_failure(endpoint)
+            raise OllamaTimeoutError(f"{model}: pas de réponse de {endpoint.url} en {timeout:.0f}s") from e
+        except requests.ConnectionError as e:
+            self.pool.record_failure(endpoint, unreachable=True)
+            raise OllamaConnectionError(f"Ollama injoignable ({endpoint.url}): {e}") from e
+        except requests.RequestException as e:
+            self.pool.record_failure(endpoint)
+            raise OllamaConnectionError(f"Réponse interrompue par {endpoint.url}: {e}") from e
+        except OllamaHTTPError as e:
+            if e.retryable:
+                self.pool.record_failure(endpoint)
+            raise
+        except OllamaError:
+            self.pool.record_failure(endpoint)
+            raise
+        except ValueError as e:
+            self.pool.record_failure(endpoint)
+            raise OllamaError(f"Réponse invalide: {e}") from e
         
-        logger.error(f"❌ Impossible de générer après {self.config.max_retries} tentatives")
-        return ""
+        self.resilience.latency.record(model, time.monotonic() - started)
+        self.pool.record_success(endpoint, model)
+        return result
+    
+    def _read_until_done(
+        self,
+        endpoint: Endpoint,
+        payload: dict,
+        timeout: float,
+        cancel: threading.Event,
+    ) -> Optional[dict]:
+        """Génération lue en flux puis réassemblée (dernier message + texte complet), None si annulée"""
+        parts: list[str] = []
+        with self.session.post(
+            f"{endpoint.url}/api/generate",
+            json={**payload, "stream": True},
+            timeout=timeout,
+            stream=True,
+        ) as response:
+            if response.status_code != 200:
+                raise OllamaHTTPError(response.status_code, response.text)
+            for line in response.iter_lines():
+                if cancel.is_set():
+                    return None
+                if not line:
+                    continue
+                data = json.loads(line)
+                if "error" in data:
+                    raise OllamaError(data["error"])
+                parts.append(data.get("response", ""))
+                if data.get("done"):
+                    return {**data, "response": "".join(parts)}
+        raise OllamaError(f"Flux interrompu par {endpoint.url} avant la fin de la génération")
     
     def stream_generate(
         self,
         model: str,
         prompt: str,
         temperature: float = 0.7,
-    ) -> str:
-        """Génère du texte en streaming (pour affichage progressif)"""
+        keep_alive: Optional[int] = None,
+        seed: Optional[int] = None,
+        context: Optional[list] = None,
+        on_done: Optional[Callable[[dict], None]] = None,
+        options: Optional[dict] = None,
+        format: Optional[Union[str, dict]] = None,
+        stop_when: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[str]:
+        """
+        Génère du texte en streaming (pour affichage progressif).
+        Les chunks sont transmis tels quels: l'assemblage est laissé à
+        l'appelant. L'ouverture du flux (jusqu'au premier chunk) est relancée comme
+        generate_result; un flux qui échoue ensuite lève OllamaError.
+        on_done reçoit le dernier message du flux (context, compteurs...).
+        stop_when, vérifié après chaque chunk transmis, interrompt la génération
+        (connexion fermée) dès que la suite est inutile: on_done reçoit alors
+        un message done_reason "early_stop"; le texte reçu est transmis à
+        l'appelant mais jamais écrit dans le cache des réponses (incomplet).
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "options": generation_options(temperature, seed=seed, options=options),
+        }
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        if context:
+            payload["context"] = context
+        if format:
+            payload["format"] = format
+        
+        cache_key = None if context else self._cache_key(model, prompt, payload["options"], format)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"💾 Réponse {model} servie depuis le cache")
+                yield cached
+                return
+        chunks: list[str] = []
+        received = 0
+        stopped = False  # Flux coupé par stop_when: réponse incomplète, jamais mise en cache
+        started, first_chunk = time.perf_counter(), None
+        endpoint, stream, data, messages = self._open_stream(model, payload)
+        
+        with stream:
+            try:
+                while data is not None:
+                    chunk = data.get("response", "")
+                    if cache_key:
+                        chunks.append(chunk)
+                    received += 1
+                    first_chunk = first_chunk or time.perf_counter()
+                    yield chunk
+                    if data.get("done") and on_done:
+                        on_done(data)
+                    if stop_when is not None and not data.get("done") and stop_when():
+                        # Quitter le bloc ferme la connexion: Ollama abandonne la génération
+                        logger.debug(f"✂️  {model}: génération interrompue après {received} chunks")
+                        if on_done:
+                            on_done(early_stop_message(model, received, started, first_chunk))
+                        stopped = True
+                        break
+                    data = next(messages, None)
+            except Exception as e:
+                # Chunks déjà transmis à l'appelant: le flux n'est pas relancé
+                error = self._stream_error(endpoint, model, e)
+                logger.error(f"Erreur streaming: {error}")
+                raise error
+        
+        self.pool.record_success(endpoint, model)
+        if cache_key and not stopped:
+            self.cache.put(cache_key, model, "".join(chunks).strip())
+    
+    def _open_stream(self, model: str, payload: dict) -> tuple:
+        """
+        Ouvre le flux de /api/generate avec la politique de generate_result
+        (timeout adaptatif, retries avec backoff et budget, changement de
+        nœud) jusqu'au premier message reçu. Retourne (nœud, ExitStack à
+        fermer, premier message, itérateur des messages suivants).
+        """
+        policy = self.resilience
+        endpoint = self._choose_endpoint(model)
+        policy.retry_budget.record_request()
+        timeout = policy.latency.timeout_for(model)
+        tried: set[str] = set()
+        
+        for attempt in range(self.config.max_retries):
+            stream = ExitStack()
+            try:
+                stream.enter_context(self.pool.track(endpoint))
+                stream.enter_context(self._slot(endpoint, model))
+                started = time.monotonic()
+                response = stream.enter_context(self.session.post(
+                    f"{endpoint.url}/api/generate",
+                    json=payload,
+                    timeout=timeout,
+                    stream=True,
+                ))
+                if response.status_code != 200:
+                    raise OllamaHTTPError(response.status_code, response.text)
+                messages = self._stream_messages(response, model, started)
+                stream.callback(messages.close)
+                first = next(messages, None)
+                if first is None:
+                    raise OllamaError(f"Flux vide reçu de {endpoint.url}")
+                return endpoint, stream, first, messages
+            
+            except Exception as e:
+                stream.close()
+                error = self._stream_error(endpoint, model, e)
+                if isinstance(error, OllamaHTTPError) and not error.retryable:
+                    logger.error(f"Erreur streaming: {error}")
+                    raise error
+                if isinstance(error, OllamaTimeoutError):
+                    timeout = min(policy.latency.default_timeout, timeout * 2)
+            except BaseException:
+                stream.close()
+                raise
+            
+            logger.warning(f"{error} (tentative {attempt + 1}/{self.config.max_retries})")
+            if attempt == self.config.max_retries - 1 or not policy.retry_budget.try_spend():
+                break
+            time.sleep(policy.next_delay(attempt))
+            tried.add(endpoint.url)
+            endpoint = self._choose_endpoint(model, exclude=tried)
+        
+        logger.error(f"❌ Impossible d'ouvrir le flux {model}: {error}")
+        raise error
+    
+    def _stream_messages(self, response, model: str, started: float) -> Iterator[dict]:
+        """Messages JSON du flux; la durée d'une génération menée à terme alimente le timeout adaptatif"""
+        for line in response.iter_lines():
+            if not line:
+                continue
+            data = json.loads(line)
+            if "error" in data:
+                raise OllamaError(data["error"])
+            if data.get("done"):
+                self.resilience.latency.record(model, time.monotonic() - started)
+            yield data
+    
+    def _stream_error(self, endpoint: Endpoint, model: str, error: Exception) -> OllamaError:
+        """OllamaError typée correspondant à une erreur du flux (échec compté sur le nœud)"""
+        if isinstance(error, OllamaError):
+            if not isinstance(error, OllamaHTTPError) or error.retryable:
+                self.pool.record_failure(endpoint)
+            return error
+        if isinstance(error, requests.Timeout):
+            self.pool.record_failure(endpoint)
+            typed = OllamaTimeoutError(f"{model}: flux interrompu ({error})")
+        elif isinstance(error, requests.ConnectionError):
+            self.pool.record_failure(endpoint, unreachable=True)
+            typed = OllamaConnectionError(f"Ollama injoignable ({endpoint.url}): {error}")
+        elif isinstance(error, requests.RequestException):
+            self.pool.record_failure(endpoint)
+            typed = OllamaConnectionError(f"Flux interrompu par {endpoint.url}: {error}")
+        elif isinstance(error, ValueError):
+            self.pool.record_failure(endpoint)
+            typed = OllamaError(f"Réponse invalide: {error}")
+        else:
+            typed = OllamaError(str(error))
+        typed.__cause__ = error
+        return typed
+    
+    def _slot(self, endpoint: Endpoint, model: str):
+        """Créneau d'appel du gouverneur de concurrence (sans gouverneur: aucun plafond)"""
+        return self.governor.slot(endpoint.url, model) if self.governor else nullcontext()
+    
+    def _choose_endpoint(self, model: str, exclude: set = frozenset()) -> Endpoint:
+        """
+        Nœud de l'appel (de préférence hors exclude). Sonde les nœuds en
+        arrière-plan quand c'est dû; échoue immédiatement si tous les
+        circuits sont ouverts.
+        """
+        if self.pool.probe_due():
+            threading.Thread(target=self.probe_endpoints, name="ollama-probe", daemon=True).start()
+        endpoint = self.pool.choose(model, exclude)
+        if endpoint is None and exclude:
+            endpoint = self.pool.choose(model)
+        if endpoint is None:
+            retry_after = min(e.breaker.retry_after() for e in self.pool.endpoints)
+            raise OllamaUnavailableError(
+                f"Ollama indisponible (circuit ouvert, nouvel essai dans {retry_after:.0f}s)"
+            )
+        return endpoint
+    
+    def _cache_key(
+        self, model: str, prompt: str, options: dict, format: Optional[Union[str, dict]] = None
+    ) -> Optional[str]:
+        """Clé de cache de l'appel (None si pas de cache ou appel non cacheable)"""
+        if self.cache is None or not self.cache.is_cacheable(options):
+            return None
+        params = {**options, "format": format} if format else options
+        return self.cache.make_key(self.get_model_digest(model), prompt, params)
+    
+    def embed(self, model: str, text: str) -> list[float]:
+        """Vecteur d'embedding du texte (/api/embeddings), liste vide en cas d'erreur"""
+        endpoint = self.pool.choose(model) or self.pool.primary
         try:
             response = self.session.post(
-                f"{self.config.base_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "temperature": temperature,
-                    "stream": True,
-                },
+                f"{endpoint.url}/api/embeddings",
+                json={"model": model, "prompt": text},
+                timeout=60,
+            )
+            if response.status_code == 200:
+                return response.json().get("embedding", [])
+            logger.warning(f"Status {response.status_code}: {response.text}")
+            return []
+        except Exception as e:
+            logger.error(f"Erreur embeddings: {e}")
+            return []
+    
+    def list_running_models(self) -> list[dict]:
+        """Modèles actuellement chargés en mémoire (/api/ps: name, size, expires_at...)"""
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/ps",
+                timeout=10
+            )
+            if response.status_code == 200:
+                return response.json().get("models", [])
+            return []
+        except Exception as e:
+            logger.error(f"Erreur récupération modèles chargés: {e}")
+            return []
+    
+    def load_model(self, model: str, keep_alive: Optional[int] = None, options: Optional[dict] = None) -> bool:
+        """
+        Charge un modèle en mémoire sans générer (prompt vide).
+        options doit reprendre le num_ctx des appels à venir: Ollama recharge
+        le modèle quand il change.
+        """
+        payload = {"model": model}
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        if options:
+            payload["options"] = options
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
                 timeout=self.config.timeout,
-                stream=True,
             )
-            
-            full_response = ""
-            for line in response.iter_lines():
-                if line:
-                    data = json.loads(line)
-                    chunk = data.get("response", "")
-                    full_response += chunk
-                    yield chunk
-                    
+            return response.status_code == 200
         except Exception as e:
-            logger.error(f"Erreur streaming: {e}")
-            yield ""
+            logger.error(f"Erreur chargement {model}: {e}")
+            return False
+    
+    def unload_model(self, model: str) -> bool:
+        """Décharge immédiatement un modèle (keep_alive=0)"""
+        return self.load_model(model, keep_alive=0)
     
     def pull_model(self, model_name: str) -> bool:
         """Télécharge un modèle (si disponible)"""
         try:
             logger.info(f"📥 Téléchargement du modèle {model_name}...")
             response = self.session.post(
-                f"{self.config.base_url}/api/pull",
+                f"{self.base_url}/api/pull",
                 json={"name": model_name},
                 timeout=3600,  # 1 heure max
             )
@@ -159,7 +756,7 @@ class OllamaClient:
                 return {
                     "status": "error",
                     "message": "Ollama non accessible",
-                    "url": self.config.base_url
+                    "url": self.base_url
                 }
             
             models = self.get_available_models()
@@ -167,7 +764,7 @@ class OllamaClient:
                 "status": "ok",
                 "models_available": len(models),
                 "models": models[:5] if models else [],
-                "url": self.config.base_url
+                "url": self.base_url
             }
         except Exception as e:
             return {"status": "error", "message": str(e)}
@@ -3,10 +3,17 @@ Orchestrateur principal qui coordonne tous les agents.
 Gère la boucle itérative avec critères d'arrêt intelligents.
 """
 
-from dataclasses import dataclass, field
-from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields, replace
+from typing import Callable, Optional
+import asyncio
+import contextvars
+import functools
 import logging
 import json
+import time
+import uuid
 from pathlib import Path
 from datetime import datetime
 
@@ -17,9 +24,25 @@ from ..agents import (
     SecurityAgent,
     TesterAgent,
     DocumentationAgent,
-    AgentOutput
+    AgentOutput,
+    AgentSession
 )
-from ..config.settings import SCORE_WEIGHTS, STOP_CRITERIA, AGENT_MODELS
+from ..utils.code_patch import PatchError
+from ..utils.llm_usage import LLMUsage, UsageAggregator
+from ..utils.streaming import StreamEvent
+from ..config.settings import (
+    SCORE_WEIGHTS, STOP_CRITERIA, AGENT_MODELS, RESIDENCY_CONFIG, SESSION_CONFIG, PHASE_PARALLELISM,
+    ARCHITECTURE_REUSE, CODE_REFINEMENT, CANDIDATE_SEARCH, CHECKPOINT
+)
+from .architecture_policy import REFINE, REUSE, ArchitecturePolicy
+from .candidate_search import CandidateSearch
+from .checkpoint import Checkpoint, int_keys, restore, snapshot
+from .code_refinement import FALLBACK, FULL, PATCH, CodeRefiner
+from .concurrency import RunContext, current_run, run_context
+from .model_residency import ModelResidencyManager
+from .ollama_client import OllamaError, OllamaUnavailableError
+from .phase_graph import GraphRun, PhaseGraph
+from .phase_scheduler import PhaseScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +53,10 @@ class IterationMetrics:
     iteration: int
     timestamp: str
     architect_output: Optional[AgentOutput] = None
+    architecture_action: str = ""  # generate / refine / refresh / reuse (ArchitecturePolicy)
     developer_output: Optional[AgentOutput] = None
+    code_update: str = ""  # full / patch / fallback (CodeRefiner)
+    code_patch: dict = field(default_factory=dict)  # PatchStats du correctif appliqué
     reviewer_score: Optional[float] = None
     security_score: Optional[float] = None
     tester_output: Optional[AgentOutput] = None
@@ -38,6 +64,13 @@ class IterationMetrics:
     overall_score: float = 0.0
     issues_count: int = 0
     improvements: list = field(default_factory=list)
+    phase_order: list = field(default_factory=list)
+    model_swaps: int = 0
+    prefix_reuse: dict = field(default_factory=dict)  # {phase: part du prompt réutilisable}
+    prompt_dropped: dict = field(default_factory=dict)  # {phase: {section: tokens omis}}
+    early_stop: dict = field(default_factory=dict)  # {phase: tokens et secondes économisés}
+    phase_timing: dict = field(default_factory=dict)  # Chronologie des phases (GraphRun.to_dict)
+    llm_usage: dict = field(default_factory=dict)  # {phase: compteurs Ollama réels}
     
     def to_dict(self):
         return {
@@ -47,14 +80,135 @@ class IterationMetrics:
             "reviewer_score": self.reviewer_score,
             "security_score": self.security_score,
             "issues_count": self.issues_count,
-            "improvements": self.improvements
+            "improvements": self.improvements,
+            "phase_order": self.phase_order,
+            "architecture_action": self.architecture_action,
+            "code_update": self.code_update,
+            "code_patch": self.code_patch,
+            "model_swaps": self.model_swaps,
+            "prefix_reuse": self.prefix_reuse,
+            "prompt_dropped": self.prompt_dropped,
+            "early_stop": self.early_stop,
+            "phase_timing": self.phase_timing,
+            "llm_usage": self.llm_usage
+        }
+    
+    def to_state(self) -> dict:
+        """État complet (sorties des agents comprises), pour un checkpoint"""
+        state = {f.name: getattr(self, f.name) for f in fields(self)}
+        for name in _OUTPUT_FIELDS:
+            state[name] = state[name].to_dict() if state[name] is not None else None
+        return state
+    
+    @classmethod
+    def from_state(cls, state: dict) -> "IterationMetrics":
+        """Inverse de to_state()"""
+        outputs = {
+            name: AgentOutput.from_dict(state[name]) if state.get(name) else None
+            for name in _OUTPUT_FIELDS
         }
+        return cls(**{**state, **outputs})
+
+
+# Champs d'IterationMetrics contenant une sortie d'agent
+_OUTPUT_FIELDS = ("architect_output", "developer_output", "tester_output", "documentation_output")
+
+
+# Phases d'une itération, dans l'ordre d'exécution
+PHASES = (
+    ("architect", "👨‍💼 Phase 1: Architecture..."),
+    ("developer", "👨‍💻 Phase 2: Développement..."),
+    ("reviewer", "🔍 Phase 3: Revue qualité..."),
+    ("security", "🔒 Phase 4: Audit sécurité..."),
+    ("tester", "✅ Phase 5: Génération tests..."),
+    ("documentation", "📚 Phase 6: Documentation..."),
+)
+PHASE_LABELS = dict(PHASES)
+
+# Sorties consommées par chaque phase (contraintes d'ordonnancement)
+PHASE_DEPENDENCIES = {
+    "architect": (),
+    "developer": ("architect",),
+    "reviewer": ("architect", "developer"),
+    "security": ("developer",),
+    "tester": ("developer",),
+    "documentation": ("architect", "developer"),
+}
+
+
+def _run_parallel(calls: list) -> list:
+    """Résultats de calls (fonctions sans argument), exécutées simultanément dans des threads"""
+    if len(calls) < 2:
+        return [call() for call in calls]
+    with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="candidate") as executor:
+        # Chaque appel garde le contexte (run courant pour le gouverneur)
+        futures = [executor.submit(contextvars.copy_context().run, call) for call in calls]
+        return [future.result() for future in futures]
+
+
+def _total_usage(outputs: list) -> Optional[LLMUsage]:
+    """Compteurs cumulés des sorties (None si aucune n'en a)"""
+    usages = [output.usage for output in outputs if output.usage is not None]
+    if not usages:
+        return None
+    total = LLMUsage()
+    for usage in usages:
+        total.add(usage)
+    return total
 
 
 class MultiAgentOrchestrator:
     """
     Orchestrateur principal coordonnant tous les agents.
     Gère la boucle itérative avec 15 itérations max.
+    
+    run() exécute la boucle de façon synchrone; arun() en est l'équivalent
+    asyncio, basé sur AsyncOllamaClient.
+    
+    Avec enable_streaming, les agents reçoivent leurs réponses en streaming et
+    les événements parsés (score, problèmes...) sont diffusés aux listeners
+    enregistrés via add_stream_listener pendant la génération.
+    
+    Avec manage_residency, un ModelResidencyManager précharge les modèles,
+    ajuste leur keep_alive et évince ceux qui ne serviront pas bientôt.
+    
+    Avec schedule_by_model, les phases d'une itération sont réordonnées (dans
+    le respect de PHASE_DEPENDENCIES) pour enchaîner les appels à un même
+    modèle et limiter les rechargements.
+    
+    Avec semantic_cache (SemanticCache), les agents configurés réutilisent la
+    réponse d'un prompt quasi identique déjà traité.
+    
+    Avec parallel_phases, les phases indépendantes d'une itération (revue,
+    sécurité, tests, documentation) tournent simultanément selon
+    PHASE_DEPENDENCIES, dans la limite des créneaux Ollama disponibles
+    (settings.PHASE_PARALLELISM); l'ordre planifié sert de priorité.
+    
+    Avec reuse_architecture, l'architecture est conservée d'une itération à
+    l'autre: l'Architecte n'est rappelé que pour réviser l'architecture sur
+    problèmes architecturaux signalés, ou sur calendrier (ARCHITECTURE_REUSE).
+    
+    Avec refine_code, tant que l'architecture est conservée, le Développeur
+    corrige le code existant par diffs à partir des problèmes signalés, au
+    lieu de le régénérer (CODE_REFINEMENT); un correctif inapplicable
+    déclenche une régénération complète.
+    
+    Avec search_candidates, quand des créneaux Ollama sont libres, le
+    Développeur produit plusieurs candidats en parallèle (températures et
+    seeds différents); un pré-score local choisit ceux qui passent en revue
+    et le mieux noté est conservé (CANDIDATE_SEARCH).
+    
+    Avec checkpoint, l'état du run est écrit dans output_dir après chaque
+    phase terminée; resume() le restaure pour continuer un run interrompu
+    sans relancer les appels déjà faits.
+    
+    Avec use_sessions, les agents listés dans SESSION_CONFIG conservent le
+    context Ollama d'une itération à l'autre et n'envoient que les entrées
+    modifiées.
+    
+    run_id et priority identifient le run auprès du ConcurrencyGovernor du
+    client: plusieurs orchestrateurs partageant un client se répartissent ses
+    créneaux équitablement, les priorités hautes d'abord.
     """
     
     def __init__(
@@ -62,9 +216,24 @@ class MultiAgentOrchestrator:
         ollama_client,
         max_iterations: int = 15,
         quality_threshold: float = 90.0,
-        output_dir: str = "./outputs"
+        output_dir: str = "./outputs",
+        async_client=None,
+        enable_streaming: bool = False,
+        manage_residency: bool = False,
+        schedule_by_model: bool = True,
+        semantic_cache=None,
+        use_sessions: bool = False,
+        parallel_phases: bool = False,
+        reuse_architecture: bool = True,
+        refine_code: bool = True,
+        search_candidates: bool = False,
+        checkpoint: bool = False,
+        run_id: Optional[str] = None,
+        priority: int = 0
     ):
         self.ollama_client = ollama_client
+        self.run_id = run_id or f"run-{uuid.uuid4().hex[:8]}"
+        self.priority = priority
         self.max_iterations = max_iterations
         self.quality_threshold = quality_threshold
         self.output_dir = Path(output_dir)
@@ -79,6 +248,82 @@ class MultiAgentOrchestrator:
             'tester': TesterAgent(ollama_client, AGENT_MODELS.get("tester", "qwen2.5-coder")),
             'documentation': DocumentationAgent(ollama_client, AGENT_MODELS.get("documentation", "mistral"))
         }
+        self._set_async_client(async_client)
+        
+        # Cache sémantique (prompts quasi identiques)
+        self.semantic_cache = semantic_cache
+        for agent in self.agents.values():
+            agent.semantic_cache = semantic_cache
+        
+        # Sessions LLM (context Ollama conservé entre itérations)
+        if use_sessions:
+            for key in SESSION_CONFIG.get("agents", []):
+                self.agents[key].session = AgentSession(
+                    num_ctx=self.agents[key].options.get("num_ctx") or SESSION_CONFIG.get("num_ctx", 4096),
+                    reset_ratio=SESSION_CONFIG.get("reset_ratio", 0.8)
+                )
+        
+        # Streaming: derniers événements reçus (pour le dashboard)
+        self.live_events: deque = deque(maxlen=20)
+        for agent in self.agents.values():
+            agent.stream = enable_streaming
+        self.add_stream_listener(self._on_stream_event)
+        
+        phase_models = {phase: self.agents[phase].model_name for phase, _ in PHASES}
+        
+        # Ordonnancement des phases par affinité de modèle
+        self.scheduler = None
+        self.last_model = None
+        self.scheduling_stats = {"model_swaps": 0, "baseline_swaps": 0, "swaps_avoided": 0}
+        if schedule_by_model:
+            self.scheduler = PhaseScheduler(list(phase_models), PHASE_DEPENDENCIES, phase_models)
+        
+        # Architecture réutilisée entre itérations (None = régénérée à chaque itération)
+        self.architecture_policy = ArchitecturePolicy.from_config(ARCHITECTURE_REUSE) if reuse_architecture else None
+        self._architecture_action = ""
+        self._architecture_feedback: list = []
+        
+        # Code corrigé par correctifs entre itérations (None = régénéré à chaque itération)
+        self.code_refiner = CodeRefiner.from_config(CODE_REFINEMENT) if refine_code else None
+        self._code_mode = FULL
+        self._code_findings: list = []
+        self._code_update: tuple = (FULL, None)  # (mode effectif, PatchStats)
+        
+        # Best-of-N: candidats de code simultanés, sur les créneaux libres du modèle du Développeur
+        self.candidate_search = None
+        self._candidate_review: Optional[AgentOutput] = None
+        self._candidate_prompt: dict = {}  # Réutilisation du préfixe et tokens omis de la revue retenue
+        if search_candidates:
+            self.candidate_search = CandidateSearch.from_config(
+                CANDIDATE_SEARCH, self._free_slots(phase_models["developer"])
+            )
+            if self.candidate_search.active:
+                logger.info(
+                    f"🎲 Best-of-N: {self.candidate_search.candidates} candidats de code par itération, "
+                    f"{self.candidate_search.review_top} relu(s)"
+                )
+        
+        # Exécution des phases selon leurs dépendances (parallèle si des créneaux le permettent)
+        self.phase_graph = PhaseGraph(PHASE_DEPENDENCIES)
+        if parallel_phases:
+            self.phase_graph = self._build_phase_graph(phase_models)
+        self.parallel_stats = {"iterations": 0, "wall_seconds": 0.0, "sequential_seconds": 0.0, "critical_path_seconds": 0.0}
+        self._pending_flags: list = []
+        
+        # Résidence des modèles (préchargement / keep_alive / éviction)
+        self.residency = None
+        if manage_residency:
+            self.residency = ModelResidencyManager.from_config(
+                ollama_client,
+                phase_models,
+                RESIDENCY_CONFIG,
+                model_options={
+                    agent.model_name: {"num_ctx": agent.options["num_ctx"]}
+                    for agent in self.agents.values() if agent.options.get("num_ctx")
+                }
+            )
+            if self.scheduler:
+                self.residency.set_phase_order(self._plan_iteration_order(record=False)[0])
         
         # State tracking
         self.iteration_count = 0
@@ -86,133 +331,723 @@ class MultiAgentOrchestrator:
         self.best_solution = None
         self.best_iteration = 0
         self.metrics_history = []
+        self.llm_usage = UsageAggregator()
+        self.run_started: Optional[float] = None
         self.architecture = ""
         self.code = ""
         self.all_issues = []
         
+        # Point de reprise (état écrit après chaque phase)
+        self.checkpoint = Checkpoint(self.output_dir, CHECKPOINT.get("filename", "checkpoint.json")) if checkpoint else None
+        self.requirements = ""
+        self.resumed_from: Optional[int] = None
+        self._next_iteration = 1
+        self._finished = False
+        self._elapsed_before = 0.0
+        self._resumed: Optional[IterationMetrics] = None
+        self._done_phases: list = []
+    
     def run(self, requirements: str) -> dict:
         """
         Lance la boucle principale d'amélioration continue.
         Retourne la meilleure solution trouvée.
         """
-        logger.info("🚀 Démarrage du système multi-agents")
-        logger.info(f"📋 Requirement: {requirements[:100]}...")
-        logger.info(f"⚙️  Max itérations: {self.max_iterations}")
-        
-        for iteration in range(1, self.max_iterations + 1):
-            self.iteration_count = iteration
-            logger.info(f"\n{'='*60}")
-            logger.info(f"🔄 ITÉRATION {iteration}/{self.max_iterations}")
-            logger.info(f"{'='*60}")
+        with run_context(self.run_id, self.priority):
+            self._log_run_start(requirements)
             
-            try:
-                metrics = self._run_iteration(requirements, iteration)
-                self.metrics_history.append(metrics)
+            for iteration in self._remaining_iterations():
+                self._log_iteration_start(iteration)
                 
-                # Afficher les métriques
-                self._display_iteration_summary(metrics)
+                try:
+                    metrics = self._run_iteration(requirements, iteration)
+                    if self._complete_iteration(metrics):
+                        break
                 
-                # Vérifier critères d'arrêt
-                should_stop, reason = self._check_stop_criteria(metrics)
+                except OllamaUnavailableError as e:
+                    logger.error(f"⛔ Arrêt: {e}")
+                    break
+                except OllamaError as e:
+                    logger.error(f"❌ Itération {iteration} abandonnée (non notée): {e}")
+                    continue
+                except Exception as e:
+                    logger.error(f"❌ Erreur itération {iteration}: {e}", exc_info=True)
+                    continue
+            
+            return self._finish_run()
+    
+    async def arun(self, requirements: str) -> dict:
+        """
+        Équivalent asynchrone de run().
+        Crée un AsyncOllamaClient depuis la configuration du client synchrone
+        si aucun n'a été fourni (et le ferme en fin d'exécution).
+        """
+        owns_client = self.async_client is None
+        if owns_client:
+            from .async_ollama_client import AsyncOllamaClient
+            self._set_async_client(AsyncOllamaClient(
+                getattr(self.ollama_client, "config", None),
+                cache=getattr(self.ollama_client, "cache", None),
+                resilience=getattr(self.ollama_client, "resilience", None),
+                pool=getattr(self.ollama_client, "pool", None),
+                governor=getattr(self.ollama_client, "governor", None),
+                cassette=getattr(self.ollama_client, "cassette", None)
+            ))
+        
+        token = current_run.set(RunContext(self.run_id, self.priority))
+        try:
+            self._log_run_start(requirements)
+            
+            for iteration in self._remaining_iterations():
+                self._log_iteration_start(iteration)
+                
+                try:
+                    metrics = await self._arun_iteration(requirements, iteration)
+                    if self._complete_iteration(metrics):
+                        break
                 
-                if should_stop:
-                    logger.info(f"\n✅ {reason}")
-                    logger.info(f"🏆 Meilleure solution trouvée itération {self.best_iteration}")
+                except OllamaUnavailableError as e:
+                    logger.error(f"⛔ Arrêt: {e}")
                     break
-                    
-            except Exception as e:
-                logger.error(f"❌ Erreur itération {iteration}: {e}", exc_info=True)
-                continue
+                except OllamaError as e:
+                    logger.error(f"❌ Itération {iteration} abandonnée (non notée): {e}")
+                    continue
+                except Exception as e:
+                    logger.error(f"❌ Erreur itération {iteration}: {e}", exc_info=True)
+                    continue
+            
+            return self._finish_run()
+        finally:
+            current_run.reset(token)
+            if owns_client:
+                await self.async_client.aclose()
+                self._set_async_client(None)
+    
+    def resume(self) -> Optional[str]:
+        """
+        Restaure l'état du checkpoint de output_dir pour continuer un run
+        interrompu (run/arun ne relancent que les phases non terminées).
+        Retourne les requirements du run, None s'il n'y a pas de checkpoint.
+        """
+        if self.checkpoint is None:
+            raise RuntimeError("Reprise impossible: orchestrateur créé sans checkpoint")
+        state = self.checkpoint.load()
+        if state is None:
+            return None
+        self._restore_checkpoint(state)
+        current = f", itération {self._resumed.iteration} en cours" if self._resumed else ""
+        logger.info(
+            f"♻️  Reprise du run {self.run_id}: {len(self.metrics_history)} itération(s) terminée(s){current}, "
+            f"meilleur score {self.best_score:.1f}%"
+        )
+        return self.requirements
+    
+    def add_stream_listener(self, listener: Callable[[StreamEvent], None]) -> None:
+        """Abonne un consommateur aux événements streamés de tous les agents"""
+        for agent in self.agents.values():
+            agent.event_listeners.append(listener)
+    
+    def _on_stream_event(self, event: StreamEvent) -> None:
+        self.live_events.append(event)
+        logger.debug(f"📡 [{event.agent}] {event.kind}: {event.value}")
+    
+    def _set_async_client(self, async_client) -> None:
+        """Propage le client asynchrone à tous les agents"""
+        self.async_client = async_client
+        for agent in self.agents.values():
+            agent.async_client = async_client
+    
+    def _log_run_start(self, requirements: str) -> None:
+        self.requirements = requirements
+        self.run_started = time.perf_counter() - self._elapsed_before
+        logger.info("🚀 Démarrage du système multi-agents")
+        logger.info(f"📋 Requirement: {requirements[:100]}...")
+        logger.info(f"⚙️  Max itérations: {self.max_iterations}")
         
+        if self.residency:
+            self.residency.preload()
+    
+    def _log_iteration_start(self, iteration: int) -> None:
+        self.iteration_count = iteration
+        logger.info(f"\n{'='*60}")
+        logger.info(f"🔄 ITÉRATION {iteration}/{self.max_iterations}")
+        logger.info(f"{'='*60}")
+    
+    def _complete_iteration(self, metrics: "IterationMetrics") -> bool:
+        """Enregistre l'itération et indique si la boucle doit s'arrêter"""
+        self.metrics_history.append(metrics)
+        
+        # Afficher les métriques
+        self._display_iteration_summary(metrics)
+        
+        # Vérifier critères d'arrêt
+        should_stop, reason = self._check_stop_criteria(metrics)
+        
+        if should_stop:
+            logger.info(f"\n✅ {reason}")
+            logger.info(f"🏆 Meilleure solution trouvée itération {self.best_iteration}")
+        
+        # Arrêt sur la limite d'itérations: une reprise avec une limite plus haute continue le run
+        self._next_iteration = metrics.iteration + 1
+        self._finished = should_stop and (
+            self.iteration_count < self.max_iterations or metrics.overall_score >= self.quality_threshold
+        )
+        self._save_checkpoint()
+        return should_stop
+    
+    def _finish_run(self) -> dict:
         logger.info(f"\n{'='*60}")
         logger.info("🎯 RÉSUMÉ FINAL")
         logger.info(f"{'='*60}")
         self._display_final_summary()
         
+        if self.semantic_cache is not None:
+            self.semantic_cache.save()
+        
         return self._package_solution()
     
+    # ------------------------------------------------------------------
+    # Checkpoint / reprise
+    # ------------------------------------------------------------------
+    
+    def _remaining_iterations(self) -> range:
+        """Itérations restant à exécuter (après une reprise: à partir de la dernière non terminée)"""
+        if self._finished:
+            return range(0)
+        return range(self._next_iteration, self.max_iterations + 1)
+    
+    def _start_iteration(self, iteration: int) -> tuple[IterationMetrics, list]:
+        """Métriques de l'itération et phases à exécuter (sans celles déjà faites avant une reprise)"""
+        if self._resumed is None or self._resumed.iteration != iteration:
+            metrics = self._new_iteration_metrics(iteration)
+            return metrics, metrics.phase_order
+        
+        metrics, self._resumed = self._resumed, None
+        logger.info(f"♻️  Phases déjà terminées: {', '.join(self._done_phases) or 'aucune'}")
+        if self.residency:
+            self.residency.set_phase_order(metrics.phase_order)
+        return metrics, [phase for phase in metrics.phase_order if phase not in self._done_phases]
+    
+    def _save_checkpoint(self, current: Optional[IterationMetrics] = None) -> None:
+        """Écrit l'état du run (current: itération en cours, None entre deux itérations)"""
+        if self.checkpoint is None:
+            return
+        try:
+            self.checkpoint.save(self._checkpoint_state(current))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"💾 Checkpoint non écrit: {e}")
+    
+    def _checkpoint_state(self, current: Optional[IterationMetrics]) -> dict:
+        best = None
+        if self.best_solution:
+            best = {**self.best_solution, "metrics": self.best_solution['metrics'].to_state()}
+        in_progress = None
+        if current is not None:
+            in_progress = {
+                "metrics": current.to_state(),
+                "done_phases": list(self._done_phases),
+                "architecture_action": self._architecture_action,
+                "architecture_feedback": list(self._architecture_feedback),
+                "code_mode": self._code_mode,
+                "code_findings": list(self._code_findings),
+                "pending_flags": [list(flag) for flag in self._pending_flags],
+                "candidate_review": self._candidate_review.to_dict() if self._candidate_review else None,
+                "candidate_prompt": dict(self._candidate_prompt),
+            }
+        return {
+            "run_id": self.run_id,
+            "requirements": self.requirements,
+            "next_iteration": self._next_iteration,
+            "finished": self._finished,
+            "elapsed_seconds": time.perf_counter() - self.run_started if self.run_started else self._elapsed_before,
+            "architecture": self.architecture,
+            "code": self.code,
+            "all_issues": list(self.all_issues),
+            "best_score": self.best_score,
+            "best_iteration": self.best_iteration,
+            "best_solution": best,
+            "metrics_history": [metrics.to_state() for metrics in self.metrics_history],
+            "current": in_progress,
+            "agents": {key: agent.counters_state() for key, agent in self.agents.items()},
+            "llm_usage": self.llm_usage.to_state(),
+            "scheduling": {"stats": dict(self.scheduling_stats), "last_model": self.last_model},
+            "parallel_stats": dict(self.parallel_stats),
+            "architecture_policy": (
+                snapshot(self.architecture_policy, ("actions", "_feedback", "_last_generated"))
+                if self.architecture_policy is not None else None
+            ),
+            "code_refiner": (
+                snapshot(self.code_refiner, ("updates", "completion_tokens", "_findings"))
+                if self.code_refiner is not None else None
+            ),
+            "candidate_search": (
+                snapshot(self.candidate_search, ("iterations", "generated", "reviewed", "winners", "fallbacks"))
+                if self.candidate_search is not None else None
+            ),
+        }
+    
+    def _restore_checkpoint(self, state: dict) -> None:
+        self.run_id = state["run_id"]
+        self.requirements = state["requirements"]
+        self._next_iteration = state["next_iteration"]
+        self._finished = state["finished"]
+        self._elapsed_before = state["elapsed_seconds"]
+        self.architecture = state["architecture"]
+        self.code = state["code"]
+        self.all_issues = list(state["all_issues"])
+        self.best_score = state["best_score"]
+        self.best_iteration = state["best_iteration"]
+        self.best_solution = state["best_solution"]
+        if self.best_solution:
+            self.best_solution['metrics'] = IterationMetrics.from_state(self.best_solution['metrics'])
+        self.metrics_history = [IterationMetrics.from_state(metrics) for metrics in state["metrics_history"]]
+        self.iteration_count = len(self.metrics_history)
+        
+        for key, counters in state["agents"].items():
+            if key in self.agents:
+                self.agents[key].restore_counters(counters)
+        self.llm_usage.restore(state["llm_usage"])
+        self.scheduling_stats = dict(state["scheduling"]["stats"])
+        self.last_model = state["scheduling"]["last_model"]
+        self.parallel_stats = dict(state["parallel_stats"])
+        if self.architecture_policy is not None and state.get("architecture_policy"):
+            restore(self.architecture_policy, state["architecture_policy"])
+        if self.code_refiner is not None and state.get("code_refiner"):
+            restore(self.code_refiner, state["code_refiner"])
+        if self.candidate_search is not None and state.get("candidate_search"):
+            restore(self.candidate_search, state["candidate_search"])
+            self.candidate_search.winners = int_keys(self.candidate_search.winners)
+        
+        current = state.get("current")
+        self._resumed = None
+        if current is not None:
+            self._resumed = IterationMetrics.from_state(current["metrics"])
+            self._next_iteration = self._resumed.iteration
+            self._done_phases = list(current["done_phases"])
+            self._architecture_action = current["architecture_action"]
+            self._architecture_feedback = list(current["architecture_feedback"])
+            self._code_mode = current["code_mode"]
+            self._code_findings = list(current["code_findings"])
+            self._pending_flags = [tuple(flag) for flag in current["pending_flags"]]
+            review = current.get("candidate_review")
+            self._candidate_review = AgentOutput.from_dict(review) if review else None
+            self._candidate_prompt = dict(current.get("candidate_prompt") or {})
+        self.resumed_from = self._next_iteration
+    
     def _run_iteration(self, requirements: str, iteration: int) -> IterationMetrics:
         """Exécute une itération complète"""
         
+        metrics, order = self._start_iteration(iteration)
+        
+        graph_run = self.phase_graph.run(
+            order,
+            lambda phase: self._execute_phase(phase, requirements, iteration),
+            lambda phase, output: self._apply_phase_output(phase, output, metrics)
+        )
+        self._record_graph_run(graph_run, metrics)
+        
+        self._finalize_iteration(metrics)
+        return metrics
+    
+    async def _arun_iteration(self, requirements: str, iteration: int) -> IterationMetrics:
+        """Exécute une itération complète sans bloquer la boucle asyncio"""
+        
+        metrics, order = self._start_iteration(iteration)
+        
+        graph_run = await self.phase_graph.arun(
+            order,
+            lambda phase: self._aexecute_phase(phase, requirements, iteration),
+            lambda phase, output: self._apply_phase_output(phase, output, metrics)
+        )
+        self._record_graph_run(graph_run, metrics)
+        
+        self._finalize_iteration(metrics)
+        return metrics
+    
+    def _execute_phase(self, phase: str, requirements: str, iteration: int) -> AgentOutput:
+        """Exécute l'agent d'une phase (éventuellement dans un worker du PhaseGraph)"""
+        logger.info(PHASE_LABELS[phase])
+        if phase == 'reviewer' and self._candidate_review is not None:
+            return self._take_candidate_review()
+        self._prepare_phase(phase)
+        args, kwargs = self._phase_inputs(phase, requirements, iteration)
+        started = time.perf_counter()
+        if phase == 'developer':
+            output = self._execute_developer(args, kwargs, iteration)
+        else:
+            output = self.agents[phase].execute(*args, **kwargs)
+        self._record_phase_time(phase, time.perf_counter() - started)
+        return output
+    
+    async def _aexecute_phase(self, phase: str, requirements: str, iteration: int) -> AgentOutput:
+        logger.info(PHASE_LABELS[phase])
+        if phase == 'reviewer' and self._candidate_review is not None:
+            return self._take_candidate_review()
+        await asyncio.to_thread(self._prepare_phase, phase)
+        args, kwargs = self._phase_inputs(phase, requirements, iteration)
+        started = time.perf_counter()
+        if phase == 'developer':
+            output = await self._aexecute_developer(args, kwargs, iteration)
+        else:
+            output = await self.agents[phase].aexecute(*args, **kwargs)
+        self._record_phase_time(phase, time.perf_counter() - started)
+        return output
+    
+    def _execute_developer(self, args: tuple, kwargs: dict, iteration: int) -> AgentOutput:
+        """
+        Phase de développement: un candidat, ou N en parallèle (best-of-N);
+        en mode correctif, chaque réponse est appliquée au code courant et
+        le code est régénéré si aucune ne s'applique.
+        """
+        variants = self._developer_variants()
+        outputs = _run_parallel([functools.partial(agent.execute, *args, **kwargs) for agent in variants])
+        candidates = self._code_candidates(outputs)
+        if not candidates:
+            outputs.append(self.agents['developer'].execute(*args, **self._full_code_inputs(kwargs)))
+            candidates = [(0, outputs[-1], (FALLBACK, None))]
+        
+        shortlist, reviewers = self._shortlist_candidates(candidates)
+        reviews = _run_parallel([
+            functools.partial(reviewer.execute, candidates[index][1].content, self.architecture, iteration=iteration)
+            for reviewer, index in zip(reviewers, shortlist)
+        ])
+        return self._select_candidate(variants, outputs, candidates, shortlist, reviewers, reviews)
+    
+    async def _aexecute_developer(self, args: tuple, kwargs: dict, iteration: int) -> AgentOutput:
+        variants = self._developer_variants()
+        outputs = list(await asyncio.gather(*(agent.aexecute(*args, **kwargs) for agent in variants)))
+        candidates = self._code_candidates(outputs)
+        if not candidates:
+            outputs.append(await self.agents['developer'].aexecute(*args, **self._full_code_inputs(kwargs)))
+            candidates = [(0, outputs[-1], (FALLBACK, None))]
+        
+        shortlist, reviewers = self._shortlist_candidates(candidates)
+        reviews = list(await asyncio.gather(*(
+            reviewer.aexecute(candidates[index][1].content, self.architecture, iteration=iteration)
+            for reviewer, index in zip(reviewers, shortlist)
+        )))
+        return self._select_candidate(variants, outputs, candidates, shortlist, reviewers, reviews)
+    
+    def _developer_variants(self) -> list:
+        developer = self.agents['developer']
+        if self.candidate_search is None or not self.candidate_search.active:
+            return [developer]
+        return self.candidate_search.variants(developer)
+    
+    def _code_candidates(self, outputs: list) -> list:
+        """
+        [(rang, sortie, (mode, PatchStats))] des réponses exploitables; en mode
+        correctif, celles dont le correctif s'applique au code courant.
+        """
+        if self._code_mode != PATCH:
+            return [(rank, output, (FULL, None)) for rank, output in enumerate(outputs)]
+        candidates = []
+        for rank, output in enumerate(outputs):
+            try:
+                code, stats = self.code_refiner.apply(self.code, output.content)
+            except PatchError as e:
+                logger.warning(f"🩹 Correctif inapplicable ({e})")
+                continue
+            candidates.append((rank, replace(output, content=code), (PATCH, stats)))
+        if not candidates:
+            logger.warning("🩹 Aucun correctif applicable: régénération complète du code")
+        return candidates
+    
+    def _shortlist_candidates(self, candidates: list) -> tuple[list, list]:
+        """Index des candidats retenus (pré-score) et Reviewers qui les relisent (aucun si un seul)"""
+        if len(candidates) < 2:
+            return [0], []
+        shortlist = self.candidate_search.shortlist([output.content for _, output, _ in candidates])
+        if len(shortlist) < 2:
+            return shortlist, []
+        reviewer = self.agents['reviewer']
+        return shortlist, [reviewer.variant() for _ in shortlist]
+    
+    def _select_candidate(
+        self, variants: list, outputs: list, candidates: list, shortlist: list, reviewers: list, reviews: list
+    ) -> AgentOutput:
+        """
+        Garde le meilleur candidat (note de revue, sinon pré-score); sa revue
+        sert de phase de revue. Les compteurs de tous les appels lui sont attribués.
+        """
+        best = 0
+        if reviews:
+            best = max(range(len(reviews)), key=lambda i: (reviews[i].score or 0.0, -i))
+            for index, reviewer in enumerate(reviewers):
+                self.agents['reviewer'].absorb(reviewer, winner=index == best)
+            self._candidate_review = replace(reviews[best], usage=_total_usage(reviews))
+            self._candidate_prompt = self._prompt_figures(reviewers[best])
+        rank, output, self._code_update = candidates[shortlist[best]]
+        
+        developer = self.agents['developer']
+        for index, agent in enumerate(variants):
+            developer.absorb(agent, winner=index == rank)
+        if len(variants) > 1 and self.candidate_search is not None:
+            self.candidate_search.record_iteration(len(variants))
+            if self._code_update[0] == FALLBACK:
+                # Code régénéré faute de correctif applicable: aucun candidat n'a gagné
+                self.candidate_search.record_fallback()
+            else:
+                self.candidate_search.record_winner(rank, len(reviews))
+                if rank:
+                    logger.info(f"🎲 Candidat {rank + 1}/{len(variants)} retenu")
+        return replace(output, usage=_total_usage(outputs))
+    
+    @staticmethod
+    def _prompt_figures(agent) -> dict:
+        """Réutilisation du préfixe et tokens omis (par section) du dernier prompt de agent"""
+        return {
+            "prefix_reuse": round(agent.prefix_reuse.last_ratio, 3),
+            "prompt_dropped": dict(agent.prompt_assembler.last_dropped),
+        }
+    
+    def _take_candidate_review(self) -> AgentOutput:
+        """Revue du candidat retenu, déjà faite pendant la sélection best-of-N"""
+        output, self._candidate_review = self._candidate_review, None
+        logger.info("🔍 Revue reprise de la sélection des candidats")
+        return output
+    
+    @staticmethod
+    def _full_code_inputs(kwargs: dict) -> dict:
+        """Entrées du Développeur pour une régénération complète (sans le code actuel)"""
+        return {name: value for name, value in kwargs.items() if name != "code"}
+    
+    def _build_phase_graph(self, phase_models: dict) -> PhaseGraph:
+        """
+        PhaseGraph dimensionné sur les créneaux du client: nœuds x parallel_slots
+        phases simultanées, et par modèle nœuds x créneaux du modèle (sauf
+        plafonds de PHASE_PARALLELISM).
+        """
+        governor = getattr(self.ollama_client, "governor", None)
+        nodes = self._node_count()
+        models = {phase: model.split(":")[0] for phase, model in phase_models.items()}
+        
+        max_parallel = PHASE_PARALLELISM.get("max_parallel_phases") or nodes * (governor.slots if governor else 1)
+        limits = {
+            model: nodes * (governor.capacity(model) if governor else 1)
+            for model in set(models.values())
+        }
+        limits.update({model.split(":")[0]: n for model, n in PHASE_PARALLELISM.get("model_limits", {}).items()})
+        
+        graph = PhaseGraph(PHASE_DEPENDENCIES, max_parallel=max_parallel, groups=models, limits=limits)
+        if graph.parallel:
+            logger.info(f"🔀 Phases indépendantes en parallèle: {graph.max_parallel} max ({nodes} nœud(s))")
+        return graph
+    
+    def _node_count(self) -> int:
+        pool = getattr(self.ollama_client, "pool", None)
+        return len(pool) if pool is not None else 1
+    
+    def _free_slots(self, model: str) -> int:
+        """Appels simultanés possibles pour model: nœuds x créneaux du modèle"""
+        governor = getattr(self.ollama_client, "governor", None)
+        return self._node_count() * (governor.capacity(model) if governor else 1)
+    
+    def _record_graph_run(self, graph_run: GraphRun, metrics: IterationMetrics) -> None:
+        """Chronologie de l'itération (durée réelle vs chemin critique)"""
+        metrics.phase_timing = graph_run.to_dict()
+        self.parallel_stats["iterations"] += 1
+        self.parallel_stats["wall_seconds"] += graph_run.wall_seconds
+        self.parallel_stats["sequential_seconds"] += graph_run.sequential_seconds
+        self.parallel_stats["critical_path_seconds"] += graph_run.critical_path_seconds
+        if self.phase_graph.parallel:
+            logger.info(
+                f"🔀 Itération en {graph_run.wall_seconds:.1f}s "
+                f"(phases cumulées {graph_run.sequential_seconds:.1f}s, chemin critique {graph_run.critical_path_seconds:.1f}s)"
+            )
+    
+    def _new_iteration_metrics(self, iteration: int) -> IterationMetrics:
+        """Crée les métriques de l'itération et planifie l'ordre de ses phases"""
         metrics = IterationMetrics(
             iteration=iteration,
             timestamp=datetime.now().isoformat()
         )
+        metrics.architecture_action = self._plan_architecture(iteration)
+        skip = ("architect",) if metrics.architecture_action == REUSE else ()
+        metrics.phase_order, metrics.model_swaps = self._plan_iteration_order(skip=skip)
+        self._plan_code_update(metrics.architecture_action)
+        self._candidate_review = None
+        self._candidate_prompt = {}
+        self._pending_flags = []
+        self._done_phases = []
         
-        # Phase 1: Architecture
-        logger.info("👨‍💼 Phase 1: Architecture...")
-        arch_output = self.agents['architect'].execute(requirements, iteration)
-        self.architecture = arch_output.content
-        metrics.architect_output = arch_output
-        
-        # Phase 2: Développement
-        logger.info("👨‍💻 Phase 2: Développement...")
-        dev_output = self.agents['developer'].execute(
-            self.architecture,
-            requirements,
-            iteration=iteration
-        )
-        self.code = dev_output.content
-        metrics.developer_output = dev_output
-        
-        # Phase 3: Revue Qualité
-        logger.info("🔍 Phase 3: Revue qualité...")
-        review_output = self.agents['reviewer'].execute(
-            self.code,
-            self.architecture,
-            iteration=iteration
-        )
-        metrics.reviewer_score = review_output.score or 0.0
-        metrics.issues_count = len(review_output.issues)
-        metrics.improvements.extend(review_output.recommendations)
-        
-        # Phase 4: Sécurité
-        logger.info("🔒 Phase 4: Audit sécurité...")
-        security_output = self.agents['security'].execute(
-            self.code,
-            requirements,
-            iteration=iteration
-        )
-        metrics.security_score = security_output.score or 0.0
-        self.all_issues.extend(security_output.issues)
-        
-        # Phase 5: Tests
-        logger.info("✅ Phase 5: Génération tests...")
-        test_output = self.agents['tester'].execute(
-            self.code,
-            requirements,
-            iteration=iteration
-        )
-        metrics.tester_output = test_output
-        
-        # Phase 6: Documentation
-        logger.info("📚 Phase 6: Documentation...")
-        doc_output = self.agents['documentation'].execute(
-            self.architecture,
-            self.code,
-            requirements,
-            iteration=iteration
+        if self.residency:
+            self.residency.set_phase_order(metrics.phase_order)
+        self._save_checkpoint(metrics)
+        return metrics
+    
+    def _plan_architecture(self, iteration: int) -> str:
+        """Décide du sort de l'architecture pour l'itération (ArchitecturePolicy)"""
+        if self.architecture_policy is None:
+            self._architecture_action = "generate"
+            return self._architecture_action
+        
+        action = self.architecture_policy.decide(iteration, has_architecture=bool(self.architecture))
+        self._architecture_feedback = self.architecture_policy.consume_feedback() if action == REFINE else []
+        self._architecture_action = action
+        if action == REUSE:
+            logger.info("🏛️  Architecture réutilisée (aucun problème architectural signalé)")
+        elif action == REFINE:
+            logger.info(f"🏛️  Révision de l'architecture ({len(self._architecture_feedback)} problème(s) architectural(aux))")
+        return action
+    
+    def _plan_code_update(self, architecture_action: str) -> None:
+        """Correctif ou régénération complète du code pour l'itération (CodeRefiner)"""
+        self._code_update = (FULL, None)
+        if self.code_refiner is None:
+            self._code_mode, self._code_findings = FULL, []
+            return
+        self._code_findings = self.code_refiner.findings
+        self._code_mode = self.code_refiner.decide(
+            has_code=bool(self.code),
+            architecture_changed=architecture_action != REUSE
         )
-        metrics.documentation_output = doc_output
+        if self._code_mode == PATCH:
+            logger.info(f"🩹 Code corrigé par correctif ({len(self._code_findings)} problème(s) à traiter)")
+    
+    def _plan_iteration_order(self, record: bool = True, skip: tuple = ()) -> tuple[list, int]:
+        """Ordre des phases de l'itération et nombre de changements de modèle prévus"""
+        default_order = [phase for phase, _ in PHASES if phase not in skip]
+        if not self.scheduler:
+            return default_order, 0
+        
+        wrap_model = self.scheduler.phase_models[default_order[0]]
+        plan = self.scheduler.plan(self.last_model, wrap_model=wrap_model, skip=skip)
+        
+        if record:
+            self.scheduling_stats["model_swaps"] += plan.model_swaps
+            self.scheduling_stats["baseline_swaps"] += plan.baseline_swaps
+            self.scheduling_stats["swaps_avoided"] += plan.swaps_avoided
+            self.last_model = self.scheduler.phase_models[plan.order[-1]]
+            logger.info(
+                f"🗂️  Ordre des phases: {' → '.join(plan.order)} "
+                f"({plan.swaps_avoided} changement(s) de modèle évité(s))"
+            )
+        return plan.order, plan.model_swaps
+    
+    def _prepare_phase(self, phase: str) -> None:
+        """Prépare la mémoire et fixe le keep_alive du modèle de la phase"""
+        if self.residency:
+            self.agents[phase].keep_alive = self.residency.before_phase(phase)
+    
+    def _record_phase_time(self, phase: str, seconds: float) -> None:
+        if self.residency:
+            self.residency.record_phase(phase, seconds)
+    
+    def _phase_inputs(self, phase: str, requirements: str, iteration: int) -> tuple[tuple, dict]:
+        """Arguments passés à l'agent d'une phase, selon l'état courant"""
+        if phase == 'architect':
+            if self._architecture_action == REFINE:
+                return (requirements, iteration), {
+                    "architecture": self.architecture,
+                    "feedback": self._architecture_feedback
+                }
+            return (requirements, iteration), {}
+        if phase == 'developer':
+            kwargs = {"iteration": iteration}
+            if self._code_findings:
+                kwargs["findings"] = self._code_findings
+            if self._code_mode == PATCH:
+                kwargs["code"] = self.code
+            return (self.architecture, requirements), kwargs
+        if phase == 'reviewer':
+            return (self.code, self.architecture), {"iteration": iteration}
+        if phase in ('security', 'tester'):
+            return (self.code, requirements), {"iteration": iteration}
+        if phase == 'documentation':
+            return (self.architecture, self.code, requirements), {"iteration": iteration}
+        raise ValueError(f"Phase inconnue: {phase}")
+    
+    def _apply_phase_output(self, phase: str, output: AgentOutput, metrics: IterationMetrics) -> None:
+        """Intègre la sortie d'un agent dans l'état et les métriques"""
+        agent = self.agents[phase]
+        prompt = self._prompt_figures(agent)
+        if phase == 'reviewer' and self._candidate_prompt:
+            # Revue faite pendant la sélection best-of-N: chiffres de la revue retenue
+            prompt, self._candidate_prompt = self._candidate_prompt, {}
+        metrics.prefix_reuse[phase] = prompt["prefix_reuse"]
+        if prompt["prompt_dropped"]:
+            metrics.prompt_dropped[phase] = prompt["prompt_dropped"]
+        if output.usage is not None:
+            metrics.llm_usage[phase] = output.usage.to_dict()
+            if output.usage.early_stopped and agent.early_stops.last:
+                metrics.early_stop[phase] = dict(agent.early_stops.last)
+            self.llm_usage.add(phase, agent.model_name, metrics.iteration, output.usage)
+        if phase == 'architect':
+            # Une réponse vide ne remplace pas une architecture existante
+            self.architecture = output.content or self.architecture
+            metrics.architect_output = output
+        elif phase == 'developer':
+            self.code = output.content
+            metrics.developer_output = output
+            self._record_code_update(output, metrics)
+        elif phase == 'reviewer':
+            metrics.reviewer_score = output.score or 0.0
+            metrics.issues_count = len(output.issues)
+            metrics.improvements.extend(output.recommendations)
+            self._flag_issues(phase, output.issues)
+            self._record_architecture_feedback(phase, output.issues)
+            self._record_code_findings(phase, output.issues)
+        elif phase == 'security':
+            metrics.security_score = output.score or 0.0
+            self.all_issues.extend(output.issues)
+            self._flag_issues(phase, output.issues)
+            self._record_architecture_feedback(phase, output.issues)
+            self._record_code_findings(phase, output.issues)
+        elif phase == 'tester':
+            metrics.tester_output = output
+        elif phase == 'documentation':
+            metrics.documentation_output = output
+        
+        self._done_phases.append(phase)
+        self._save_checkpoint(metrics)
+    
+    def _flag_issues(self, source: str, issues: list) -> None:
+        """Les lignes de code citées par ces problèmes sont gardées en priorité dans les prompts"""
+        if self.phase_graph.parallel:
+            # Phases simultanées: appliqué en fin d'itération, pour des prompts indépendants du timing
+            self._pending_flags.append((source, issues))
+            return
+        for agent in self.agents.values():
+            agent.prompt_assembler.flag(source, issues)
+    
+    def _record_architecture_feedback(self, source: str, issues: list) -> None:
+        if self.architecture_policy is not None:
+            self.architecture_policy.record_feedback(source, issues)
+    
+    def _record_code_findings(self, source: str, issues: list) -> None:
+        if self.code_refiner is not None:
+            self.code_refiner.record_findings(source, issues)
+    
+    def _record_code_update(self, output: AgentOutput, metrics: IterationMetrics) -> None:
+        """Mode effectif de mise à jour du code et tokens générés par le Développeur"""
+        mode, stats = self._code_update
+        metrics.code_update = mode
+        metrics.code_patch = stats.to_dict() if stats is not None else {}
+        if self.code_refiner is not None:
+            self.code_refiner.record(mode, output.usage.eval_count if output.usage else 0, stats)
+    
+    def _finalize_iteration(self, metrics: IterationMetrics) -> None:
+        """Calcule le score global et met à jour la meilleure solution"""
+        for source, issues in self._pending_flags:
+            for agent in self.agents.values():
+                agent.prompt_assembler.flag(source, issues)
+        self._pending_flags = []
         
-        # Calculer score global
         metrics.overall_score = self._calculate_overall_score(metrics)
         
         # Mise à jour meilleure solution
         if metrics.overall_score > self.best_score:
             self.best_score = metrics.overall_score
-            self.best_iteration = iteration
+            self.best_iteration = metrics.iteration
             self.best_solution = {
                 'architecture': self.architecture,
                 'code': self.code,
-                'tests': test_output.content,
-                'documentation': doc_output.content,
+                'tests': metrics.tester_output.content if metrics.tester_output else "",
+                'documentation': metrics.documentation_output.content if metrics.documentation_output else "",
                 'metrics': metrics,
-                'iteration': iteration
+                'iteration': metrics.iteration
             }
             logger.info(f"🏆 NOUVELLE MEILLEURE SOLUTION! Score: {self.best_score:.1f}%")
-        
-        return metrics
     
     def _calculate_overall_score(self, metrics: IterationMetrics) -> float:
         """Calcule un score global pondéré depuis settings.SCORE_WEIGHTS"""
@@ -283,21 +1118,79 @@ class MultiAgentOrchestrator:
         └─ Temps total: {self._get_total_time()}
         """)
         
+        if self.phase_graph.parallel and self.parallel_stats["wall_seconds"]:
+            stats = self.parallel_stats
+            logger.info(
+                f"🔀 Phases parallèles: {stats['wall_seconds']:.0f}s au lieu de {stats['sequential_seconds']:.0f}s "
+                f"(chemin critique {stats['critical_path_seconds']:.0f}s)"
+            )
+        
+        if self.architecture_policy is not None:
+            actions = self.architecture_policy.actions
+            logger.info(
+                f"🏛️  Architecture: réutilisée {actions['reuse']} fois, révisée {actions['refine']} fois, "
+                f"régénérée {actions['generate'] + actions['refresh']} fois"
+            )
+        
+        if self.code_refiner is not None and self.code_refiner.updates[PATCH]:
+            stats = self.code_refiner.stats()
+            logger.info(
+                f"🩹 Code: {stats[PATCH]} correctif(s) (~{stats['avg_completion_tokens'][PATCH]} tokens générés), "
+                f"{stats[FULL]} génération(s) complète(s) (~{stats['avg_completion_tokens'][FULL]} tokens), "
+                f"{stats[FALLBACK]} repli(s)"
+            )
+        
+        if self.candidate_search is not None and self.candidate_search.iterations:
+            search = self.candidate_search
+            logger.info(
+                f"🎲 Best-of-N: {search.generated} candidats sur {search.iterations} itération(s), "
+                f"{sum(n for rank, n in search.winners.items() if rank)} fois un candidat alternatif retenu"
+            )
+        
+        if self.scheduler:
+            logger.info(
+                f"🗂️  Changements de modèle: {self.scheduling_stats['model_swaps']} "
+                f"(évités: {self.scheduling_stats['swaps_avoided']})"
+            )
+        
         # Afficher les agents stats
         logger.info("\n🤖 STATISTIQUES AGENTS:")
         for name, agent in self.agents.items():
             logger.info(f"  {agent}: {agent.total_tokens} tokens")
+        
+        for model, usage in self.llm_usage.by_model.items():
+            stats = usage.to_dict()
+            logger.info(
+                f"  ⚡ {model}: {stats['tokens_per_second']} tokens/s "
+                f"(prompt {stats['prompt_tokens_per_second']} tokens/s, chargement {stats['load_seconds']:.0f}s)"
+            )
     
     def _get_total_time(self) -> str:
-        """Calcule le temps total d'exécution"""
-        if not self.metrics_history:
+        """Calcule le temps total d'exécution (et la part chargement / génération des modèles)"""
+        if self.run_started is None:
             return "N/A"
         
-        first_time = datetime.fromisoformat(self.metrics_history[0].timestamp)
-        last_time = datetime.fromisoformat(self.metrics_history[-1].timestamp)
-        duration = last_time - first_time
+        elapsed = f"{time.perf_counter() - self.run_started:.0f}s"
+        if not self.llm_usage.total.calls:
+            return elapsed
         
-        return f"{duration.total_seconds():.0f}s"
+        usage = self.llm_usage.total.to_dict()
+        return (
+            f"{elapsed} (chargement modèles {usage['load_seconds']:.0f}s, "
+            f"prompts {usage['prompt_eval_seconds']:.0f}s, génération {usage['eval_seconds']:.0f}s)"
+        )
+    
+    def _parallelism_summary(self) -> dict:
+        stats = self.parallel_stats
+        return {
+            "max_parallel_phases": self.phase_graph.max_parallel,
+            "model_limits": dict(self.phase_graph.limits),
+            "iterations": stats["iterations"],
+            "wall_seconds": round(stats["wall_seconds"], 3),
+            "sequential_seconds": round(stats["sequential_seconds"], 3),
+            "critical_path_seconds": round(stats["critical_path_seconds"], 3),
+            "speedup": round(stats["sequential_seconds"] / stats["wall_seconds"], 2) if stats["wall_seconds"] else None,
+        }
     
     def _package_solution(self) -> dict:
         """Prépare la solution pour export"""
@@ -317,4 +1210,42 @@ class MultiAgentOrchestrator:
             "metrics": [m.to_dict() for m in self.metrics_history]
         }
         
+        cache = getattr(self.ollama_client, "cache", None)
+        if cache is not None:
+            solution["cache"] = cache.stats()
+        if self.semantic_cache is not None:
+            solution["semantic_cache"] = self.semantic_cache.stats()
+        solution["llm_usage"] = self.llm_usage.summary()
+        solution["prompt_prefix"] = {key: agent.prefix_reuse.stats() for key, agent in self.agents.items()}
+        solution["prompt_budget"] = {key: agent.prompt_assembler.stats() for key, agent in self.agents.items()}
+        early_stops = {key: agent.early_stops.stats() for key, agent in self.agents.items() if agent.early_stops.cuts}
+        if early_stops:
+            solution["early_stop"] = early_stops
+        sessions = {key: agent.session.stats() for key, agent in self.agents.items() if agent.session}
+        if sessions:
+            solution["sessions"] = sessions
+        resilience = getattr(self.ollama_client, "resilience", None)
+        if resilience is not None:
+            solution["resilience"] = resilience.stats()
+        governor = getattr(self.ollama_client, "governor", None)
+        if governor is not None:
+            solution["concurrency"] = governor.stats()
+        pool = getattr(self.ollama_client, "pool", None)
+        if pool is not None and len(pool) > 1:
+            solution["endpoints"] = pool.stats()
+        if self.scheduler:
+            solution["scheduling"] = dict(self.scheduling_stats)
+        if self.phase_graph.parallel:
+            solution["parallelism"] = self._parallelism_summary()
+        if self.architecture_policy is not None:
+            solution["architecture_reuse"] = self.architecture_policy.stats()
+        if self.code_refiner is not None:
+            solution["code_refinement"] = self.code_refiner.stats()
+        if self.candidate_search is not None and self.candidate_search.active:
+            solution["candidate_search"] = self.candidate_search.stats()
+        if self.checkpoint is not None:
+            solution["checkpoint"] = {**self.checkpoint.stats(), "resumed_from": self.resumed_from}
+        if self.residency:
+            solution["residency"] = self.residency.stats()
+        
         return solution
@@ -0,0 +1,231 @@
+"""
+Exécution des phases d'une itération selon leur graphe de dépendances.
+
+Revue, audit sécurité, tests et documentation ne consomment que
+l'architecture et le code: dès que ces sorties existent, elles peuvent
+tourner en même temps. L'exécuteur lance chaque phase dès que ses
+dépendances sont terminées, dans la limite de max_parallel phases en cours
+et d'un plafond par groupe (dans l'orchestrateur, un groupe par modèle:
+inutile d'occuper plus de phases que le modèle n'a de créneaux Ollama).
+
+Les sorties sont intégrées (callback complete) dans le thread appelant ou la
+boucle asyncio, une phase à la fois et dans l'ordre de priorité à
+terminaison simultanée: l'état partagé n'est jamais modifié depuis un worker.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PhaseTiming:
+    """Début et fin d'une phase (secondes depuis le début de l'itération)"""
+    started: float
+    finished: float
+    
+    @property
+    def seconds(self) -> float:
+        return self.finished - self.started
+
+
+@dataclass
+class GraphRun:
+    """Chronologie d'une exécution du graphe"""
+    timings: dict = field(default_factory=dict)  # {phase: PhaseTiming}
+    wall_seconds: float = 0.0
+    critical_path_seconds: float = 0.0
+    max_in_flight: int = 0
+    
+    @property
+    def sequential_seconds(self) -> float:
+        """Durée qu'aurait prise l'enchaînement des mêmes phases une à une"""
+        return sum(timing.seconds for timing in self.timings.values())
+    
+    def to_dict(self) -> dict:
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "sequential_seconds": round(self.sequential_seconds, 3),
+            "critical_path_seconds": round(self.critical_path_seconds, 3),
+            "max_in_flight": self.max_in_flight,
+            "timeline": {
+                phase: [round(t.started, 3), round(t.finished, 3)] for phase, t in self.timings.items()
+            },
+        }
+
+
+class PhaseGraph:
+    """Lance les phases prêtes en parallèle (threads ou tâches asyncio)"""
+    
+    def __init__(
+        self,
+        dependencies: dict,
+        max_parallel: int = 1,
+        groups: Optional[dict] = None,
+        limits: Optional[dict] = None,
+    ):
+        """
+        Args:
+            dependencies: {phase: phases dont elle consomme les sorties}
+            max_parallel: phases simultanées max (1 = exécution séquentielle, sans thread)
+            groups: {phase: groupe}, ex. le modèle de la phase (défaut: la phase elle-même)
+            limits: {groupe: phases simultanées max} (groupe absent = pas de plafond)
+        """
+        self.dependencies = {phase: tuple(deps) for phase, deps in dependencies.items()}
+        self.max_parallel = max(1, max_parallel)
+        self.groups = dict(groups or {})
+        self.limits = {group: max(1, limit) for group, limit in (limits or {}).items()}
+    
+    @property
+    def parallel(self) -> bool:
+        return self.max_parallel > 1
+    
+    def critical_path(self, durations: dict) -> float:
+        """Durée de la plus longue chaîne de dépendances (borne basse du temps d'itération)"""
+        finish: dict[str, float] = {}
+        
+        def finish_of(phase: str) -> float:
+            if phase not in finish:
+                deps = [dep for dep in self.dependencies.get(phase, ()) if dep in durations]
+                finish[phase] = durations[phase] + max((finish_of(dep) for dep in deps), default=0.0)
+            return finish[phase]
+        
+        return max((finish_of(phase) for phase in durations), default=0.0)
+    
+    # ------------------------------------------------------------------
+    # Exécution
+    # ------------------------------------------------------------------
+    
+    def run(
+        self,
+        order: list,
+        execute: Callable[[str], Any],
+        complete: Callable[[str, Any], None],
+    ) -> GraphRun:
+        """
+        Exécute les phases de order (ordre de priorité, compatible avec les
+        dépendances) dans un pool de threads; execute(phase) tourne dans un
+        worker, complete(phase, résultat) dans le thread appelant.
+        La première exception (Ctrl-C compris) arrête les lancements; elle est
+        relevée une fois les phases en cours terminées et intégrées, pour que
+        leurs sorties ne soient pas perdues (checkpoint).
+        """
+        origin = time.perf_counter()
+        graph_run = GraphRun()
+        if not self.parallel:
+            for phase in order:
+                result, graph_run.timings[phase] = self._timed(execute, phase, origin)
+                complete(phase, result)
+            return self._close(graph_run, origin, max_in_flight=1 if order else 0)
+        
+        pending, running, error = list(order), {}, None
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="phase") as executor:
+            while pending or running:
+                if error is None:
+                    for phase in self._launchable(pending, graph_run.timings, running.values()):
+                        pending.remove(phase)
+                        # Le contexte (run courant pour le gouverneur) suit la phase dans son worker
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, self._timed, execute, phase, origin)] = phase
+                    graph_run.max_in_flight = max(graph_run.max_in_flight, len(running))
+                if not running:
+                    if error is None and pending:
+                        raise ValueError(f"Dépendances de phases insatisfiables: {', '.join(pending)}")
+                    break
+                
+                try:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                except BaseException as e:  # Ctrl-C pendant l'attente
+                    error = error or e
+                    continue
+                for future in sorted(finished, key=lambda f: order.index(running[f])):
+                    phase = running.pop(future)
+                    try:
+                        result, timing = future.result()
+                    except BaseException as e:
+                        error = error or e
+                        continue
+                    graph_run.timings[phase] = timing
+                    complete(phase, result)
+        if error is not None:
+            raise error
+        return self._close(graph_run, origin)
+    
+    async def arun(
+        self,
+        order: list,
+        execute: Callable[[str], Awaitable[Any]],
+        complete: Callable[[str, Any], None],
+    ) -> GraphRun:
+        """
+        Équivalent asyncio de run(): une tâche par phase lancée; à la première
+        exception, les phases encore en cours sont annulées.
+        """
+        origin = time.perf_counter()
+        graph_run = GraphRun()
+        pending, running = list(order), {}
+        try:
+            while pending or running:
+                for phase in self._launchable(pending, graph_run.timings, running.values()):
+                    pending.remove(phase)
+                    running[asyncio.ensure_future(self._atimed(execute, phase, origin))] = phase
+                graph_run.max_in_flight = max(graph_run.max_in_flight, len(running))
+                if not running:
+                    raise ValueError(f"Dépendances de phases insatisfiables: {', '.join(pending)}")
+                
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(finished, key=lambda t: order.index(running[t])):
+                    phase = running.pop(task)
+                    result, graph_run.timings[phase] = task.result()
+                    complete(phase, result)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        return self._close(graph_run, origin)
+    
+    def _launchable(self, pending: list, done: dict, running) -> list:
+        """Phases prêtes à lancer maintenant, par priorité, dans les plafonds"""
+        in_flight = list(running)
+        launch = []
+        for phase in pending:
+            if len(in_flight) >= self.max_parallel:
+                break
+            deps = [dep for dep in self.dependencies.get(phase, ()) if dep in pending or dep in in_flight or dep in done]
+            if any(dep not in done for dep in deps):
+                continue
+            group = self.groups.get(phase, phase)
+            limit = self.limits.get(group)
+            if limit is not None and sum(1 for p in in_flight if self.groups.get(p, p) == group) >= limit:
+                continue
+            in_flight.append(phase)
+            launch.append(phase)
+        return launch
+    
+    def _close(self, graph_run: GraphRun, origin: float, max_in_flight: Optional[int] = None) -> GraphRun:
+        graph_run.wall_seconds = time.perf_counter() - origin
+        graph_run.critical_path_seconds = self.critical_path(
+            {phase: timing.seconds for phase, timing in graph_run.timings.items()}
+        )
+        if max_in_flight is not None:
+            graph_run.max_in_flight = max_in_flight
+        return graph_run
+    
+    @staticmethod
+    def _timed(execute: Callable[[str], Any], phase: str, origin: float) -> tuple:
+        started = time.perf_counter() - origin
+        result = execute(phase)
+        return result, PhaseTiming(started, time.perf_counter() - origin)
+    
+    @staticmethod
+    async def _atimed(execute: Callable[[str], Awaitable[Any]], phase: str, origin: float) -> tuple:
+        started = time.perf_counter() - origin
+        result = await execute(phase)
+        return result, PhaseTiming(started, time.perf_counter() - origin)
@@ -0,0 +1,103 @@
+"""
+Planification des phases d'une itération par affinité de modèle.
+
+Quand un seul modèle tient en mémoire, chaque changement de modèle entre deux
+phases impose un rechargement. Parmi les ordres compatibles avec les
+dépendances de données entre phases, le planificateur choisit celui qui
+regroupe les appels à un même modèle, et compte les changements évités par
+rapport à l'ordre par défaut.
+"""
+
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SchedulePlan:
+    """Ordre retenu pour une itération"""
+    order: list
+    model_swaps: int
+    baseline_swaps: int
+    
+    @property
+    def swaps_avoided(self) -> int:
+        return max(0, self.baseline_swaps - self.model_swaps)
+
+
+def count_model_swaps(models: list, initial_model: Optional[str] = None) -> int:
+    """Nombre de changements de modèle le long d'une séquence d'appels"""
+    swaps = 0
+    current = initial_model
+    for model in models:
+        if current is not None and model != current:
+            swaps += 1
+        current = model
+    return swaps
+
+
+class PhaseScheduler:
+    """Choisit un ordre des phases respectant les dépendances et minimisant les changements de modèle"""
+    
+    def __init__(self, phases: list, dependencies: dict, phase_models: dict):
+        """
+        Args:
+            phases: ordre par défaut des phases (sert aussi à départager les égalités)
+            dependencies: {phase: phases dont elle consomme les sorties}
+            phase_models: {phase: modèle utilisé}
+        """
+        self.phases = list(phases)
+        self.phase_models = {phase: phase_models[phase].split(":")[0] for phase in self.phases}
+        self._index = {phase: i for i, phase in enumerate(self.phases)}
+        self._requires = [
+            sum(1 << self._index[dep] for dep in dependencies.get(phase, ()) if dep in self._index)
+            for phase in self.phases
+        ]
+    
+    def plan(
+        self,
+        initial_model: Optional[str] = None,
+        wrap_model: Optional[str] = None,
+        skip: tuple = ()
+    ) -> SchedulePlan:
+        """
+        Calcule l'ordre optimal (programmation dynamique sur les sous-ensembles).
+        
+        Args:
+            initial_model: modèle encore chargé par la phase précédente
+            wrap_model: modèle attendu juste après l'itération (début de la suivante)
+            skip: phases non exécutées cette itération (sortie précédente réutilisée)
+        """
+        count = len(self.phases)
+        full = (1 << count) - 1
+        skipped = sum(1 << self._index[phase] for phase in skip if phase in self._index)
+        models = [self.phase_models[phase] for phase in self.phases]
+        
+        @lru_cache(maxsize=None)
+        def best(done: int, last: Optional[str]) -> tuple[int, tuple]:
+            if done == full:
+                return (int(wrap_model is not None and last is not None and last != wrap_model), ())
+            
+            candidates = []
+            for i in range(count):
+                if done & (1 << i) or (self._requires[i] & done) != self._requires[i]:
+                    continue
+                cost = int(last is not None and models[i] != last)
+                rest_cost, rest = best(done | (1 << i), models[i])
+                candidates.append((cost + rest_cost, (i,) + rest))
+            return min(candidates)
+        
+        _, indices = best(skipped, initial_model)
+        order = [self.phases[i] for i in indices]
+        
+        # Référence: ordre par défaut, précédé de sa propre dernière phase
+        baseline = [self.phase_models[phase] for phase in self.phases if phase not in skip]
+        baseline_initial = baseline[-1] if initial_model is not None and baseline else None
+        return SchedulePlan(
+            order=order,
+            model_swaps=count_model_swaps([self.phase_models[p] for p in order], initial_model),
+            baseline_swaps=count_model_swaps(baseline, baseline_initial),
+        )
@@ -0,0 +1,197 @@
+"""
+Politique de résilience des appels Ollama.
+
+- timeouts adaptatifs par modèle, dérivés des percentiles de latence observés
+- backoff exponentiel avec jitter
+- budget global de retries (les retries ne peuvent pas multiplier la charge)
+- circuit breaker: échec immédiat tant qu'Ollama est indisponible ou saturé
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Délai avant le retry n° attempt (0 = premier): jitter complet sur base * 2^attempt"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class LatencyTracker:
+    """Latences récentes par modèle, pour dériver un timeout adapté"""
+    
+    def __init__(
+        self,
+        default_timeout: float,
+        min_timeout: float = 30.0,
+        multiplier: float = 3.0,
+        percentile: float = 0.95,
+        window: int = 50,
+        min_samples: int = 3,
+    ):
+        """
+        Args:
+            default_timeout: timeout tant que le modèle n'a pas assez de mesures
+                (sert aussi de plafond: un chargement à froid peut être long)
+            min_timeout: plancher du timeout adaptatif
+            multiplier: marge appliquée au percentile observé
+        """
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.multiplier = multiplier
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[str, deque] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+    
+    def models(self) -> list[str]:
+        with self._lock:
+            return list(self._samples)
+    
+    def latency_percentile(self, model: str, percentile: Optional[float] = None) -> Optional[float]:
+        """Percentile des latences du modèle (self.percentile par défaut), None si trop peu de mesures"""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < self.min_samples:
+            return None
+        percentile = self.percentile if percentile is None else percentile
+        index = min(len(samples) - 1, int(round(percentile * (len(samples) - 1))))
+        return samples[index]
+    
+    def timeout_for(self, model: str) -> float:
+        observed = self.latency_percentile(model)
+        if observed is None:
+            return self.default_timeout
+        return min(self.default_timeout, max(self.min_timeout, observed * self.multiplier))
+
+
+class RetryBudget:
+    """
+    Budget global de retries sur une fenêtre glissante: au plus
+    min_retries + ratio * requêtes retries par fenêtre.
+    """
+    
+    def __init__(self, ratio: float = 0.2, min_retries: int = 3, window_seconds: float = 60.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+        self.exhausted = 0
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+        self._lock = threading.Lock()
+    
+    def record_request(self) -> None:
+        with self._lock:
+            self._requests.append(time.monotonic())
+    
+    def try_spend(self) -> bool:
+        """Consomme un retry si le budget le permet"""
+        now = time.monotonic()
+        with self._lock:
+            for events in (self._requests, self._retries):
+                while events and now - events[0] > self.window_seconds:
+                    events.popleft()
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+                self.exhausted += 1
+                return False
+            self._retries.append(now)
+            return True
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur: après failure_threshold échecs consécutifs, les appels
+    échouent immédiatement pendant reset_timeout secondes, puis un appel
+    d'essai (half-open) décide de la réouverture.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Vrai si un appel peut être tenté"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                logger.info("🔌 Circuit Ollama semi-ouvert: appel d'essai")
+            return True
+    
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+    
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("✅ Circuit Ollama refermé")
+            self.state = self.CLOSED
+            self.failures = 0
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                    logger.error(
+                        f"⛔ Circuit Ollama ouvert après {self.failures} échec(s) "
+                        f"(nouvel essai dans {self.reset_timeout:.0f}s)"
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class ResiliencePolicy:
+    """Regroupe timeouts adaptatifs, budget de retries et circuit breaker d'un backend"""
+    
+    def __init__(self, config):
+        """config: OllamaConfig"""
+        self.config = config
+        self.latency = LatencyTracker(
+            default_timeout=config.timeout,
+            min_timeout=config.min_timeout,
+            multiplier=config.timeout_multiplier,
+        )
+        self.retry_budget = RetryBudget(
+            ratio=config.retry_budget_ratio,
+            min_retries=config.retry_budget_min,
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=config.breaker_threshold,
+            reset_timeout=config.breaker_reset_seconds,
+        )
+    
+    def next_delay(self, attempt: int) -> float:
+        return backoff_delay(attempt, self.config.retry_delay, self.config.backoff_cap)
+    
+    def stats(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "circuit_trips": self.breaker.trips,
+            "retry_budget_exhausted": self.retry_budget.exhausted,
+            "timeouts": {
+                model: round(self.latency.timeout_for(model), 1)
+                for model in self.latency.models()
+            },
+        }
@@ -0,0 +1,164 @@
+"""
+Cache persistant des réponses LLM (SQLite, adressé par contenu).
+
+La clé est le hash du digest du modèle, du prompt et des paramètres
+d'échantillonnage (seed inclus): une relance sur les mêmes specs répond en
+quelques millisecondes au lieu de plusieurs minutes. Les entrées sont
+évincées par âge puis par taille (LRU).
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Cache disque des réponses de generate"""
+
+    def __init__(
+        self,
+        path: str = ".cache/llm_responses.sqlite",
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age_seconds: Optional[float] = 7 * 24 * 3600,
+        cache_nondeterministic: bool = True,
+    ):
+        """
+        Args:
+            path: fichier SQLite (créé si absent)
+            max_bytes: taille max cumulée des réponses stockées
+            max_age_seconds: âge max d'une entrée (None = pas d'expiration)
+            cache_nondeterministic: si False, les appels avec temperature > 0
+                sans seed fixé ne sont ni lus ni écrits
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.cache_nondeterministic = cache_nondeterministic
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT,
+                size INTEGER,
+                created REAL,
+                last_access REAL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["ResponseCache"]:
+        """Construit le cache depuis settings.RESPONSE_CACHE (None si désactivé)"""
+        if not config.get("enabled", False):
+            return None
+        options = {k: v for k, v in config.items() if k != "enabled"}
+        return cls(**options)
+
+    @staticmethod
+    def make_key(model_digest: str, prompt: str, params: dict) -> str:
+        """Clé de contenu: sha256(digest modèle, prompt, paramètres)"""
+        material = json.dumps(
+            {"model": model_digest, "prompt": prompt, "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def is_cacheable(self, params: dict) -> bool:
+        """Vrai si un appel avec ces paramètres peut être servi depuis le cache"""
+        if self.cache_nondeterministic:
+            return True
+        return params.get("temperature", 0) == 0 or params.get("seed") is not None
+
+    def get(self, key: str) -> Optional[str]:
+        """Réponse en cache (None si absente ou expirée)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or self._expired(row[1], now):
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Stocke une réponse puis applique l'éviction"""
+        if not response:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, len(response.encode("utf-8")), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.max_age_seconds is not None and now - created > self.max_age_seconds
+
+    def _evict(self, now: float) -> None:
+        """Supprime les entrées expirées puis les moins récemment lues jusqu'à max_bytes"""
+        if self.max_age_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM responses WHERE created < ?", (now - self.max_age_seconds,)
+            )
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        while total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 32"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
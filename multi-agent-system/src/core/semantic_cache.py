@@ -0,0 +1,196 @@
+"""
+Cache sémantique des réponses LLM (prompts quasi identiques).
+
+Le cache exact (ResponseCache) rate le cas courant où les requirements ne
+diffèrent que d'une phrase. Ici, les prompts sont vectorisés via
+/api/embeddings et comparés (similarité cosinus) aux prompts déjà traités du
+même agent; au-dessus du seuil de l'agent, la réponse en cache est réutilisée.
+
+Dépendance optionnelle: numpy.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy est optionnel: le cache sémantique est alors indisponible
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Index NumPy des embeddings de prompts, par agent et par modèle"""
+    
+    def __init__(
+        self,
+        client,
+        embedding_model: str = "nomic-embed-text",
+        thresholds: Optional[dict] = None,
+        max_entries: int = 500,
+        path: Optional[str] = None,
+    ):
+        """
+        Args:
+            client: OllamaClient (pour /api/embeddings)
+            embedding_model: modèle d'embeddings Ollama
+            thresholds: {agent: similarité minimale}; seuls ces agents utilisent le cache
+            max_entries: nombre max d'entrées (éviction LRU au-delà)
+            path: fichier .npz de persistance (None = en mémoire uniquement)
+        """
+        if np is None:
+            raise ImportError("Le cache sémantique nécessite numpy (pip install numpy)")
+        
+        self.client = client
+        self.embedding_model = embedding_model
+        self.thresholds = dict(thresholds or {})
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self._vectors = None  # matrice (capacité, dimension), lignes normalisées
+        self._entries: list[dict] = []
+        self._pending: dict[str, "np.ndarray"] = {}
+        self._lock = threading.Lock()
+        
+        if self.path and self.path.exists():
+            self._load()
+    
+    @classmethod
+    def from_config(cls, client, config: dict) -> Optional["SemanticCache"]:
+        """Construit le cache depuis settings.SEMANTIC_CACHE (None si désactivé)"""
+        if not config.get("enabled", False):
+            return None
+        options = {k: v for k, v in config.items() if k != "enabled"}
+        return cls(client, **options)
+    
+    def enabled_for(self, agent: str) -> bool:
+        return agent in self.thresholds
+    
+    def lookup(self, agent: str, model: str, prompt: str) -> Optional[str]:
+        """Réponse d'un prompt similaire du même agent/modèle (None si aucun au-dessus du seuil)"""
+        vector = self._embed(prompt)
+        if vector is None:
+            return None
+        
+        with self._lock:
+            if len(self._pending) > 64:  # vecteurs jamais stockés (réponses vides)
+                self._pending.clear()
+            self._pending[self._prompt_key(agent, prompt)] = vector
+            best_index, best_score = self._best_match(agent, model, vector)
+            
+            if best_index is None or best_score < self.thresholds[agent]:
+                self.misses += 1
+                return None
+            
+            entry = self._entries[best_index]
+            entry["last_access"] = time.time()
+            self.hits += 1
+            self.seconds_saved += entry["seconds"]
+        
+        logger.info(f"🧠 [{agent}] Réponse réutilisée (similarité {best_score:.3f})")
+        return entry["response"]
+    
+    def store(self, agent: str, model: str, prompt: str, response: str, seconds: float) -> None:
+        """Ajoute une réponse générée (seconds: durée de génération économisée par un futur hit)"""
+        if not response:
+            return
+        
+        with self._lock:
+            vector = self._pending.pop(self._prompt_key(agent, prompt), None)
+        if vector is None:
+            vector = self._embed(prompt)
+            if vector is None:
+                return
+        
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._evict_lru()
+            self._append(vector, {
+                "agent": agent,
+                "model": model,
+                "response": response,
+                "seconds": seconds,
+                "last_access": time.time(),
+            })
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "llm_seconds_saved": round(self.seconds_saved, 1),
+        }
+    
+    def save(self) -> None:
+        """Persiste l'index sur disque (si un chemin est configuré)"""
+        if not self.path or self._vectors is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            np.savez(
+                self.path,
+                vectors=self._vectors[:len(self._entries)],
+                entries=np.array(json.dumps(self._entries, ensure_ascii=False)),
+            )
+    
+    def _load(self) -> None:
+        try:
+            with np.load(self.path) as data:
+                vectors = data["vectors"]
+                entries = json.loads(str(data["entries"]))
+        except Exception as e:
+            logger.warning(f"Index sémantique illisible ({self.path}): {e}")
+            return
+        for vector, entry in zip(vectors, entries):
+            self._append(vector, entry)
+    
+    def _embed(self, text: str):
+        embedding = self.client.embed(self.embedding_model, text)
+        if not embedding:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    
+    def _best_match(self, agent: str, model: str, vector) -> tuple[Optional[int], float]:
+        candidates = [
+            i for i, entry in enumerate(self._entries)
+            if entry["agent"] == agent and entry["model"] == model
+        ]
+        if not candidates or self._vectors.shape[1] != vector.shape[0]:
+            return None, 0.0
+        
+        scores = self._vectors[candidates] @ vector
+        best = int(np.argmax(scores))
+        return candidates[best], float(scores[best])
+    
+    def _append(self, vector, entry: dict) -> None:
+        count = len(self._entries)
+        if self._vectors is None:
+            self._vectors = np.zeros((max(16, self.max_entries // 4), vector.shape[0]), dtype=np.float32)
+        elif count == self._vectors.shape[0]:
+            self._vectors = np.concatenate([self._vectors, np.zeros_like(self._vectors)])
+        self._vectors[count] = vector
+        self._entries.append(entry)
+    
+    def _evict_lru(self) -> None:
+        """Retire l'entrée la moins récemment utilisée (remplacée par la dernière ligne)"""
+        oldest = min(range(len(self._entries)), key=lambda i: self._entries[i]["last_access"])
+        last = len(self._entries) - 1
+        self._vectors[oldest] = self._vectors[last]
+        self._entries[oldest] = self._entries[last]
+        self._entries.pop()
+    
+    @staticmethod
+    def _prompt_key(agent: str, prompt: str) -> str:
+        return agent + ":" + hashlib.sha256(prompt.encode("utf-8")).hexdigest()
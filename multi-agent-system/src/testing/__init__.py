@@ -0,0 +1,11 @@
+"""
+__init__ pour le package testing
+"""
+
+from .mock_ollama import MockOllamaServer, ModelProfile, FaultProfile
+
+__all__ = [
+    "MockOllamaServer",
+    "ModelProfile",
+    "FaultProfile"
+]
@@ -0,0 +1,648 @@
+"""
+Serveur Ollama simulé (bibliothèque standard uniquement).
+
+Permet de mesurer et de tester OllamaClient / MultiAgentOrchestrator sans
+modèle réel. Implémente /api/tags, /api/generate (flux ou non), /api/chat,
+/api/embeddings, /api/ps et /api/pull, et simule par modèle:
+- le temps de chargement à froid
+- les débits d'évaluation du prompt et de génération (tokens/s)
+- le nombre de requêtes traitées en parallèle (OLLAMA_NUM_PARALLEL)
+- les sorties JSON (champ format: "json" ou schéma)
+
+Des pannes peuvent être injectées (requête qui ne répond pas, erreur 500,
+flux tronqué). Réponses et pannes sont déterministes: le texte dépend
+uniquement du modèle et du prompt, les pannes d'une graine.
+
+Usage:
+    python -m src.testing.mock_ollama --port 11434 --time-scale 0.1
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+from ..config.settings import AGENT_MODELS
+
+logger = logging.getLogger(__name__)
+
+NANOSECONDS = 1_000_000_000
+CHARS_PER_TOKEN = 4  # Même approximation que le reste du projet
+
+
+@dataclass
+class ModelProfile:
+    """Caractéristiques simulées d'un modèle"""
+    name: str
+    load_seconds: float = 2.0             # Chargement à froid
+    prompt_tokens_per_second: float = 200.0
+    eval_tokens_per_second: float = 20.0
+    response_tokens: int = 256            # Longueur des réponses libres
+    parallel: int = 1                     # Requêtes traitées simultanément
+    size: int = 4_000_000_000             # Octets en mémoire (/api/ps)
+    embedding_dim: int = 256
+    
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.name.encode()).hexdigest()
+
+
+@dataclass
+class FaultProfile:
+    """Taux de pannes injectées (tirage déterministe depuis seed)"""
+    timeout_rate: float = 0.0    # Requête qui ne répond pas pendant hang_seconds
+    error_rate: float = 0.0      # Réponse HTTP 500
+    truncate_rate: float = 0.0   # Flux (ou corps JSON) coupé avant la fin
+    hang_seconds: float = 30.0
+    seed: int = 0
+
+
+def default_profiles() -> dict[str, ModelProfile]:
+    """Un profil par modèle d'agent (settings.AGENT_MODELS) + modèle d'embeddings"""
+    names = list(dict.fromkeys(AGENT_MODELS.values())) + ["nomic-embed-text"]
+    return {name: ModelProfile(name) for name in names}
+
+
+def _stable_hash(*parts: str) -> int:
+    digest = hashlib.sha256("\x00".join(parts).encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def default_response(model: str, prompt: str, profile: ModelProfile) -> str:
+    """
+    Réponse déterministe au format attendu par l'agent (détecté dans le
+    prompt): score et problèmes pour la revue et l'audit sécurité, suivis
+    d'une synthèse en prose (comme les vrais modèles), texte markdown de
+    profile.response_tokens tokens sinon.
+    """
+    seed = _stable_hash(model, prompt)
+    rng = random.Random(seed)
+    words = ("module", "service", "interface", "données", "requête", "cache", "erreur",
+             "configuration", "test", "déploiement", "client", "serveur", "journal")
+    synthesis = "\nSynthèse: " + " ".join(rng.choice(words) for _ in range(120)) + ".\n"
+    if "SCORE GLOBAL" in prompt:
+        return (
+            f"SCORE GLOBAL: {55 + seed % 40}/100\n"
+            "PROBLÈMES DÉTECTÉS:\n"
+            f"- Gestion d'erreurs incomplète dans le module {rng.randint(1, 9)}\n"
+            "- Type hints manquants sur les fonctions publiques\n"
+            "\n"
+            "RECOMMANDATIONS:\n"
+            "- Ajouter des tests sur les cas limites\n"
+            "- Documenter les interfaces publiques\n"
+            + synthesis
+        )
+    if "VULNÉRABILITÉS" in prompt:
+        return (
+            f"RISQUE MAXIMUM: {5 + seed % 30}/100\n"
+            "\n"
+            "VULNÉRABILITÉS TROUVÉES:\n"
+            f"- Validation des entrées insuffisante (endpoint {rng.randint(1, 9)})\n"
+            "\n"
+            "CORRECTIONS RECOMMANDÉES:\n"
+            "- Valider et échapper toutes les entrées utilisateur\n"
+            + synthesis
+        )
+    budget = profile.response_tokens * CHARS_PER_TOKEN
+    if "CODE ACTUEL" in prompt:
+        return _code_patch_response(prompt, rng)
+    if "développeur expert" in prompt:
+        return _code_response(budget, rng, words)
+    parts, section = [], 1
+    while sum(len(p) for p in parts) < budget:
+        parts.append(f"## Section {section}\n")
+        parts.append(" ".join(rng.choice(words) for _ in range(40)) + ".\n\n")
+        section += 1
+    return "".join(parts)[:budget]
+
+
+def _code_response(budget: int, rng: random.Random, words: tuple) -> str:
+    """Code Python valide, fichier par fichier ("### `chemin`" puis le bloc)"""
+    files, size, index = [], 0, 1
+    while size < budget:
+        lines = [f'"""Module {index}: {rng.choice(words)}."""', ""]
+        for function in range(1, 6):
+            lines += [f"def {rng.choice(words)}_{function}(valeur: str) -> str:",
+                      f'    return valeur + " {" ".join(rng.choice(words) for _ in range(12))}"', ""]
+        block = f"### `app/module_{index}.py`\n```python\n" + "\n".join(lines).rstrip() + "\n```\n\n"
+        files.append(block)
+        size += len(block)
+        index += 1
+    return "".join(files)
+
+
+def _code_patch_response(prompt: str, rng: random.Random) -> str:
+    """Diff unifié qui ajoute une ligne après la première ligne du premier fichier du CODE ACTUEL"""
+    match = re.search(r"### `([^`]+)`\n```\w*\n([^\n]*)\n", prompt.split("CODE ACTUEL", 1)[1])
+    if not match:
+        return "Aucune modification nécessaire."
+    path, first_line = match.groups()
+    return (
+        "```diff\n"
+        f"--- a/{path}\n+++ b/{path}\n"
+        "@@ -1,1 +1,2 @@\n"
+        f" {first_line}\n"
+        f"+# Correctif {rng.randint(1, 999)}: validation des entrées\n"
+        "```\n"
+    )
+
+
+def structured_response(text: str, format) -> str:
+    """
+    Réponse texte convertie au format JSON demandé: avec un schéma, les
+    propriétés entières reçoivent la note "N/100" du texte et les listes ses
+    sections à puces, dans l'ordre; avec "json", le texte est enveloppé.
+    Un texte déjà JSON (responder personnalisé) est renvoyé tel quel.
+    """
+    if text.lstrip().startswith("{"):
+        return text
+    properties = format.get("properties", {}) if isinstance(format, dict) else {}
+    if not properties:
+        return json.dumps({"response": text}, ensure_ascii=False)
+    note = re.search(r"(\d+)/100", text)
+    sections = [
+        [line.strip()[2:] for line in block.splitlines() if line.strip().startswith("- ")]
+        for block in re.split(r"\n(?=[A-ZÉÈ][A-ZÉÈ ]+:)", text)
+    ]
+    sections = [items for items in sections if items]
+    data = {}
+    for name, schema in properties.items():
+        if schema.get("type") in ("integer", "number"):
+            data[name] = int(note.group(1)) if note else 0
+        elif schema.get("type") == "array":
+            data[name] = sections.pop(0) if sections else []
+        else:
+            data[name] = ""
+    return json.dumps(data, ensure_ascii=False)
+
+
+def embedding_vector(text: str, dim: int) -> list[float]:
+    """
+    Embedding déterministe par hachage des mots (normalisé): deux textes
+    proches donnent des vecteurs proches, comme un vrai modèle d'embeddings.
+    """
+    vector = [0.0] * dim
+    for word in re.findall(r"\w+", text.lower()):
+        h = _stable_hash(word)
+        vector[h % dim] += 1.0 if (h >> 32) & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class MockOllamaServer:
+    """
+    Serveur HTTP simulant Ollama, lancé dans un thread.
+
+    time_scale multiplie toutes les durées simulées (0 = réponses
+    immédiates, compteurs de durée inchangés dans les réponses).
+    """
+    
+    def __init__(
+        self,
+        models: Optional[dict[str, ModelProfile]] = None,
+        faults: Optional[FaultProfile] = None,
+        time_scale: float = 1.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        responder: Callable[[str, str, ModelProfile], str] = default_response,
+        max_loaded_models: Optional[int] = None,
+    ):
+        self.models = dict(models) if models is not None else default_profiles()
+        self.faults = faults or FaultProfile()
+        self.time_scale = time_scale
+        self.responder = responder
+        self.max_loaded_models = max_loaded_models
+        self.loaded: dict[str, float] = {}          # modèle -> expiration (time.time)
+        self.requests: dict[str, int] = {}          # chemin -> nombre
+        self.faults_injected: dict[str, int] = {}
+        self.max_concurrency = 0
+        self._active = 0
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._load_locks: dict[str, threading.Lock] = {}
+        self._rng = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "MockOllamaServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-ollama", daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 Ollama simulé sur {self.url} ({len(self.models)} modèles)")
+        return self
+    
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+    
+    def __enter__(self) -> "MockOllamaServer":
+        return self.start()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "faults": dict(self.faults_injected),
+                "max_concurrency": self.max_concurrency,
+                "loaded_models": sorted(self.loaded),
+            }
+    
+    # ------------------------------------------------------------------
+    # Simulation
+    # ------------------------------------------------------------------
+    
+    def profile(self, model: str) -> Optional[ModelProfile]:
+        name = model.split(":")[0]
+        return self.models.get(name)
+    
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0 and self.time_scale > 0:
+            time.sleep(seconds * self.time_scale)
+    
+    def count(self, path: str) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+    
+    def draw_fault(self) -> Optional[str]:
+        """Panne à injecter pour la requête (tirage déterministe dans l'ordre des requêtes)"""
+        faults = self.faults
+        with self._lock:
+            roll = self._rng.random()
+            for kind, rate in (
+                ("timeout", faults.timeout_rate),
+                ("error", faults.error_rate),
+                ("truncate", faults.truncate_rate),
+            ):
+                if roll < rate:
+                    self.faults_injected[kind] = self.faults_injected.get(kind, 0) + 1
+                    return kind
+                roll -= rate
+        return None
+    
+    def slot(self, profile: ModelProfile) -> threading.BoundedSemaphore:
+        with self._lock:
+            if profile.name not in self._slots:
+                self._slots[profile.name] = threading.BoundedSemaphore(profile.parallel)
+                self._load_locks[profile.name] = threading.Lock()
+            return self._slots[profile.name]
+    
+    def enter(self) -> None:
+        with self._lock:
+            self._active += 1
+            self.max_concurrency = max(self.max_concurrency, self._active)
+    
+    def leave(self) -> None:
+        with self._lock:
+            self._active -= 1
+    
+    def ensure_loaded(self, profile: ModelProfile, keep_alive) -> int:
+        """Charge le modèle si besoin (évince le plus ancien au-delà de max_loaded_models), durée en ns"""
+        with self._load_locks[profile.name]:
+            with self._lock:
+                now = time.time()
+                self.loaded = {m: exp for m, exp in self.loaded.items() if exp > now}
+                cold = profile.name not in self.loaded
+            if cold:
+                self.sleep(profile.load_seconds)
+            with self._lock:
+                if cold and self.max_loaded_models and len(self.loaded) >= self.max_loaded_models:
+                    oldest = min(self.loaded, key=self.loaded.get)
+                    del self.loaded[oldest]
+                self.loaded[profile.name] = time.time() + _keep_alive_seconds(keep_alive)
+        return int(profile.load_seconds * NANOSECONDS) if cold else 0
+    
+    def unload(self, profile: ModelProfile) -> None:
+        with self._lock:
+            self.loaded.pop(profile.name, None)
+
+
+def _keep_alive_seconds(keep_alive) -> float:
+    """keep_alive Ollama: secondes, durée "5m"/"1h", négatif = illimité (défaut 5 min)"""
+    if keep_alive is None:
+        return 300.0
+    if isinstance(keep_alive, str):
+        match = re.fullmatch(r"(-?\d+(?:\.\d+)?)([smh]?)", keep_alive.strip())
+        if not match:
+            return 300.0
+        keep_alive = float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+    return float("inf") if keep_alive < 0 else float(keep_alive)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+    
+    def handle(self) -> None:
+        # Un client qui abandonne un flux (arrêt anticipé) ferme la connexion keep-alive
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("Connexion fermée par le client")
+    
+    @property
+    def mock(self) -> MockOllamaServer:
+        return self.server.mock
+    
+    # ------------------------------------------------------------------
+    # Routage
+    # ------------------------------------------------------------------
+    
+    def do_GET(self) -> None:
+        self.mock.count(self.path)
+        if self.path == "/api/tags":
+            self._send_json({"models": [
+                {
+                    "name": f"{p.name}:latest",
+                    "model": f"{p.name}:latest",
+                    "digest": p.digest,
+                    "size": p.size,
+                }
+                for p in self.mock.models.values()
+            ]})
+        elif self.path == "/api/ps":
+            now = time.time()
+            with self.mock._lock:
+                loaded = {m: exp for m, exp in self.mock.loaded.items() if exp > now}
+            self._send_json({"models": [
+                {
+                    "name": f"{name}:latest",
+                    "model": f"{name}:latest",
+                    "size": self.mock.models[name].size,
+                    "digest": self.mock.models[name].digest,
+                    "expires_at": _expires_at(exp),
+                }
+                for name, exp in loaded.items()
+            ]})
+        elif self.path in ("/", "/api/version"):
+            self._send_json({"version": "mock"})
+        else:
+            self._send_json({"error": "not found"}, 404)
+    
+    def do_POST(self) -> None:
+        self.mock.count(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json({"error": "invalid JSON"}, 400)
+            return
+        handlers = {
+            "/api/generate": self._generate,
+            "/api/chat": self._chat,
+            "/api/embeddings": self._embeddings,
+            "/api/embed": self._embeddings,
+            "/api/pull": self._pull,
+        }
+        handler = handlers.get(self.path)
+        if handler is None:
+            self._send_json({"error": "not found"}, 404)
+            return
+        self.mock.enter()
+        try:
+            handler(body)
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("Client déconnecté pendant la réponse")
+        finally:
+            self.mock.leave()
+    
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+    
+    def _generate(self, body: dict) -> None:
+        self._completion(body, body.get("prompt", ""), chat=False)
+    
+    def _chat(self, body: dict) -> None:
+        prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+        self._completion(body, prompt, chat=True)
+    
+    def _completion(self, body: dict, prompt: str, chat: bool) -> None:
+        mock = self.mock
+        model = body.get("model", "")
+        profile = mock.profile(model)
+        if profile is None:
+            self._send_json({"error": f"model '{model}' not found, try pulling it first"}, 404)
+            return
+        
+        # Requête de chargement / déchargement seule (prompt vide)
+        if not prompt and not chat:
+            if body.get("keep_alive") == 0:
+                mock.unload(profile)
+            else:
+                with mock.slot(profile):
+                    mock.ensure_loaded(profile, body.get("keep_alive"))
+            self._send_json({"model": model, "created_at": _now(), "response": "", "done": True})
+            return
+        
+        fault = mock.draw_fault()
+        if fault == "timeout":
+            time.sleep(mock.faults.hang_seconds)  # Durée réelle, indépendante de time_scale
+            self.close_connection = True
+            return
+        if fault == "error":
+            self._send_json({"error": "simulated internal error"}, 500)
+            return
+        
+        with mock.slot(profile):
+            load_ns = mock.ensure_loaded(profile, body.get("keep_alive"))
+            options = body.get("options") or {}
+            text = mock.responder(model, prompt, profile)
+            if body.get("format"):
+                text = structured_response(text, body["format"])
+            text, done_reason = _apply_options(text, options)
+            
+            context = list(body.get("context") or [])
+            prompt_tokens = max(1, len(prompt) // CHARS_PER_TOKEN)
+            eval_tokens = max(1, len(text) // CHARS_PER_TOKEN)
+            prompt_seconds = prompt_tokens / profile.prompt_tokens_per_second
+            eval_seconds = eval_tokens / profile.eval_tokens_per_second
+            final = {
+                "model": model,
+                "created_at": _now(),
+                "done": True,
+                "done_reason": done_reason,
+                "total_duration": load_ns + int((prompt_seconds + eval_seconds) * NANOSECONDS),
+                "load_duration": load_ns,
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": int(prompt_seconds * NANOSECONDS),
+                "eval_count": eval_tokens,
+                "eval_duration": int(eval_seconds * NANOSECONDS),
+            }
+            if not chat:
+                final["context"] = context + list(range(len(context), len(context) + prompt_tokens + eval_tokens))
+            
+            mock.sleep(prompt_seconds)
+            if body.get("stream", True):
+                self._stream(model, text, final, chat, eval_seconds, truncate=fault == "truncate")
+            else:
+                mock.sleep(eval_seconds)
+                final.update(_message(text, chat))
+                payload = json.dumps(final).encode()
+                if fault == "truncate":
+                    self._send_truncated(payload)
+                else:
+                    self._send_json(final)
+    
+    def _stream(self, model: str, text: str, final: dict, chat: bool, eval_seconds: float, truncate: bool) -> None:
+        chunks = [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)] or [""]
+        per_chunk = eval_seconds / len(chunks)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        stop_at = len(chunks) // 2 if truncate else len(chunks)
+        for chunk in chunks[:stop_at]:
+            self.mock.sleep(per_chunk)
+            line = {"model": model, "created_at": _now(), "done": False, **_message(chunk, chat)}
+            self._write_chunk(json.dumps(line).encode() + b"\n")
+        if truncate:
+            self.close_connection = True
+            return
+        self._write_chunk(json.dumps({**final, **_message("", chat)}).encode() + b"\n")
+        self._write_chunk(b"")
+    
+    def _embeddings(self, body: dict) -> None:
+        model = body.get("model", "")
+        profile = self.mock.profile(model)
+        if profile is None:
+            self._send_json({"error": f"model '{model}' not found, try pulling it first"}, 404)
+            return
+        with self.mock.slot(profile):
+            self.mock.ensure_loaded(profile, body.get("keep_alive"))
+            if self.path == "/api/embed":
+                inputs = body.get("input", "")
+                inputs = [inputs] if isinstance(inputs, str) else inputs
+                self._send_json({"model": model, "embeddings": [embedding_vector(t, profile.embedding_dim) for t in inputs]})
+            else:
+                self._send_json({"embedding": embedding_vector(body.get("prompt", ""), profile.embedding_dim)})
+    
+    def _pull(self, body: dict) -> None:
+        name = (body.get("model") or body.get("name") or "").split(":")[0]
+        if name and name not in self.mock.models:
+            self.mock.models[name] = ModelProfile(name)
+        statuses = [{"status": "pulling manifest"}, {"status": "verifying sha256 digest"}, {"status": "success"}]
+        if body.get("stream", True):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for status in statuses:
+                self._write_chunk(json.dumps(status).encode() + b"\n")
+            self._write_chunk(b"")
+        else:
+            self._send_json(statuses[-1])
+    
+    # ------------------------------------------------------------------
+    # Écriture HTTP
+    # ------------------------------------------------------------------
+    
+    def _send_json(self, data: dict, status: int = 200) -> None:
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def _send_truncated(self, payload: bytes) -> None:
+        """Annonce le corps complet mais n'en envoie que la moitié, puis coupe"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload[: len(payload) // 2])
+        self.close_connection = True
+    
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+def _message(text: str, chat: bool) -> dict:
+    return {"message": {"role": "assistant", "content": text}} if chat else {"response": text}
+
+
+def _apply_options(text: str, options: dict) -> tuple[str, str]:
+    """Applique stop et num_predict (tokens) à la réponse simulée: (texte, done_reason)"""
+    for stop in options.get("stop") or []:
+        if stop and stop in text:
+            text = text[: text.index(stop)]
+    num_predict = options.get("num_predict")
+    if num_predict and num_predict > 0 and len(text) > num_predict * CHARS_PER_TOKEN:
+        return text[: num_predict * CHARS_PER_TOKEN], "length"
+    return text, "stop"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _expires_at(expiry: float) -> str:
+    if math.isinf(expiry):
+        return (datetime.now(timezone.utc) + timedelta(days=3650)).isoformat()
+    return datetime.fromtimestamp(expiry, timezone.utc).isoformat()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serveur Ollama simulé")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiplicateur des durées simulées (0 = immédiat)")
+    parser.add_argument("--load-seconds", type=float, default=2.0)
+    parser.add_argument("--prompt-tps", type=float, default=200.0, help="Tokens/s d'évaluation du prompt")
+    parser.add_argument("--eval-tps", type=float, default=20.0, help="Tokens/s de génération")
+    parser.add_argument("--parallel", type=int, default=1, help="Requêtes simultanées par modèle")
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    models = {
+        name: ModelProfile(
+            name,
+            load_seconds=args.load_seconds,
+            prompt_tokens_per_second=args.prompt_tps,
+            eval_tokens_per_second=args.eval_tps,
+            parallel=args.parallel,
+        )
+        for name in default_profiles()
+    }
+    faults = FaultProfile(
+        timeout_rate=args.timeout_rate,
+        error_rate=args.error_rate,
+        truncate_rate=args.truncate_rate,
+        seed=args.seed,
+    )
+    server = MockOllamaServer(models, faults, args.time_scale, args.host, args.port)
+    server.start()
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        logger.info("Arrêt du serveur simulé")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
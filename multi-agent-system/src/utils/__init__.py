@@ -4,6 +4,10 @@ __init__ pour le package utils
 
 from .helpers import retry_with_backoff, format_tokens, truncate_text
 from .exporters import SolutionExporter, ReportGenerator, Dashboard
+from .streaming import StreamEvent, ResponseBuffer, IncrementalParser
+from .llm_usage import LLMUsage, UsageAggregator
+from .structured_output import parse_json_object, validate_schema
+from .code_patch import PatchError, PatchStats, apply_patch, render_files, split_files
 
 __all__ = [
     "retry_with_backoff",
@@ -11,5 +15,17 @@ __all__ = [
     "truncate_text",
     "SolutionExporter",
     "ReportGenerator",
-    "Dashboard"
+    "Dashboard",
+    "StreamEvent",
+    "ResponseBuffer",
+    "IncrementalParser",
+    "LLMUsage",
+    "UsageAggregator",
+    "parse_json_object",
+    "validate_schema",
+    "PatchError",
+    "PatchStats",
+    "apply_patch",
+    "render_files",
+    "split_files"
 ]
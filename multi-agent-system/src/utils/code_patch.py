@@ -0,0 +1,262 @@
+"""
+Code découpé en fichiers et application de correctifs.
+
+La réponse du Développeur est lue comme une suite de fichiers (bloc de code
+précédé de son chemin: "### `app/main.py`", "**app/main.py**",
+"FICHIER: app/main.py"...). En mode raffinement, il ne renvoie que des
+modifications, fichier par fichier:
+- un diff unifié (--- a/chemin, +++ b/chemin, hunks @@), appliqué par
+  recherche des lignes de contexte (les numéros de ligne des LLM sont
+  rarement exacts)
+- ou le remplacement complet d'un fichier (nouveau fichier compris)
+
+Un correctif qui ne s'applique pas, ou qui casse la syntaxe d'un fichier
+Python jusque-là valide, lève PatchError: l'appelant régénère le code entier.
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Chemin de fichier plausible: au moins un point d'extension ou un nom connu
+_PATH = r"[\w.\-/]+\.[A-Za-z0-9]{1,8}|Dockerfile|Makefile"
+_FENCE = re.compile(r"^```[ \t]*([\w+\-.]*)[^\n]*\n(.*?)^```[ \t]*$", re.MULTILINE | re.DOTALL)
+_HEADER = re.compile(
+    rf"^\s*(?:#+\s*|\*\*|[-*]\s+)?(?:(?:fichier|file)\s*:?\s*)?[`*]*({_PATH})[`*]*\s*:?\s*\**\s*$",
+    re.IGNORECASE
+)
+_COMMENT_PATH = re.compile(rf"^\s*(?:#|//|--|<!--)\s*(?:(?:fichier|file)\s*:\s*)?({_PATH})\s*(?:-->)?\s*$", re.IGNORECASE)
+_HUNK = re.compile(r"^@@[^@]*?(?:-(\d+)(?:,\d+)?)?[^@]*@@")
+_EXTENSIONS = {"python": "py", "py": "py", "javascript": "js", "typescript": "ts", "bash": "sh", "sh": "sh",
+               "yaml": "yaml", "yml": "yaml", "json": "json", "toml": "toml", "sql": "sql", "go": "go",
+               "rust": "rs", "java": "java", "dockerfile": "Dockerfile"}
+_LANGUAGES = {"py": "python", "js": "javascript", "ts": "typescript", "sh": "bash", "yml": "yaml",
+              "rs": "rust", "md": "markdown", "txt": "text"}
+
+
+class PatchError(ValueError):
+    """Correctif inapplicable ou invalide"""
+
+
+@dataclass
+class PatchStats:
+    """Bilan d'un correctif appliqué"""
+    files_changed: list = field(default_factory=list)
+    files_replaced: int = 0
+    hunks: int = 0
+    lines_added: int = 0
+    lines_removed: int = 0
+    
+    def to_dict(self) -> dict:
+        return {
+            "files_changed": list(self.files_changed),
+            "files_replaced": self.files_replaced,
+            "hunks": self.hunks,
+            "lines_added": self.lines_added,
+            "lines_removed": self.lines_removed,
+        }
+
+
+def split_files(text: str) -> dict:
+    """
+    {chemin: contenu} des blocs de code de text, dans l'ordre. Un bloc sans
+    chemin reçoit un nom générique (bloc_N.ext); un texte sans bloc de code
+    devient un fichier unique "code".
+    """
+    files: dict[str, str] = {}
+    unnamed = 0
+    for match in _FENCE.finditer(text):
+        language, body = match.group(1).lower(), match.group(2)
+        if language in ("diff", "patch"):
+            continue
+        path = _path_before(text, match.start()) or _path_in_first_line(body)
+        if path and _path_in_first_line(body) == path:
+            body = body.split("\n", 1)[1] if "\n" in body else ""
+        if not path:
+            unnamed += 1
+            path = f"bloc_{unnamed}.{_EXTENSIONS.get(language, language or 'txt')}"
+        files[path] = body.rstrip("\n")
+    if not files and text.strip():
+        files["code"] = text.strip("\n")
+    return files
+
+
+def render_files(files: dict) -> str:
+    """Rendu markdown canonique: "### `chemin`" puis le bloc de code"""
+    parts = []
+    for path, content in files.items():
+        language = _LANGUAGES.get(path.rsplit(".", 1)[-1].lower(), "") if "." in path else ""
+        parts.append(f"### `{path}`\n```{language}\n{content}\n```")
+    return "\n\n".join(parts) + "\n"
+
+
+def apply_patch(files: dict, patch: str) -> tuple:
+    """
+    Applique patch (diffs unifiés et/ou fichiers complets) à files.
+    Retourne (nouveaux fichiers, PatchStats); lève PatchError sinon.
+    """
+    result = dict(files)
+    stats = PatchStats()
+    
+    for path, hunks, deleted in _parse_diffs(patch):
+        if deleted:
+            if path not in result:
+                raise PatchError(f"{path}: suppression d'un fichier inconnu")
+            stats.lines_removed += len(result.pop(path).split("\n"))
+        else:
+            target = _resolve(path, result)
+            original = result.get(target, "")
+            result[target] = _apply_hunks(target, original, hunks, stats)
+            path = target
+        stats.hunks += len(hunks)
+        stats.files_changed.append(path)
+    
+    replacements = {path: body for path, body in split_files(_without_diffs(patch)).items()
+                    if not path.startswith("bloc_") and path != "code"}
+    for path, content in replacements.items():
+        target = _resolve(path, result)
+        previous = result.get(target, "").split("\n") if target in result else []
+        stats.lines_removed += len(previous)
+        stats.lines_added += len(content.split("\n"))
+        stats.files_replaced += 1
+        stats.files_changed.append(target)
+        result[target] = content
+    
+    if not stats.files_changed:
+        raise PatchError("aucune modification reconnue (ni diff unifié, ni fichier complet)")
+    errors = validate_files(result, files, stats.files_changed)
+    if errors:
+        raise PatchError("; ".join(errors))
+    return result, stats
+
+
+def validate_files(files: dict, previous: Optional[dict] = None, changed=None) -> list:
+    """Erreurs de syntaxe des fichiers Python modifiés (seulement s'ils étaient valides avant)"""
+    errors = []
+    for path in changed if changed is not None else files:
+        if not path.endswith(".py") or path not in files:
+            continue
+        before = (previous or {}).get(path)
+        if before is not None and _syntax_error(before):
+            continue  # Déjà invalide avant le correctif: pas de régression
+        error = _syntax_error(files[path])
+        if error:
+            errors.append(f"{path}: {error}")
+    return errors
+
+
+def _syntax_error(source: str) -> Optional[str]:
+    try:
+        ast.parse(source)
+    except SyntaxError as e:
+        return f"syntaxe invalide ligne {e.lineno} ({e.msg})"
+    return None
+
+
+def _path_before(text: str, position: int) -> Optional[str]:
+    """Chemin annoncé sur l'une des deux lignes non vides précédant un bloc"""
+    preceding = [line for line in text[:position].split("\n")[-4:] if line.strip()][-2:]
+    for line in reversed(preceding):
+        match = _HEADER.match(line)
+        if match:
+            return match.group(1).removeprefix("./")
+    return None
+
+
+def _path_in_first_line(body: str) -> Optional[str]:
+    match = _COMMENT_PATH.match(body.split("\n", 1)[0])
+    return match.group(1) if match else None
+
+
+def _resolve(path: str, files: dict) -> str:
+    """Fichier existant désigné par path (chemin exact, sinon même suffixe)"""
+    if path in files:
+        return path
+    matches = [name for name in files if name.endswith("/" + path) or path.endswith("/" + name)]
+    return matches[0] if len(matches) == 1 else path
+
+
+def _without_diffs(patch: str) -> str:
+    """patch sans ses blocs ```diff (pour y chercher les fichiers complets)"""
+    return _FENCE.sub(lambda m: "" if m.group(1).lower() in ("diff", "patch") else m.group(0), patch)
+
+
+def _parse_diffs(patch: str) -> list:
+    """[(chemin, hunks, supprimé)]; hunk = {"line": ligne annoncée, "lines": [(préfixe, texte)]}"""
+    blocks = [m.group(2) for m in _FENCE.finditer(patch) if m.group(1).lower() in ("diff", "patch")]
+    if not blocks and re.search(r"^\+\+\+ ", patch, re.MULTILINE):
+        blocks = [patch]  # Diff brut, hors bloc de code
+    
+    diffs = []
+    for block in blocks:
+        path, deleted, hunks, hunk = None, False, [], None
+        lines = block.split("\n")
+        for index, line in enumerate(lines):
+            if line.startswith("--- ") and index + 1 < len(lines) and lines[index + 1].startswith("+++ "):
+                if path and hunks:
+                    diffs.append((path, hunks, deleted))
+                path, deleted, hunks, hunk = None, False, [], None
+                continue
+            if line.startswith("+++ "):
+                target = line[4:].split("\t")[0].strip()
+                deleted = target == "/dev/null"
+                if deleted:
+                    target = lines[index - 1][4:].split("\t")[0].strip() if index else ""
+                path = re.sub(r"^[ab]/", "", target)
+                continue
+            if path is None:
+                continue
+            hunk_header = _HUNK.match(line)
+            if hunk_header:
+                hunk = {"line": int(hunk_header.group(1) or 0), "lines": []}
+                hunks.append(hunk)
+                continue
+            if hunk is None or line.startswith("\\"):  # "\ No newline at end of file"
+                continue
+            prefix = line[:1] if line[:1] in ("+", "-", " ") else " "
+            hunk["lines"].append((prefix, line[1:] if line[:1] in ("+", "-", " ") else line))
+        if path and (hunks or deleted):
+            diffs.append((path, hunks, deleted))
+    return diffs
+
+
+def _apply_hunks(path: str, original: str, hunks: list, stats: PatchStats) -> str:
+    lines = original.split("\n") if original else []
+    cursor = 0
+    for number, hunk in enumerate(hunks, 1):
+        body = hunk["lines"]
+        # Lignes vides finales: souvent ajoutées par le LLM, sans valeur de contexte
+        while body and body[-1] == (" ", ""):
+            body = body[:-1]
+        old = [text for prefix, text in body if prefix != "+"]
+        new = [text for prefix, text in body if prefix != "-"]
+        if not old:
+            position = min(max(hunk["line"] - 1, 0), len(lines)) if hunk["line"] else len(lines)
+        else:
+            position = _locate(lines, old, cursor, hunk["line"] - 1)
+            if position is None:
+                raise PatchError(f"{path}: hunk {number} introuvable dans le fichier")
+        lines[position:position + len(old)] = new
+        cursor = position + len(new)
+        stats.lines_added += sum(1 for prefix, _ in body if prefix == "+")
+        stats.lines_removed += sum(1 for prefix, _ in body if prefix == "-")
+    return "\n".join(lines)
+
+
+def _locate(lines: list, old: list, cursor: int, hint: int) -> Optional[int]:
+    """
+    Position de la séquence old dans lines: correspondance exacte, sinon aux
+    espaces de fin près, sinon à l'indentation près; la plus proche du
+    numéro de ligne annoncé (après le hunk précédent si possible).
+    """
+    for normalize in (lambda s: s, str.rstrip, str.strip):
+        wanted = [normalize(line) for line in old]
+        candidates = [
+            i for i in range(len(lines) - len(old) + 1)
+            if [normalize(line) for line in lines[i:i + len(old)]] == wanted
+        ]
+        if candidates:
+            after = [i for i in candidates if i >= cursor] or candidates
+            return min(after, key=lambda i: abs(i - hint) if hint >= 0 else i)
+    return None
@@ -87,8 +87,17 @@ class SolutionExporter:
         """Exporte les métriques détaillées"""
         metrics_file = output_dir / "METRICS.json"
         
+        metrics = {
+            "iterations": solution.get('metrics', []),
+            "llm_usage": solution.get('llm_usage', {}),
+            "early_stop": solution.get('early_stop', {}),
+            "parallelism": solution.get('parallelism', {}),
+            "architecture_reuse": solution.get('architecture_reuse', {}),
+            "code_refinement": solution.get('code_refinement', {}),
+            "candidate_search": solution.get('candidate_search', {})
+        }
         with open(metrics_file, 'w', encoding='utf-8') as f:
-            json.dump(solution.get('metrics', []), f, indent=2)
+            json.dump(metrics, f, indent=2, ensure_ascii=False)
         
         return str(metrics_file)
     
@@ -145,6 +154,58 @@ Dernière itération:
   • Problèmes: {last_metric.get('issues_count', 0)}
 """
         
+        by_model = solution.get('llm_usage', {}).get('by_model', {})
+        if by_model:
+            report += "\nUtilisation LLM (par modèle):\n"
+            for model, usage in by_model.items():
+                report += (
+                    f"  • {model}: {usage['prompt_tokens']} + {usage['completion_tokens']} tokens, "
+                    f"{usage['tokens_per_second']} tokens/s, chargement {usage['load_seconds']:.1f}s\n"
+                )
+        
+        early_stop = solution.get('early_stop', {})
+        if early_stop:
+            report += "\nArrêts anticipés (génération coupée une fois la réponse utile complète):\n"
+            for agent, stats in early_stop.items():
+                report += (
+                    f"  • {agent}: {stats['cuts']} arrêt(s), ~{stats['tokens_saved']} tokens "
+                    f"et ~{stats['seconds_saved']:.1f}s économisés\n"
+                )
+        
+        reuse = solution.get('architecture_reuse', {})
+        if reuse:
+            report += (
+                f"\nArchitecture: réutilisée {reuse['reuse']} fois (appels Architecte évités), "
+                f"révisée {reuse['refine']} fois, régénérée {reuse['generate'] + reuse['refresh']} fois\n"
+            )
+        
+        refinement = solution.get('code_refinement', {})
+        if refinement.get('patch'):
+            average = refinement['avg_completion_tokens']
+            report += (
+                f"\nCode: {refinement['patch']} correctif(s) (~{average['patch']} tokens générés), "
+                f"{refinement['full']} génération(s) complète(s) (~{average['full']} tokens), "
+                f"{refinement['fallback']} repli(s) sur régénération\n"
+            )
+        
+        search = solution.get('candidate_search', {})
+        if search.get('iterations'):
+            alternatives = sum(n for rank, n in search['winners_by_rank'].items() if rank)
+            report += (
+                f"\nBest-of-N: {search['generated']} candidats sur {search['iterations']} itération(s) "
+                f"({search['reviewed']} relus), candidat alternatif retenu {alternatives} fois"
+                + (f", {search['fallbacks']} régénération(s) faute de correctif applicable" if search.get('fallbacks') else "")
+                + "\n"
+            )
+        
+        parallelism = solution.get('parallelism', {})
+        if parallelism.get('wall_seconds'):
+            report += (
+                f"\nPhases parallèles ({parallelism['max_parallel_phases']} max): "
+                f"{parallelism['wall_seconds']:.1f}s au lieu de {parallelism['sequential_seconds']:.1f}s "
+                f"(x{parallelism['speedup']}, chemin critique {parallelism['critical_path_seconds']:.1f}s)\n"
+            )
+        
         report += f"""
 
 🎯 LIVRABLES
@@ -270,4 +331,14 @@ Sécurité: {last_metric.security_score:.1f}%
 Problèmes: {last_metric.issues_count}
 """
         
+        live_events = getattr(orchestrator, 'live_events', None)
+        if live_events:
+            dashboard += """
+
+📡 EN DIRECT
+────────────
+"""
+            for event in list(live_events)[-5:]:
+                dashboard += f"  • [{event.agent}] {event.kind}: {event.value}\n"
+        
         return dashboard
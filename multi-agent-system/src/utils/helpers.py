@@ -73,7 +73,8 @@ def extract_bulleted_section(content: str, section_name: str) -> list:
     """
     import re
     
-    pattern = f"{section_name}[:\\n]+(.*?)(?=\\n[A-Z]|$)"
+    # Le titre peut se prolonger jusqu'aux deux-points ("PROBLÈMES DÉTECTÉS:")
+    pattern = f"{section_name}[^\\n:]*[:\\n]+(.*?)(?=\\n[A-Z]|$)"
     match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
     
     if match:
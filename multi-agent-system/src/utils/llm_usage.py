@@ -0,0 +1,115 @@
+"""
+Comptabilité réelle des tokens et des temps à partir des réponses Ollama.
+
+Chaque réponse de /api/generate (ou le dernier message d'un flux) contient
+les compteurs prompt_eval_count / eval_count et les durées en nanosecondes
+(chargement du modèle, évaluation du prompt, génération, total). Ils
+permettent de mesurer les tokens/s par modèle et de distinguer le temps de
+chargement du temps de génération.
+"""
+
+from dataclasses import asdict, dataclass, fields
+from typing import Optional
+
+NANOSECONDS = 1e9
+
+
+@dataclass
+class LLMUsage:
+    """Compteurs Ollama d'un appel, ou cumul de plusieurs appels (durées en ns)"""
+    prompt_eval_count: int = 0
+    eval_count: int = 0
+    load_duration: int = 0
+    prompt_eval_duration: int = 0
+    eval_duration: int = 0
+    total_duration: int = 0
+    calls: int = 0
+    truncated: int = 0  # Réponses coupées par num_predict (done_reason "length")
+    early_stopped: int = 0  # Flux interrompus une fois la réponse utile complète
+    
+    @classmethod
+    def from_response(cls, data: Optional[dict]) -> "LLMUsage":
+        """Extrait les compteurs d'une réponse Ollama (champs absents = 0)"""
+        data = data or {}
+        values = {
+            f.name: int(data.get(f.name) or 0)
+            for f in fields(cls) if f.name not in ("calls", "truncated", "early_stopped")
+        }
+        return cls(
+            calls=1,
+            truncated=int(data.get("done_reason") == "length"),
+            early_stopped=int(data.get("done_reason") == "early_stop"),
+            **values
+        )
+    
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_eval_count + self.eval_count
+    
+    def add(self, other: "LLMUsage") -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+    
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "truncated_calls": self.truncated,
+            "early_stopped_calls": self.early_stopped,
+            "prompt_tokens": self.prompt_eval_count,
+            "completion_tokens": self.eval_count,
+            "load_seconds": round(self.load_duration / NANOSECONDS, 3),
+            "prompt_eval_seconds": round(self.prompt_eval_duration / NANOSECONDS, 3),
+            "eval_seconds": round(self.eval_duration / NANOSECONDS, 3),
+            "total_seconds": round(self.total_duration / NANOSECONDS, 3),
+            "prompt_tokens_per_second": _rate(self.prompt_eval_count, self.prompt_eval_duration),
+            "tokens_per_second": _rate(self.eval_count, self.eval_duration),
+        }
+
+
+def _rate(tokens: int, duration_ns: int) -> float:
+    return round(tokens / (duration_ns / NANOSECONDS), 2) if duration_ns else 0.0
+
+
+class UsageAggregator:
+    """Cumule les LLMUsage par agent, par modèle et par itération"""
+    
+    def __init__(self):
+        self.total = LLMUsage()
+        self.by_agent: dict[str, LLMUsage] = {}
+        self.by_model: dict[str, LLMUsage] = {}
+        self.by_iteration: dict[int, LLMUsage] = {}
+    
+    def add(self, agent: str, model: str, iteration: int, usage: Optional[LLMUsage]) -> None:
+        if usage is None:
+            return
+        self.total.add(usage)
+        for table, key in (
+            (self.by_agent, agent),
+            (self.by_model, model),
+            (self.by_iteration, iteration),
+        ):
+            table.setdefault(key, LLMUsage()).add(usage)
+    
+    def to_state(self) -> dict:
+        """Compteurs bruts, pour un checkpoint (JSON)"""
+        return {
+            "total": asdict(self.total),
+            "by_agent": {key: asdict(usage) for key, usage in self.by_agent.items()},
+            "by_model": {key: asdict(usage) for key, usage in self.by_model.items()},
+            "by_iteration": {str(key): asdict(usage) for key, usage in self.by_iteration.items()},
+        }
+    
+    def restore(self, state: dict) -> None:
+        """Restaure les compteurs enregistrés par to_state()"""
+        self.total = LLMUsage(**state["total"])
+        self.by_agent = {key: LLMUsage(**usage) for key, usage in state["by_agent"].items()}
+        self.by_model = {key: LLMUsage(**usage) for key, usage in state["by_model"].items()}
+        self.by_iteration = {int(key): LLMUsage(**usage) for key, usage in state["by_iteration"].items()}
+    
+    def summary(self) -> dict:
+        return {
+            "total": self.total.to_dict(),
+            "by_agent": {k: v.to_dict() for k, v in self.by_agent.items()},
+            "by_model": {k: v.to_dict() for k, v in self.by_model.items()},
+            "by_iteration": {str(k): v.to_dict() for k, v in self.by_iteration.items()},
+        }
@@ -0,0 +1,321 @@
+"""
+Outils de streaming des réponses LLM.
+
+- ResponseBuffer: assemble les chunks sans concaténations successives
+  (coût linéaire) et borne la mémoire sur les très longues sorties.
+- IncrementalParser: analyse la réponse ligne par ligne pendant la génération
+  et émet des événements (score, problème, recommandation) dès qu'ils sont
+  complets, sans attendre la fin du flux.
+- JsonCompletion: suit un objet JSON streamé jusqu'à ce qu'il soit exploitable.
+- EarlyStopStats: gain (tokens, secondes) des générations arrêtées dès que
+  la partie utile de la réponse est complète.
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SCORE_PATTERN = re.compile(r"score[\w\s]{0,20}?[:=]\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+BULLET_PATTERN = re.compile(r"^\s*[-*•]\s+(.+)$")
+
+
+@dataclass
+class StreamEvent:
+    """Événement émis pendant la génération d'une réponse"""
+    kind: str  # "score", "risk", "issue", "recommendation"
+    value: object
+    agent: str = ""
+    section: Optional[str] = None
+
+
+class ResponseBuffer:
+    """Assemble les chunks d'une réponse streamée dans un buffer borné"""
+    
+    def __init__(self, max_chars: int = 400_000):
+        self.max_chars = max_chars
+        self.chunks: list[str] = []
+        self.size = 0
+        self.truncated = False
+    
+    def append(self, chunk: str) -> None:
+        """Ajoute un chunk (ignoré au-delà de max_chars)"""
+        if not chunk or self.truncated:
+            return
+        
+        remaining = self.max_chars - self.size
+        if len(chunk) > remaining:
+            chunk = chunk[:remaining]
+            self.truncated = True
+            logger.warning(f"⚠️  Réponse tronquée à {self.max_chars} caractères")
+        
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+    
+    def text(self) -> str:
+        """Texte complet (une seule concaténation)"""
+        return "".join(self.chunks)
+
+
+class IncrementalParser:
+    """
+    Parse une réponse au fil de l'eau.
+    
+    `sections` associe un mot-clé de titre de section (ex: "PROBLÈMES") au
+    type d'événement émis pour ses puces (ex: "issue"). Le premier score
+    rencontré (score_pattern) est émis si track_score est actif. Seule la ligne en
+    cours est conservée, bornée à max_line_chars.
+    
+    is_complete indique quand la suite de la réponse n'apporterait plus
+    rien: score lu et chaque section fermée ou pleine.
+    """
+    
+    def __init__(
+        self,
+        sections: Optional[dict] = None,
+        agent: str = "",
+        track_score: bool = True,
+        max_line_chars: int = 4096,
+        score_pattern: re.Pattern = SCORE_PATTERN,
+        score_kind: str = "score"
+    ):
+        self.sections = {k.upper(): v for k, v in (sections or {}).items()}
+        self.agent = agent
+        self.track_score = track_score
+        self.score_pattern = score_pattern
+        self.score_kind = score_kind
+        self.max_line_chars = max_line_chars
+        self.current_section: Optional[str] = None
+        self.score: Optional[float] = None
+        self.items: dict[str, int] = {}  # Puces lues par section
+        self.closed: set[str] = set()    # Sections suivies d'une autre ligne que des puces
+        self._line_parts: list[str] = []
+        self._line_size = 0
+    
+    def feed(self, chunk: str) -> list[StreamEvent]:
+        """Ajoute un chunk et retourne les événements des lignes complétées"""
+        events = []
+        
+        while chunk:
+            newline = chunk.find("\n")
+            if newline == -1:
+                self._append_to_line(chunk)
+                break
+            
+            self._append_to_line(chunk[:newline])
+            events.extend(self._parse_line(self._pop_line()))
+            chunk = chunk[newline + 1:]
+        
+        return events
+    
+    def is_complete(self, max_items: Optional[int] = None) -> bool:
+        """Vrai si le score (suivi) est lu et chaque section fermée ou à max_items puces"""
+        if self.track_score and self.score is None:
+            return False
+        return all(
+            section in self.closed or (max_items and self.items.get(section, 0) >= max_items)
+            for section in self.sections
+        )
+    
+    def close(self) -> list[StreamEvent]:
+        """Termine le flux: traite la dernière ligne incomplète"""
+        if not self._line_parts:
+            return []
+        return self._parse_line(self._pop_line())
+    
+    def _append_to_line(self, text: str) -> None:
+        remaining = self.max_line_chars - self._line_size
+        if remaining <= 0:
+            return
+        text = text[:remaining]
+        self._line_parts.append(text)
+        self._line_size += len(text)
+    
+    def _pop_line(self) -> str:
+        line = "".join(self._line_parts)
+        self._line_parts = []
+        self._line_size = 0
+        return line
+    
+    def _parse_line(self, line: str) -> list[StreamEvent]:
+        events = []
+        stripped = line.strip()
+        if not stripped:
+            return events
+        
+        if self.track_score and self.score is None:
+            match = self.score_pattern.search(stripped)
+            if match:
+                self.score = min(100.0, max(0.0, float(match.group(1))))
+                events.append(StreamEvent(self.score_kind, self.score, self.agent, self.current_section))
+        
+        bullet = BULLET_PATTERN.match(stripped)
+        if bullet:
+            kind = self.sections.get(self.current_section) if self.current_section else None
+            if kind:
+                events.append(StreamEvent(kind, bullet.group(1).strip(), self.agent, self.current_section))
+                self.items[self.current_section] = self.items.get(self.current_section, 0) + 1
+            return events
+        
+        # Un titre connu ouvre une section, toute autre ligne en majuscule la ferme
+        heading = stripped.lstrip("#* ")
+        section = next(
+            (name for name in self.sections if heading.upper().startswith(name)),
+            None
+        )
+        if section or heading[:1].isupper():
+            if self.items.get(self.current_section):
+                self.closed.add(self.current_section)
+            self.current_section = section
+        return events
+
+
+class JsonCompletion:
+    """
+    Suit un objet JSON streamé, caractère par caractère (état borné).
+    
+    Complet quand l'objet racine est fermé, ou quand toutes les clés requises
+    sont ouvertes et que la liste en cours (dernière clé) atteint max_items
+    éléments: finish() referme alors l'objet au dernier élément complet.
+    """
+    
+    def __init__(self, required: tuple = (), max_items: Optional[int] = None):
+        self.required = set(required)
+        self.max_items = max_items
+        self.complete = False
+        self.capped = False  # Complet par max_items (objet refermé par finish)
+        self.keys: set[str] = set()
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._key_parts: Optional[list[str]] = None  # Clé de l'objet racine en cours de lecture
+        self._expect_key = False
+        self._items = 0  # Éléments terminés de la liste en cours (niveau 2)
+        self._position = 0
+        self._cut_at: Optional[int] = None
+    
+    def feed(self, chunk: str) -> None:
+        for char in chunk:
+            if self.complete:
+                return
+            self._position += 1
+            if self._in_string:
+                self._read_string(char)
+            elif char == '"':
+                self._in_string = True
+                if self._stack == ["{"] and self._expect_key:
+                    self._key_parts = []
+            elif char in "{[":
+                self._stack.append(char)
+                self._expect_key = char == "{"
+                if self._stack == ["{", "["]:
+                    self._items = 0
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if not self._stack:
+                    self._cut(self._position)
+                elif self._stack == ["{", "["]:
+                    self._item_done()
+            elif char == "," and len(self._stack) == 1:
+                self._expect_key = True
+    
+    def finish(self, text: str) -> str:
+        """Texte exploitable: coupé au point de complétion et refermé"""
+        if self._cut_at is None:
+            return text
+        closing = "".join("}" if opener == "{" else "]" for opener in reversed(self._stack))
+        return text[:self._cut_at] + closing
+    
+    def _read_string(self, char: str) -> None:
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._key_parts is not None:
+                self.keys.add("".join(self._key_parts))
+                self._key_parts = None
+                self._expect_key = False
+            elif self._stack == ["{", "["]:
+                self._item_done()
+            return
+        if self._key_parts is not None and len(self._key_parts) < 128:
+            self._key_parts.append(char)
+    
+    def _item_done(self) -> None:
+        self._items += 1
+        if self.max_items and self._items >= self.max_items and self.required <= self.keys:
+            self.capped = True
+            self._cut(self._position)
+    
+    def _cut(self, position: int) -> None:
+        self._cut_at = position
+        self.complete = True
+
+
+@dataclass
+class EarlyStopStats:
+    """
+    Générations arrêtées par l'agent dès la réponse utile complète, et gain
+    estimé: longueur moyenne des réponses menées à terme (à défaut
+    num_predict) moins les tokens générés, au débit mesuré du flux coupé.
+    """
+    cuts: int = 0
+    tokens_generated: int = 0
+    tokens_saved: int = 0
+    seconds_saved: float = 0.0
+    last: Optional[dict] = None
+    _full_tokens: int = field(default=0, repr=False)
+    _full_calls: int = field(default=0, repr=False)
+    _inherited: tuple = field(default=(0, 0), repr=False)  # Référence (tokens, réponses) reçue par fork()
+    
+    def fork(self) -> "EarlyStopStats":
+        """Statistiques vierges d'une copie d'agent, avec la longueur de référence des réponses"""
+        return EarlyStopStats(_inherited=(
+            self._full_tokens + self._inherited[0], self._full_calls + self._inherited[1]
+        ))
+    
+    def absorb(self, clone: "EarlyStopStats") -> None:
+        """Reporte les arrêts et réponses complètes de clone (fork())"""
+        self.cuts += clone.cuts
+        self.tokens_generated += clone.tokens_generated
+        self.tokens_saved += clone.tokens_saved
+        self.seconds_saved += clone.seconds_saved
+        self._full_tokens += clone._full_tokens
+        self._full_calls += clone._full_calls
+    
+    def record_full(self, eval_count: int) -> None:
+        """Réponse menée à terme (référence de longueur des réponses)"""
+        if eval_count:
+            self._full_tokens += eval_count
+            self._full_calls += 1
+    
+    def record_cut(self, eval_count: int, eval_seconds: float, num_predict: Optional[int] = None) -> dict:
+        """Enregistre un arrêt anticipé et retourne son gain estimé"""
+        full_tokens = self._full_tokens + self._inherited[0]
+        full_calls = self._full_calls + self._inherited[1]
+        if full_calls:
+            expected = full_tokens / full_calls
+        else:
+            expected = num_predict if num_predict and num_predict > 0 else eval_count
+        saved = max(0, round(expected - eval_count))
+        rate = eval_count / eval_seconds if eval_seconds > 0 else 0.0
+        seconds = saved / rate if rate else 0.0
+        self.cuts += 1
+        self.tokens_generated += eval_count
+        self.tokens_saved += saved
+        self.seconds_saved += seconds
+        self.last = {"tokens_generated": eval_count, "tokens_saved": saved, "seconds_saved": round(seconds, 2)}
+        return self.last
+    
+    def stats(self) -> dict:
+        return {
+            "cuts": self.cuts,
+            "tokens_generated": self.tokens_generated,
+            "tokens_saved": self.tokens_saved,
+            "seconds_saved": round(self.seconds_saved, 2),
+        }
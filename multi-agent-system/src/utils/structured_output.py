@@ -0,0 +1,62 @@
+"""
+Sorties JSON des agents (format Ollama "json" ou schéma JSON).
+
+Ollama contraint la génération au schéma, mais une réponse coupée par
+num_predict ou un modèle qui ignore la contrainte peut encore produire un
+JSON invalide: la réponse est donc relue et validée avant usage. Le
+validateur couvre le sous-ensemble de JSON Schema utilisé par les agents
+(type, properties, required, items, minimum, maximum).
+"""
+
+import json
+from typing import Optional
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+
+def parse_json_object(text: str) -> Optional[dict]:
+    """Objet JSON contenu dans text (bloc ```json ou texte autour tolérés), None sinon"""
+    if not text:
+        return None
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        return None
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def validate_schema(data, schema: dict, path: str = "$") -> list[str]:
+    """Écarts de data au schéma (liste vide si valide)"""
+    expected = schema.get("type")
+    if expected:
+        python_type = _TYPES[expected]
+        # bool est un int pour Python, pas pour JSON Schema
+        if not isinstance(data, python_type) or (isinstance(data, bool) and expected != "boolean"):
+            return [f"{path}: {expected} attendu"]
+    
+    errors = []
+    if isinstance(data, dict):
+        errors += [f"{path}.{key}: champ requis" for key in schema.get("required", ()) if key not in data]
+        for key, subschema in schema.get("properties", {}).items():
+            if key in data:
+                errors += validate_schema(data[key], subschema, f"{path}.{key}")
+    elif isinstance(data, list) and "items" in schema:
+        for index, item in enumerate(data):
+            errors += validate_schema(item, schema["items"], f"{path}[{index}]")
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        if "minimum" in schema and data < schema["minimum"]:
+            errors.append(f"{path}: minimum {schema['minimum']}")
+        if "maximum" in schema and data > schema["maximum"]:
+            errors.append(f"{path}: maximum {schema['maximum']}")
+    return errors
+